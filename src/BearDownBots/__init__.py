@@ -1,4 +1,6 @@
 # # src/BearDownBots/__init__.py
+import argparse
+import random
 
 from BearDownBots.app import BearDownBotsApp
 from BearDownBots.config import Config
@@ -19,3 +21,29 @@ def fast():
 
     main()
 
+def headless(argv: list[str] | None = None):
+    """
+    Entry point for the `run-headless` console script: simulate a number of
+    sim-hours with a fixed-step clock, as fast as the CPU allows, and report
+    ticks per second.
+    """
+    parser = argparse.ArgumentParser(prog="run-headless",
+                                     description="Run the simulation without a GUI and measure its throughput.")
+    parser.add_argument("hours", type=float, nargs="?", default=1.0, help="sim-hours to simulate (default 1)")
+    parser.add_argument("--rows", type=int, default=Config.Environment.MAP_ROWS)
+    parser.add_argument("--cols", type=int, default=Config.Environment.MAP_COLS)
+    parser.add_argument("--robots", type=int, default=Config.Simulation.NUM_ROBOTS)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the campus and the orders, for runs that can be compared")
+    args = parser.parse_args(argv)
+
+    Config.HEADLESS_FLAG = True
+    Config.Simulation.FIXED_STEP = 1 / Config.Simulation.UPDATES_PER_SEC
+    Config.Environment.MAP_ROWS = args.rows
+    Config.Environment.MAP_COLS = args.cols
+    Config.Simulation.NUM_ROBOTS = args.robots
+    if args.seed is not None:
+        Config.Environment.SEED = args.seed
+        random.seed(args.seed)
+
+    BearDownBotsApp(headless_hours=args.hours)
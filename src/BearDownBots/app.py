@@ -1,20 +1,32 @@
+import os
+import math
 import sys
 import time
+import atexit
+import contextlib
+import datetime
 import threading
 
 from BearDownBots.config import Config
 from BearDownBots.clock import SimulationClock
+from BearDownBots.engine import EventEngine
 
 from BearDownBots.static import create_campus_environment
 
 from BearDownBots.dynamic.robot import Robot
+from BearDownBots.dynamic.path_cache import cache_for
+from BearDownBots.dynamic.path_stats import stats_for
+from BearDownBots.dynamic.distance_field import fields_for
+from BearDownBots.dynamic.landmarks import landmarks_for
+from BearDownBots.dynamic.cooperative import cooperative_for
+from BearDownBots.dynamic.batch_planner import batch_for
 
 from BearDownBots.render.gui import GuiWrapper
 from BearDownBots.render.loading import ProgressWindow
 
 from BearDownBots.dynamic.rand_order_scheduler import OrderPlacer
 class BearDownBotsApp():
-    def __init__(self):
+    def __init__(self, headless_hours: float | None = None):
         # core state
         self.environment     = None
         self.renderer        = None
@@ -25,13 +37,17 @@ class BearDownBotsApp():
         self.base_fps   = Config.Simulation.UPDATES_PER_SEC
         self.time_scale = Config.Simulation.TIME_SCALE
 
-        self.renderer = GuiWrapper()
-        self.progress_window = ProgressWindow(self.renderer)
+        # headless runs never draw, so they need no display
+        if not Config.HEADLESS_FLAG:
+            self.renderer = GuiWrapper()
+            self.progress_window = ProgressWindow(self.renderer)
         # 1) common setup
         self.setup()
 
         # 2) headless vs GUI
-        if Config.HEADLESS_FLAG:
+        if headless_hours is not None:
+            self.headless_result = self.run_headless(headless_hours * 3600)
+        elif Config.HEADLESS_FLAG:
             self.run_cli()
         else:
             # -- GUI mode wiring --
@@ -54,11 +70,35 @@ class BearDownBotsApp():
         """Shared environment and robot initialization."""
         self.sim_clock       = SimulationClock()
         self.environment     = create_campus_environment(self.progress_window if not Config.HEADLESS_FLAG else None)
-        self.order_scheduler = OrderPlacer(self.environment.buildings, self.sim_clock)
+        if Config.Simulation.PATHFINDING_ALGORITHM == "alt":
+            landmarks_for(self.environment).build(self.progress_window if not Config.HEADLESS_FLAG else None)
+        self.distance_fields = None
+        if Config.Simulation.USE_DISTANCE_FIELDS:
+            self.distance_fields = fields_for(self.environment)
+            if Config.Simulation.DISTANCE_FIELDS_IN_BACKGROUND:
+                self.distance_fields.warm_up_in_background()
+            else:
+                self.distance_fields.warm_up()
+        self.order_scheduler = OrderPlacer(self.environment.buildings, self.sim_clock, self.distance_fields)
         self.robots = [
             Robot(i, self.environment)
             for i in range(Config.Simulation.NUM_ROBOTS)
         ]
+        # headless runs can jump from event to event instead of ticking
+        self.event_engine = EventEngine(self.sim_clock, self.order_scheduler, self.robots, self.environment)
+        # start the planning workers now rather than on the first busy tick
+        batch_for(self.environment)
+        if Config.Simulation.PATH_STATS_DUMP:
+            atexit.register(self._dump_path_stats)
+
+    def _dump_path_stats(self):
+        """Write this run's search statistics next to the log files in build/."""
+        build_dir = os.path.join(os.path.dirname(Config.get_asset_dir()), "build")
+        os.makedirs(build_dir, exist_ok=True)
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(build_dir, f"path_stats_{ts}.json")
+        stats_for(self.environment).dump(path)
+        print(f"Search statistics written to {path}")
 
     def start_simulation(self):
         """Start the GUI scheduler or un-block the CLI start command."""
@@ -84,8 +124,13 @@ class BearDownBotsApp():
 
     def _do_step(self):
         """One tick of sim: clock, orders, robots, and GUI updates if any."""
+        # routes queued with the batch planner last tick reach their robots now
+        batch = batch_for(self.environment)
+        if batch is not None:
+            batch.collect()
+
         # advance clock
-        self.sim_clock.tick()
+        dt = self.sim_clock.tick()
 
         # place new orders
         new_orders = self.order_scheduler.place_new_order()
@@ -103,14 +148,67 @@ class BearDownBotsApp():
         # assign & move robots
         self.order_scheduler.load_order_into_robots(self.robots)
 
+        # robots walk ROBOT_SPEED cells per sim-second, however long the tick was
         for bot in self.robots:
-            bot.act()
+            bot.act(dt)
+        if Config.Simulation.PATHFINDING_ALGORITHM == "whca":
+            cooperative_for(self.environment).advance()
+        if batch is not None:
+            batch.flush()
 
         # redraw
         if not Config.HEADLESS_FLAG:
             self.renderer.robot_renderer .render_robots(self.robots)
             self.renderer.restaurant_dash.update()
 
+    def run_headless(self, sim_seconds: float, quiet: bool = True) -> dict:
+        """
+        Drive _do_step in a tight loop, with no sleeping, until `sim_seconds`
+        of sim time have passed, then print the throughput and return it
+        with the run's delivery metrics. With a fixed-step clock
+        (Config.Simulation.FIXED_STEP) the run, and so the numbers, do not
+        depend on the machine or its load. `quiet` drops the robots' and
+        scheduler's per-event prints while it runs.
+        """
+        end = self.sim_clock.now() + sim_seconds
+        ticks = 0
+        seen = [len(bot.delivered) for bot in self.robots]
+        latencies = []   # sim-seconds from placed to delivered
+        t0 = time.perf_counter()
+        with open(os.devnull, "w") as sink, \
+             contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            while self.sim_clock.now() < end:
+                self._do_step()
+                ticks += 1
+                now = self.sim_clock.now()
+                for k, bot in enumerate(self.robots):
+                    if len(bot.delivered) > seen[k]:
+                        latencies += [now - order.placed_at for order in bot.delivered[seen[k]:]]
+                        seen[k] = len(bot.delivered)
+        wall = time.perf_counter() - t0
+
+        latencies.sort()
+        stats = stats_for(self.environment)
+        result = {
+            "delivered": len(latencies),
+            "mean_latency_s": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "p95_latency_s": round(latencies[math.ceil(0.95 * len(latencies)) - 1], 2) if latencies else None,
+            "pending_orders": self.order_scheduler.pending(),
+            "ticks": ticks,
+            "sim_seconds": round(self.sim_clock.now(), 3),
+            "wall_seconds": round(wall, 3),
+            "ticks_per_sec": round(ticks / wall, 1) if wall else 0.0,
+            "searches": sum(t.searches for t in stats.by_algorithm.values()),
+            "pathfinding_seconds": round(sum(t.seconds for t in stats.by_algorithm.values()), 3),
+        }
+        print(f"{ticks} ticks ({result['sim_seconds'] / 3600:.2f} sim-hours) in {wall:.2f}s: "
+              f"{result['ticks_per_sec']:.0f} ticks/s, "
+              f"{result['sim_seconds'] / wall if wall else 0:.0f}x real time, "
+              f"{result['delivered']} delivered (mean {result['mean_latency_s']}s, "
+              f"p95 {result['p95_latency_s']}s), {result['pending_orders']} orders pending")
+        print(stats.summary())
+        return result
+
     def run_cli(self):
         """
         Simple REPL for headless mode.
@@ -119,7 +217,8 @@ class BearDownBotsApp():
           start   — begin continuous simulation
           stop    — pause it
           step    — advance exactly one tick
-          status  — show time, pending orders, robots
+          run N   — simulate N sim-seconds as fast as possible, event to event
+          status  — show time, pending orders, robots, search stats
           help    — list commands
           exit    — quit
         """
@@ -127,7 +226,8 @@ class BearDownBotsApp():
             start\tstart continuous simulation
             stop \tpause it")
             step \tadvance one simulation step
-            status\tprint time, orders, robot positions
+            run N\tsimulate N sim-seconds, skipping the time between events
+            status\tprint time, orders, robot positions, search stats
             exit \tquit the program
         """
 
@@ -135,7 +235,7 @@ class BearDownBotsApp():
         print(command_explanation)
         print("Type 'help' for commands.")
         while True:
-            cmd = input("> ").strip().lower()
+            cmd, *args = input("> ").strip().lower().split() or [""]
             if cmd == "help":
                 print(command_explanation)
 
@@ -159,16 +259,32 @@ class BearDownBotsApp():
             elif cmd == "step":
                 self._do_step()
                 print(f"Step done. Time = {self.sim_clock.now():.2f}s")
+            elif cmd == "run":
+                if self.running:
+                    print("Stop the simulation first.")
+                    continue
+                try:
+                    seconds = float(args[0])
+                except (IndexError, ValueError):
+                    print("Usage: run <sim-seconds>")
+                    continue
+                steps = self.event_engine.run_until(self.sim_clock.now() + seconds)
+                self.sim_clock._last_real = time.perf_counter()   # the run's wall time is not sim time
+                print(f"Ran {steps} events. {self.event_engine}")
             elif cmd == "status":
                 t = self.sim_clock.now()
-                pending = len(self.order_scheduler.orders)
+                pending = self.order_scheduler.pending()
                 print(f"Time = {t:.2f}s, pending orders = {pending}")
                 for bot in self.robots:
                     print(f"  {bot}  orders={len(bot.orders)}")
+                print(f"  {cache_for(self.environment)}")
+                for line in stats_for(self.environment).summary().splitlines():
+                    print(f"  {line}")
             elif cmd in ("exit", "quit"):
                 if self.running:
                     self.running = False
                     self.sim_thread.join()
+                print(cache_for(self.environment))
                 print("Exiting.")
                 sys.exit(0)
             else:
@@ -5,14 +5,20 @@ class SimulationClock:
     def __init__(self):
         # read the global scale factor
         self.time_scale = Config.Simulation.TIME_SCALE  
+        self.fixed_dt   = Config.Simulation.FIXED_STEP  # None: follow the wall clock
         self._last_real = time.perf_counter()
         self.sim_time   = 0.0  # accumulated simulation time (in sim-seconds)
 
     def tick(self) -> float:
         """
         Call each frame. Returns sim_dt (seconds of simulation time that passed),
-        which is real_dt multiplied by Config.Simulation.TIME_SCALE.
+        which is real_dt multiplied by Config.Simulation.TIME_SCALE, or always
+        Config.Simulation.FIXED_STEP when that is set, so a run does not depend
+        on how fast the machine is.
         """
+        if self.fixed_dt is not None:
+            self.sim_time += self.fixed_dt
+            return self.fixed_dt
         now     = time.perf_counter()
         real_dt = now - self._last_real
         self._last_real = now
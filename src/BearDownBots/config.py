@@ -9,6 +9,7 @@ class Config:
         WINDOW_HEIGHT_PIXELS = 600 ## height of the window in pixels
         ROBOT_ZOOM_FACTOR = 4 ## zoom factor for the robot images (1 = normal size, 0.5 = half size, etc.)
         CAMPUS_MAP_ZOOM = 0.75 ## zoom factor for the campus map (1 = normal size, 0.5 = half size, etc.)
+        SHOW_ROBOT_PATHS = True ## draw the rest of each robot's route behind it
         
     class Environment:
         # environment
@@ -18,16 +19,32 @@ class Config:
         MIN_BUILDING_CELLS = 100 ## minimum number of cells a building can occupy
         MAX_BUILDING_CELLS = 200 ## maximum number of cells a building can occupy
         OBSTACLES_AS_PERCENTAGE_OF_WALKWAYS = 0.002 ## percentage is in decimal form (0.002 = 0.2%)
+        SEED = None ## campus generation seed; None = a new random campus every run
+        CAMPUS_CACHE = True ## reuse on-disk snapshots of seeded campuses (see `campus_cache list`)
 
     class Simulation:
         # simulation
         NUM_ROBOTS = 3
         TIME_SCALE = 5 ## time scale for the simulation (1 = real time, 2 = twice as fast, etc.)
         UPDATES_PER_SEC = 24 ## number of updates per second
+        FIXED_STEP = None ## sim-seconds per tick regardless of the wall clock (None = real time x TIME_SCALE)
+        ROBOT_SPEED = UPDATES_PER_SEC ## cells per sim-second a robot walks (default: one cell per update)
         NEW_ORDER_INTERVAL_SECONDS = 100 ## time interval in seconds between new orders
         NEW_ORDER_INTERVAL = NEW_ORDER_INTERVAL_SECONDS / TIME_SCALE ## time interval in seconds between new orders
-        PATHFINDING_ALGORITHM = "astar" # "astar", "dfs", "greedy"
+        PATHFINDING_ALGORITHM = "astar" # "astar", "alt", "jps", "bidirectional", "hpa", "corridor", "whca", "dfs", "greedy"
         ORDER_ASSIGNMENT_STRATEGY = "between"  # "oldest", "proximity", "between"
+        PATH_CACHE_SIZE = 512 ## routes kept in the shared LRU path cache (0 = no caching)
+        PATH_STATS_DUMP = True ## write per-algorithm / per-robot search stats to build/path_stats_<time>.json on exit
+        USE_DISTANCE_FIELDS = True ## return trips and scheduler distances come from precomputed BFS fields
+        DISTANCE_FIELDS_IN_BACKGROUND = False ## build the fields on a background thread at startup
+        DISTANCE_FIELD_CACHE = 16 ## dropoff fields kept in memory (each is 4 bytes per map cell)
+        ALT_LANDMARKS = 6 ## landmarks for the "alt" heuristic (each is 4 bytes per map cell)
+        HPA_CLUSTER_SIZE = 64 ## side length in cells of the "hpa" clusters
+        WHCA_WINDOW = 16 ## ticks each "whca" robot plans and reserves ahead
+        BATCH_PLANNING_WORKERS = 0 ## worker processes planning queued routes between ticks (0 = plan inline)
+        INCREMENTAL_REPLANNING = True ## replan with a per-robot D* Lite search that is repaired, not restarted
+        SHORTEN_PATHS = True ## cut loops and detours out of "dfs" / "greedy" routes after the search
+        REPLAN_ROBOT_PENALTY = 16 ## extra steps a replanned route pays to pass through a robot (None = never)
 
     def get_asset_dir():
         # Get the directory of the assets folder
@@ -0,0 +1,170 @@
+# src/BearDownBots/dynamic/batch_planner.py
+"""
+Batch path planning across a process pool.
+
+When many robots need a route in the same tick (orders loaded into a full
+pickup queue, a wave of robots arriving home) planning them one after the
+other on the main thread stalls the Tk loop. Instead each robot queues its
+(start, goal) query here; flush() copies the bitmask grid into a shared
+memory block and splits the queries between worker processes, and
+collect() hands the answers back to the robots before they next act.
+
+Workers never see the Map: each maps the shared block as a NumPy array
+and runs its own PathKernel over it, so only flat indices cross the
+process boundary. The grid is re-copied on every flush (a single memcpy),
+which is what lets workers see where the robots are right now.
+"""
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from BearDownBots.config import Config
+from BearDownBots.dynamic.pathfinding import PathKernel, SHORTENED_SEARCHES
+from BearDownBots.dynamic.path_cache import cache_for
+from BearDownBots.dynamic.path_stats import stats_for
+
+# kernel searches a worker can run on the grid alone
+BATCHABLE_SEARCHES = ("astar", "jps", "bidirectional", "greedy", "dfs")
+
+# ---------------------------------------------------------------------- #
+# worker side
+# ---------------------------------------------------------------------- #
+_worker_shm = None
+_worker_kernel: PathKernel | None = None
+_worker_version = None
+
+
+def _init_worker(shm_name: str, rows: int, cols: int):
+    global _worker_shm, _worker_kernel
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    grid = np.ndarray((rows, cols), dtype=np.uint8, buffer=_worker_shm.buf)
+    _worker_kernel = PathKernel(grid, version_of=lambda: _worker_version)
+
+
+def _solve(version: int, method: str, shorten: bool, queries: list[tuple[int, int]]):
+    """
+    Run one search per (start, goal), with the same defaults as
+    Robot._kernel_search; returns (path or None, seconds, expanded,
+    peak open, steps before shortening or None) for each.
+    """
+    global _worker_version
+    _worker_version = version   # lets the kernel drop jump tables after a map change
+    search = getattr(_worker_kernel, method)
+    out = []
+    for s, g in queries:
+        t0 = time.perf_counter()
+        path = search(s, g)
+        expanded, peak_open = _worker_kernel.expanded, _worker_kernel.peak_open
+        raw_length = None
+        if path is not None and shorten:
+            raw_length = len(path) - 1
+            path = _worker_kernel.shorten(path)
+        out.append((path, time.perf_counter() - t0, expanded, peak_open, raw_length))
+    return out
+
+
+# ---------------------------------------------------------------------- #
+# main process side
+# ---------------------------------------------------------------------- #
+class BatchPlanner:
+    def __init__(self, campus_map, workers: int):
+        # weak: batch_for's registry holds this planner, and the finalizer that
+        # shuts the pool down and unlinks the block only runs once the map goes
+        self._map = weakref.ref(campus_map)
+        self.workers = workers
+        rows, cols = campus_map.rows, campus_map.cols
+        self._shm = shared_memory.SharedMemory(create=True, size=rows * cols)
+        self._grid = np.ndarray((rows, cols), dtype=np.uint8, buffer=self._shm.buf)
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self._shm.name, rows, cols))
+        self._queued: list[tuple[object, int, int]] = []   # (robot, start, goal)
+        self._in_flight: list[tuple[list, object]] = []     # (robots and queries, future)
+        self._method = None
+
+        # stats
+        self.batches = 0
+        self.solved = 0
+        self.wait_seconds = 0.0   # time collect() spent blocked on workers
+
+        self._finalizer = weakref.finalize(self, BatchPlanner._release, self._pool, self._shm)
+
+    @property
+    def map(self):
+        return self._map()
+
+    @staticmethod
+    def _release(pool, shm):
+        pool.shutdown(wait=False, cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+    def close(self):
+        self._finalizer()
+
+    def submit(self, robot, start: int, goal: int):
+        """Queue a query; robot.receive_path(path_idx) is called from collect()."""
+        self._queued.append((robot, start, goal))
+
+    def __len__(self) -> int:
+        return len(self._queued) + sum(len(batch) for batch, _ in self._in_flight)
+
+    def flush(self):
+        """Send every queued query to the workers, split into one chunk per worker."""
+        if not self._queued:
+            return
+        method = Config.Simulation.PATHFINDING_ALGORITHM
+        shorten = method in SHORTENED_SEARCHES and Config.Simulation.SHORTEN_PATHS
+        np.copyto(self._grid, self.map.grid)
+
+        queued, self._queued = self._queued, []
+        size = -(-len(queued) // self.workers)
+        for k in range(0, len(queued), size):
+            batch = queued[k:k + size]
+            future = self._pool.submit(_solve, self.map.version, method, shorten,
+                                       [(s, g) for _, s, g in batch])
+            self._in_flight.append((batch, future))
+        self._method = method
+        self.batches += 1
+
+    def collect(self):
+        """Wait for the answers of the last flush and give them to their robots."""
+        if not self._in_flight:
+            return
+        cache = cache_for(self.map)
+        stats = stats_for(self.map)
+        t0 = time.perf_counter()
+        in_flight, self._in_flight = self._in_flight, []
+        for batch, future in in_flight:
+            for (robot, s, g), (path, seconds, expanded, peak_open, raw_length) in zip(batch, future.result()):
+                if path is not None:
+                    cache.put(s, g, self._method, path, seconds)
+                stats.record(self._method, robot.id, seconds, expanded, peak_open,
+                             len(path) - 1 if path else None, raw_length, failed=path is None)
+                robot.receive_path(path)
+                self.solved += 1
+        self.wait_seconds += time.perf_counter() - t0
+
+    def __str__(self):
+        return (f"BatchPlanner {self.workers} workers: {self.solved} paths in {self.batches} batches, "
+                f"{self.wait_seconds:.2f}s waiting on workers")
+
+
+_planners: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def batch_for(campus_map) -> BatchPlanner | None:
+    """
+    The BatchPlanner for `campus_map`, or None when batch planning is off
+    (BATCH_PLANNING_WORKERS = 0) or the strategy needs more than the grid.
+    """
+    workers = Config.Simulation.BATCH_PLANNING_WORKERS
+    if workers <= 0 or Config.Simulation.PATHFINDING_ALGORITHM not in BATCHABLE_SEARCHES:
+        return None
+    planner = _planners.get(campus_map)
+    if planner is None:
+        planner = BatchPlanner(campus_map, workers)
+        _planners[campus_map] = planner
+    return planner
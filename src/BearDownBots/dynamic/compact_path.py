@@ -0,0 +1,125 @@
+# src/BearDownBots/dynamic/compact_path.py
+"""
+Run-length encoded robot paths.
+
+A path is stored as the cell it starts from plus one (direction, length)
+pair per straight run, in two typed arrays, so a route across the whole
+campus costs a few bytes per turn instead of a Position object per cell.
+A cursor walks it: every step is O(1) and nothing is ever copied or
+shifted, where list.pop(0) on a list of Positions was O(n) per step.
+
+Waiting in place (a cell repeated in a cooperative route) is a run of
+the WAIT direction.
+"""
+from array import array
+
+from BearDownBots.static.cell import Position
+
+# direction codes: up, down, left, right, wait
+STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1), (0, 0))
+_CODE = {step: code for code, step in enumerate(STEPS)}
+
+
+class CompactPath:
+    __slots__ = ("dirs", "runs", "end", "_x", "_y", "_dx", "_dy", "_run", "_left", "_remaining")
+
+    def __init__(self, start: tuple[int, int] = (0, 0)):
+        self.dirs = array('b')   # direction code of each run
+        self.runs = array('I')   # steps in each run
+        self._x, self._y = start
+        self._dx = self._dy = 0   # step of the run under the cursor
+        self.end = Position(*start)
+        self._run = 0
+        self._left = 0
+        self._remaining = 0
+
+    @classmethod
+    def from_points(cls, points) -> "CompactPath":
+        """
+        Encode a path given as anything with .x and .y (Cells, Positions),
+        start first. The start is where the robot stands, so it is not a step.
+        """
+        return cls._encode([(p.x, p.y) for p in points])
+
+    @classmethod
+    def from_indices(cls, indices: list[int], cols: int) -> "CompactPath":
+        """Encode a path of flat indices, start first."""
+        return cls._encode([divmod(i, cols) for i in indices])
+
+    @classmethod
+    def _encode(cls, coords: list[tuple[int, int]]) -> "CompactPath":
+        if not coords:
+            return cls()
+        path = cls(coords[0])
+        dirs, runs = path.dirs, path.runs
+        (px, py) = coords[0]
+        for x, y in coords[1:]:
+            code = _CODE.get((x - px, y - py))
+            if code is None:
+                raise ValueError(f"path jumps from {(px, py)} to {(x, y)}")
+            if dirs and dirs[-1] == code:
+                runs[-1] += 1
+            else:
+                dirs.append(code)
+                runs.append(1)
+            px, py = x, y
+        path.end = Position(px, py)
+        path._remaining = len(coords) - 1
+        if runs:
+            path._left = runs[0]
+            path._dx, path._dy = STEPS[dirs[0]]
+        return path
+
+    # ------------------------------------------------------------------ #
+    # cursor
+    # ------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        """Steps still ahead of the cursor."""
+        return self._remaining
+
+    @property
+    def position(self) -> Position:
+        """The cell the cursor is on (the path's start until the first step)."""
+        return Position(self._x, self._y)
+
+    def step(self) -> Position | None:
+        """Advance the cursor one cell and return it; None once the path is walked."""
+        if not self._remaining:
+            return None
+        self._x += self._dx
+        self._y += self._dy
+        self._remaining -= 1
+        self._left -= 1
+        if not self._left and self._remaining:
+            k = self._run = self._run + 1
+            self._left = self.runs[k]
+            self._dx, self._dy = STEPS[self.dirs[k]]
+        return Position(self._x, self._y)
+
+    def __iter__(self):
+        """The cells still ahead, without moving the cursor."""
+        x, y = self._x, self._y
+        left = self._left
+        for k in range(self._run, len(self.runs)):
+            dx, dy = STEPS[self.dirs[k]]
+            for _ in range(left if k == self._run else self.runs[k]):
+                x += dx
+                y += dy
+                yield Position(x, y)
+
+    def corners(self) -> list[tuple[int, int]]:
+        """
+        (x, y) of the cursor cell and of every turn ahead of it, ending at
+        the last cell: enough to draw the rest of the route as a polyline.
+        """
+        x, y = self._x, self._y
+        out = [(x, y)]
+        left = self._left
+        for k in range(self._run, len(self.runs)):
+            dx, dy = STEPS[self.dirs[k]]
+            n = left if k == self._run else self.runs[k]
+            if n and (dx or dy):
+                x += dx * n
+                y += dy * n
+                out.append((x, y))
+        return out
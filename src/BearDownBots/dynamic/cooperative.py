@@ -0,0 +1,207 @@
+# src/BearDownBots/dynamic/cooperative.py
+"""
+Windowed cooperative A* (WHCA*) with a shared space-time reservation table.
+
+Every robot on the "whca" strategy plans only the next `window` ticks, as
+a space-time search where waiting in place is a move, and reserves the
+(cell, tick) pairs it will occupy. Robots planning later treat those as
+taken, so plans made together do not collide and nobody has to replan
+because someone stepped into their way. Beyond the window the search is
+guided by the goal's BFS distance field, the exact walking distance when
+robots are ignored (the "hierarchical" part of WHCA*).
+
+Robots re-plan, and re-reserve, once half their window has been walked,
+so reservations always reach well ahead of everyone. A robot with no
+way forward that respects everyone's reservations (two robots meeting
+head-on in a one-wide corridor) plans as if alone for that window
+rather than stalling; robots may share a cell, so that is safe, just
+not conflict-free. The table's clock is
+advanced once per simulation tick (see ReservationTable.advance).
+
+The pickup cell and a robot's own goal are never contended: robots stack
+on them by design.
+"""
+import heapq
+import weakref
+
+from BearDownBots.config import Config
+from BearDownBots.dynamic.pathfinding import WALKWAY_BIT, OBSTACLE_BIT
+from BearDownBots.dynamic.distance_field import fields_for, UNREACHABLE
+
+
+class ReservationTable:
+    """
+    (cell, tick) -> robot id, in a dict keyed by tick * cells + cell, so
+    every lookup is a single hash probe however many robots there are.
+    """
+
+    def __init__(self, n_cells: int):
+        self.n_cells = n_cells
+        self.now = 0
+        self._slots: dict[int, int] = {}
+        self._owned: dict[int, list[int]] = {}   # robot id -> its keys
+        self._expiry: dict[int, list[int]] = {}  # tick -> keys reserved for it
+
+    def owner(self, cell: int, tick: int) -> int | None:
+        return self._slots.get(tick * self.n_cells + cell)
+
+    def reserve(self, robot_id: int, cells: list[int], first_tick: int | None = None):
+        """
+        Reserve cells[k] at tick first_tick + k (default: now + k) for
+        robot_id, replacing its old reservations.
+        """
+        self.release(robot_id)
+        first_tick = self.now if first_tick is None else first_tick
+        keys = []
+        for k, cell in enumerate(cells):
+            tick = first_tick + k
+            key = tick * self.n_cells + cell
+            self._slots[key] = robot_id
+            self._expiry.setdefault(tick, []).append(key)
+            keys.append(key)
+        self._owned[robot_id] = keys
+
+    def release(self, robot_id: int):
+        for key in self._owned.pop(robot_id, ()):
+            if self._slots.get(key) == robot_id:
+                del self._slots[key]
+
+    def advance(self):
+        """One simulation tick has passed: forget the reservations for it."""
+        for key in self._expiry.pop(self.now, ()):
+            self._slots.pop(key, None)
+        self.now += 1
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class CooperativePlanner:
+    def __init__(self, campus_map, window: int):
+        # weak: cooperative_for's registry holds this planner, and must not keep
+        # the map, or the distance fields fields_for keeps for it, alive
+        self._map = weakref.ref(campus_map)
+        self.window = window
+        self.rows, self.cols = campus_map.rows, campus_map.cols
+        self.cells = memoryview(campus_map.grid).cast('B')
+        self.table = ReservationTable(self.rows * self.cols)
+        self._fields = weakref.ref(fields_for(campus_map))
+
+        # stats of the most recent plan()
+        self.expanded = 0
+        self.peak_open = 0
+        self.waits = 0
+        # plans so far that had to ignore reservations to get anywhere
+        self.forced = 0
+
+    @property
+    def map(self):
+        return self._map()
+
+    @property
+    def fields(self):
+        return self._fields()
+
+    def advance(self):
+        self.table.advance()
+
+    def plan(self, robot_id: int, start: int, goal: int, depart: int | None = None) -> list[int] | None:
+        """
+        The robot's next `window` cells (flat indices, start first; a cell
+        repeated means waiting a tick), reserved in the table from tick
+        `depart` on (default now; now + 1 for a robot that has already
+        stepped this tick). Shorter if the goal is reached inside the
+        window; None if the map itself does not connect start and goal.
+        """
+        table = self.table
+        self.expanded = self.peak_open = 0
+        dist = memoryview(self.fields.field(goal).dist)
+        now = table.now if depart is None else depart
+        if dist[start] == UNREACHABLE:
+            # stuck where it stands: make sure nobody plans through it
+            table.reserve(robot_id, [start, start], now)
+            return None
+
+        table.release(robot_id)
+        path = self._search(robot_id, start, goal, now, dist, cooperative=True)
+        if path is None:
+            # boxed in, typically meeting someone head-on in a one-wide
+            # corridor: push through (robots may share cells) rather than stall
+            path = self._search(robot_id, start, goal, now, dist, cooperative=False)
+            self.forced += 1
+        self.waits = sum(a == b for a, b in zip(path, path[1:]))
+        table.reserve(robot_id, path, now)
+        return path
+
+    def _search(self, robot_id: int, start: int, goal: int, now: int, dist, cooperative: bool):
+        """
+        Space-time A* over (cell, tick) up to the window's horizon. Waiting
+        is a move; g is the tick itself, so f = tick + distance-field h.
+        Without `cooperative` other robots' reservations are ignored.
+        """
+        cells, cols, rows = self.cells, self.cols, self.rows
+        horizon = now + self.window
+        pickup = self.fields.pickup
+        n = self.table.n_cells
+        slots = self.table._slots if cooperative else {}
+
+        parent = {(start, now): None}
+        heap = [(now + dist[start], -now, start)]
+        expanded = 0
+        peak = 1
+        end = None
+        while heap:
+            _, neg_tick, cur = heapq.heappop(heap)
+            tick = -neg_tick
+            if cur == goal or tick == horizon:
+                end = (cur, tick)
+                break
+            expanded += 1
+            x, y = divmod(cur, cols)
+            for nb, ok in ((cur, True), (cur - cols, x > 0), (cur + cols, x < rows - 1),
+                           (cur - 1, y > 0), (cur + 1, y < cols - 1)):
+                if not ok or (nb, tick + 1) in parent:
+                    continue
+                b = cells[nb]
+                if not b & WALKWAY_BIT or b & OBSTACLE_BIT or dist[nb] == UNREACHABLE:
+                    continue
+                if nb != goal and nb != pickup:
+                    other = slots.get((tick + 1) * n + nb)
+                    if other is not None and other != robot_id:
+                        continue
+                # no swapping places with a robot coming the other way
+                other = slots.get((tick + 1) * n + cur)
+                if nb != cur and other is not None and other != robot_id \
+                        and slots.get(tick * n + nb) == other:
+                    continue
+                parent[(nb, tick + 1)] = (cur, tick)
+                heapq.heappush(heap, (tick + 1 + dist[nb], -(tick + 1), nb))
+            if len(heap) > peak:
+                peak = len(heap)
+        self.expanded += expanded
+        self.peak_open = max(self.peak_open, peak)
+        if end is None:
+            return None
+
+        path = []
+        node = end
+        while node is not None:
+            path.append(node[0])
+            node = parent[node]
+        path.reverse()
+        return path
+
+
+_planners: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def cooperative_for(campus_map) -> CooperativePlanner:
+    """
+    The CooperativePlanner (and reservation table) shared by every robot
+    on `campus_map`.
+    """
+    planner = _planners.get(campus_map)
+    if planner is None:
+        planner = CooperativePlanner(campus_map, Config.Simulation.WHCA_WINDOW)
+        _planners[campus_map] = planner
+    return planner
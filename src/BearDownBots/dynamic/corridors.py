@@ -0,0 +1,255 @@
+# src/BearDownBots/dynamic/corridors.py
+"""
+Corridor-contracted walkway graph.
+
+Most walkway cells are corridor cells: exactly two walkable neighbours,
+nothing to decide. The graph keeps only the cells where a decision is
+made or a route may start or end (intersections, dead ends, dropoff and
+pickup cells) as nodes, and folds every run of corridor cells between two
+of them into one chain carrying its length and its cells.
+
+Node-to-node steps are read straight off the grid, so only the chains are
+stored: for each a (end, end, cells) triple, plus per-cell arrays saying
+which chain a corridor cell is on and where. A search therefore pays one
+expansion per intersection instead of one per cell, and a route is a list
+of hops whose cells are only produced when the robot gets to them (see
+CorridorGraph.expand).
+
+Like greedy and dfs the graph does not know about robots. It is rebuilt
+whenever the map's structure changes.
+"""
+import heapq
+import time
+import weakref
+
+import numpy as np
+
+from BearDownBots.config import Config
+from BearDownBots.dynamic.pathfinding import WALKWAY_BIT, OBSTACLE_BIT
+from BearDownBots.static.cell import CELL_TYPES
+
+NO_CHAIN = -1
+
+
+class CorridorGraph:
+    def __init__(self, campus_map):
+        # weak: corridors_for's registry holds this graph, and must not keep the map alive
+        self._map = weakref.ref(campus_map)
+        self.rows, self.cols = campus_map.rows, campus_map.cols
+        self.chains: list[tuple[int, int, list[int]]] = []   # (end a, end b, cells from a to b)
+        self.build_seconds = 0.0
+        self.expanded = 0   # nodes expanded by the most recent find()
+        self.peak_open = 0  # and the most entries its open heap held
+        self._version = None
+
+    @property
+    def map(self):
+        return self._map()
+
+    # ------------------------------------------------------------------ #
+    # construction
+    # ------------------------------------------------------------------ #
+    def build(self):
+        t0 = time.perf_counter()
+        campus_map = self.map
+        rows, cols = self.rows, self.cols
+        grid = campus_map.grid
+        free = ((grid & WALKWAY_BIT) != 0) & ((grid & OBSTACLE_BIT) == 0)
+
+        padded = np.pad(free, 1)
+        degree = (padded[:-2, 1:-1].astype(np.uint8) + padded[2:, 1:-1]
+                  + padded[1:-1, :-2] + padded[1:-1, 2:])
+        node = free & (degree != 2)
+        for x, y in campus_map.cells_with_type(CELL_TYPES.RESTUARANT_PICKUP):
+            node[x, y] = free[x, y]
+        for b in campus_map.buildings:
+            if b.dropoff_point:
+                x, y = b.dropoff_point
+                node[x, y] = free[x, y]
+
+        self.free = memoryview(free.ravel().view(np.uint8).copy()).cast('B')
+        self.node = memoryview(node.ravel().view(np.uint8).copy()).cast('B')
+        chain_of = np.full(rows * cols, NO_CHAIN, dtype=np.int32)
+        offset = np.zeros(rows * cols, dtype=np.int32)
+
+        # walk every corridor out of every node; each chain is met from both
+        # of its ends, so keep the first walk and skip the second
+        self.chains = []
+        is_free, is_node = self.free, self.node
+        for u in np.flatnonzero(node).tolist():
+            for first in self._steps(u):
+                if is_node[first] or chain_of[first] != NO_CHAIN:
+                    continue
+                cells = [first]
+                prev, cur = u, first
+                while True:
+                    nxt = next(n for n in self._steps(cur) if n != prev)
+                    if is_node[nxt]:
+                        break
+                    cells.append(nxt)
+                    prev, cur = cur, nxt
+                c = len(self.chains)
+                chain_of[cells] = c
+                offset[cells] = np.arange(len(cells), dtype=np.int32)
+                self.chains.append((u, nxt, cells))
+
+        self.chain_of = memoryview(chain_of).cast('B').cast('i')
+        self.offset = memoryview(offset).cast('B').cast('i')
+        self.node_count = int(node.sum())
+        self._version = campus_map.version
+        self.build_seconds = time.perf_counter() - t0
+
+    def _steps(self, i: int) -> list[int]:
+        """Walkable grid neighbours of flat index i."""
+        cols, is_free = self.cols, self.free
+        y = i % cols
+        out = []
+        if i >= cols and is_free[i - cols]: out.append(i - cols)
+        if i + cols < len(is_free) and is_free[i + cols]: out.append(i + cols)
+        if y > 0 and is_free[i - 1]: out.append(i - 1)
+        if y < cols - 1 and is_free[i + 1]: out.append(i + 1)
+        return out
+
+    def _ensure_current(self):
+        if self._version != self.map.version:
+            self.build()
+
+    # ------------------------------------------------------------------ #
+    # search
+    # ------------------------------------------------------------------ #
+    def _hops_from_node(self, u: int):
+        """(next node, steps, chain or NO_CHAIN, walking forward along it) out of node u."""
+        for n in self._steps(u):
+            if self.node[n]:
+                yield n, 1, NO_CHAIN, True
+                continue
+            c = self.chain_of[n]
+            if c == NO_CHAIN:
+                continue
+            a, b, cells = self.chains[c]
+            if n == cells[0] and a == u:
+                yield b, len(cells) + 1, c, True
+            if n == cells[-1] and b == u:
+                yield a, len(cells) + 1, c, False
+
+    def _hops_off_chain(self, i: int):
+        """The two ways out of corridor cell i: to either end of its chain."""
+        c = self.chain_of[i]
+        k = self.offset[i]
+        a, b, cells = self.chains[c]
+        yield a, k + 1, c, False
+        yield b, len(cells) - k, c, True
+
+    def find(self, start: int, goal: int) -> list[tuple[int, int, int, bool]] | None:
+        """
+        A* over the contracted graph. Returns the route as hops
+        (from, to, chain, forward) with flat indices, [] if start == goal,
+        or None if goal cannot be reached. Corridor cells are only valid
+        as start or goal.
+        """
+        self._ensure_current()
+        self.expanded = self.peak_open = 0
+        if start == goal:
+            return []
+        if not (self.free[start] and self.free[goal]):
+            return None
+        for end in (start, goal):
+            if not self.node[end] and self.chain_of[end] == NO_CHAIN:
+                return None   # on a corridor loop no node leads to
+
+        cols = self.cols
+        gx, gy = divmod(goal, cols)
+        goal_chain = NO_CHAIN if self.node[goal] else self.chain_of[goal]
+        goal_offset = self.offset[goal]
+
+        g = {start: 0}
+        parent: dict[int, tuple[int, int, bool]] = {}
+        closed = set()
+        sx, sy = divmod(start, cols)
+        heap = [(abs(sx - gx) + abs(sy - gy), 0, start)]
+
+        while heap:
+            _, g_cur, cur = heapq.heappop(heap)
+            if cur in closed:
+                continue
+            if cur == goal:
+                return self._route(start, goal, parent)
+            closed.add(cur)
+            self.expanded += 1
+
+            hops = list(self._hops_from_node(cur) if self.node[cur] else self._hops_off_chain(cur))
+            if goal_chain != NO_CHAIN:
+                # the goal sits inside a chain: its ends (or the start, if it
+                # is on the same chain) can step straight to it
+                a, b, cells = self.chains[goal_chain]
+                here = self.offset[cur] if not self.node[cur] and self.chain_of[cur] == goal_chain else None
+                if here is not None:
+                    hops.append((goal, abs(here - goal_offset), goal_chain, here < goal_offset))
+                else:
+                    if cur == a:
+                        hops.append((goal, goal_offset + 1, goal_chain, True))
+                    if cur == b:
+                        hops.append((goal, len(cells) - goal_offset, goal_chain, False))
+
+            for nb, steps, chain, forward in hops:
+                if nb in closed:
+                    continue
+                g_next = g_cur + steps
+                if g_next < g.get(nb, g_next + 1):
+                    g[nb] = g_next
+                    parent[nb] = (cur, chain, forward)
+                    nx, ny = divmod(nb, cols)
+                    heapq.heappush(heap, (g_next + abs(nx - gx) + abs(ny - gy), g_next, nb))
+            if len(heap) > self.peak_open:
+                self.peak_open = len(heap)
+        return None
+
+    def _route(self, start: int, goal: int, parent) -> list[tuple[int, int, int, bool]]:
+        route = []
+        cur = goal
+        while cur != start:
+            prev, chain, forward = parent[cur]
+            route.append((prev, cur, chain, forward))
+            cur = prev
+        route.reverse()
+        return route
+
+    def expand(self, route):
+        """
+        Yield the cells of each hop of `route` in turn (flat indices, both
+        ends included). Nothing is materialised before it is asked for.
+        """
+        for u, v, chain, forward in route:
+            if chain == NO_CHAIN:
+                yield [u, v]
+                continue
+            cells = self.chains[chain][2]
+            # where u and v sit along the chain: the ends are just outside it
+            pos_u = self._chain_position(u, chain, forward, leaving=True)
+            pos_v = self._chain_position(v, chain, forward, leaving=False)
+            if forward:
+                yield [u] + cells[pos_u + 1:pos_v] + [v]
+            else:
+                yield [u] + cells[pos_v + 1:pos_u][::-1] + [v]
+
+    def _chain_position(self, i: int, chain: int, forward: bool, leaving: bool) -> int:
+        """Offset of i along chain; an end node counts as -1 (end a) or len (end b)."""
+        if not self.node[i] and self.chain_of[i] == chain:
+            return self.offset[i]
+        # an end: entering forward / leaving backward means end b, else end a
+        at_b = forward != leaving
+        return len(self.chains[chain][2]) if at_b else -1
+
+
+_graphs: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def corridors_for(campus_map) -> CorridorGraph:
+    """
+    The CorridorGraph shared by every robot on `campus_map` (built on first use).
+    """
+    graph = _graphs.get(campus_map)
+    if graph is None:
+        graph = CorridorGraph(campus_map)
+        _graphs[campus_map] = graph
+    return graph
@@ -0,0 +1,211 @@
+# src/BearDownBots/dynamic/distance_field.py
+"""
+BFS distance fields over the walkway network.
+
+Every trip starts or ends at the Food Warehouse pickup cell, and every
+destination is one of a fixed set of building dropoff points. A field
+holds, for each cell, the number of steps to its source (or -1 when the
+cell is not walkable or cannot reach it), so
+
+  * the distance between the source and any cell is a single lookup, and
+  * a route to the source is found by walking downhill, with no search.
+
+Fields only depend on walkways and obstacles, not robots, and are rebuilt
+when Map.version says the static map changed.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from BearDownBots.config import Config
+from BearDownBots.static.cell import CELL_TYPES
+from BearDownBots.dynamic.pathfinding import WALKWAY_BIT, OBSTACLE_BIT, ROBOT_BIT
+
+UNREACHABLE = -1
+
+
+class DistanceField:
+    """
+    Steps from every cell to `source` (a flat index), as a flat int32 array.
+    """
+
+    def __init__(self, grid: np.ndarray, source: int):
+        self.rows, self.cols = grid.shape
+        self.source = source
+        self.cells = memoryview(grid).cast('B')
+        self.dist = self._bfs(grid, source)
+        self._dist = memoryview(self.dist)   # fast scalar reads
+
+    def _bfs(self, grid: np.ndarray, source: int) -> np.ndarray:
+        # level-synchronous BFS: each ring is expanded with array ops, so
+        # the cost is one small NumPy call per distance, not per cell
+        cols = self.cols
+        flat = grid.reshape(-1)
+        open_cells = (flat & WALKWAY_BIT).astype(bool) & ~(flat & OBSTACLE_BIT).astype(bool)
+
+        dist = np.full(flat.size, UNREACHABLE, dtype=np.int32)
+        if not open_cells[source]:
+            return dist
+        dist[source] = 0
+        open_cells[source] = False
+
+        frontier = np.array([source], dtype=np.int64)
+        d = 0
+        while frontier.size:
+            d += 1
+            col = frontier % cols
+            nbs = np.concatenate((
+                frontier - cols,
+                frontier + cols,
+                frontier[col > 0] - 1,
+                frontier[col < cols - 1] + 1,
+            ))
+            nbs = nbs[(nbs >= 0) & (nbs < flat.size)]
+            nbs = np.unique(nbs[open_cells[nbs]])
+            open_cells[nbs] = False
+            dist[nbs] = d
+            frontier = nbs
+        return dist
+
+    def distance(self, i: int) -> int | None:
+        """Steps from flat index i to the source, or None if unreachable."""
+        d = self._dist[i]
+        return None if d == UNREACHABLE else d
+
+    def descend(self, i: int) -> list[int] | None:
+        """
+        Route from i to the source by following the gradient, as flat
+        indices (both ends included). Where there is a choice of downhill
+        step a cell without a robot is preferred. None if unreachable.
+        """
+        dist, cells, cols = self._dist, self.cells, self.cols
+        last_row, last_col = self.rows - 1, cols - 1
+        d = dist[i]
+        if d == UNREACHABLE:
+            return None
+
+        path = [i]
+        while d > 0:
+            x, y = divmod(i, cols)
+            step = None
+            for nb, ok in ((i - cols, x > 0), (i + cols, x < last_row),
+                           (i - 1, y > 0), (i + 1, y < last_col)):
+                if ok and dist[nb] == d - 1:
+                    if not cells[nb] & ROBOT_BIT:
+                        step = nb
+                        break
+                    if step is None:
+                        step = nb
+            i = step
+            d -= 1
+            path.append(i)
+        return path
+
+
+class DistanceFields:
+    """
+    The pickup field plus lazily built fields for dropoff points, for one
+    Map. A full-size field costs 4 bytes per cell, so at most `capacity`
+    dropoff fields are kept (least recently used is dropped); the pickup
+    field is always kept. Lookups are thread-safe so fields can be built
+    by a background thread while the simulation runs.
+    """
+
+    def __init__(self, campus_map, capacity: int):
+        # weak: fields_for's registry holds these fields, and must not keep the map alive
+        self._map = weakref.ref(campus_map)
+        self.capacity = capacity
+        self._pickup_field: DistanceField | None = None
+        self._fields: OrderedDict[int, DistanceField] = OrderedDict()
+        self._version = campus_map.version
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+        pickups = campus_map.cells_with_type(CELL_TYPES.RESTUARANT_PICKUP)
+        self.pickup = self._index(pickups[0]) if pickups else None
+
+    @property
+    def map(self):
+        return self._map()
+
+    def _index(self, pos) -> int:
+        x, y = pos
+        return x * self.map.cols + y
+
+    def _check_version(self):
+        if self.map.version != self._version:
+            self._pickup_field = None
+            self._fields.clear()
+            self._version = self.map.version
+
+    def to_pickup(self) -> DistanceField:
+        """The field towards the restaurant pickup cell."""
+        with self._lock:
+            self._check_version()
+            if self._pickup_field is None:
+                self._pickup_field = DistanceField(self.map.grid, self.pickup)
+            return self._pickup_field
+
+    def field(self, source) -> DistanceField:
+        """The field towards `source` (an (x, y) pair or flat index)."""
+        if not isinstance(source, int):
+            source = self._index(source)
+        if source == self.pickup:
+            return self.to_pickup()
+        with self._lock:
+            self._check_version()
+            f = self._fields.get(source)
+            if f is None:
+                f = DistanceField(self.map.grid, source)
+                self._fields[source] = f
+                while len(self._fields) > max(self.capacity, 1):
+                    self._fields.popitem(last=False)
+            else:
+                self._fields.move_to_end(source)
+            return f
+
+    def distance(self, a, b) -> int | None:
+        """
+        Exact walking distance between two (x, y) cells, read from whichever
+        end already has a field (building one for `a` if neither does, so
+        pass the end that stays the same over a run of lookups first).
+        """
+        ia, ib = self._index(a), self._index(b)
+        if ib == self.pickup or (ib in self._fields and ia not in self._fields):
+            ia, ib = ib, ia
+        return self.field(ia).distance(ib)
+
+    def dropoffs(self) -> list[tuple[int, int]]:
+        return [tuple(b.dropoff_point) for b in self.map.buildings if b.dropoff_point]
+
+    def warm_up(self):
+        """Build the pickup field, then dropoff fields until the cache is full."""
+        self.to_pickup()
+        for pos in self.dropoffs()[:self.capacity]:
+            self.field(pos)
+
+    def warm_up_in_background(self) -> threading.Thread:
+        """Start warm_up() on a daemon thread and return it."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.warm_up, name="distance-fields", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def __len__(self) -> int:
+        return len(self._fields) + (self._pickup_field is not None)
+
+
+_fields: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def fields_for(campus_map) -> DistanceFields:
+    """
+    The DistanceFields shared by every robot on `campus_map` (created on first use).
+    """
+    fields = _fields.get(campus_map)
+    if fields is None:
+        fields = DistanceFields(campus_map, Config.Simulation.DISTANCE_FIELD_CACHE)
+        _fields[campus_map] = fields
+    return fields
@@ -0,0 +1,191 @@
+# src/BearDownBots/dynamic/dstar_lite.py
+"""
+D* Lite incremental replanning, one planner per robot and goal.
+
+The search runs backwards from the goal, so the robot can keep moving
+towards it without invalidating what was computed. Between plans the map's
+robot-occupancy log (Map.flips_since) says which cells gained or lost a
+robot; only their neighbours are re-examined, and the repair touches about
+as many cells as the change affects instead of redoing the whole search.
+
+Stepping onto a robot costs 1 + robot_penalty rather than being forbidden
+(robots share cells when they have to, see Robot.move), so a robot boxed in
+by others still gets a route and moves on instead of waiting. With
+robot_penalty None other robots are walls, as for a_star.
+"""
+import heapq
+
+from BearDownBots.dynamic.pathfinding import WALKWAY_BIT, OBSTACLE_BIT, ROBOT_BIT
+
+INF = float("inf")
+
+
+class DStarLite:
+    def __init__(self, campus_map, goal: int, robot_penalty: int | None = None):
+        self.map = campus_map
+        self.goal = goal
+        self.robot_penalty = robot_penalty
+        self.rows, self.cols = campus_map.rows, campus_map.cols
+        self.cells = memoryview(campus_map.grid).cast('B')
+
+        # stats
+        self.expanded = 0   # cells expanded by the most recent plan()
+        self.peak_open = 0  # most entries (stale ones included) its queue held
+        self.repaired = 0   # cells re-examined for occupancy changes by it
+        self.plans = 0
+        self._reset()
+
+    def _reset(self):
+        self.g: dict[int, float] = {}
+        self.rhs: dict[int, float] = {self.goal: 0}
+        self.km = 0
+        self._open: list[tuple[float, float, int]] = []
+        self._open_key: dict[int, tuple[float, float]] = {}   # live heap entry per cell
+        self._last_start = None
+        self._mark = self.map.flip_mark()
+        self._version = self.map.version
+
+    # ------------------------------------------------------------------ #
+    # graph
+    # ------------------------------------------------------------------ #
+    def _neighbours(self, i: int) -> tuple[int, ...]:
+        cols = self.cols
+        x, y = divmod(i, cols)
+        out = ()
+        if x > 0: out += (i - cols,)
+        if x < self.rows - 1: out += (i + cols,)
+        if y > 0: out += (i - 1,)
+        if y < cols - 1: out += (i + 1,)
+        return out
+
+    def _cost(self, i: int) -> float:
+        """Cost of stepping onto cell i."""
+        b = self.cells[i]
+        if not b & WALKWAY_BIT or b & OBSTACLE_BIT:
+            return INF
+        if b & ROBOT_BIT:
+            return INF if self.robot_penalty is None else 1 + self.robot_penalty
+        return 1
+
+    def _push(self, i: int, start: int):
+        """(Re)queue i if it is inconsistent, drop it from the queue otherwise."""
+        g_i, rhs_i = self.g.get(i, INF), self.rhs.get(i, INF)
+        if g_i == rhs_i:
+            self._open_key.pop(i, None)
+            return
+        best = g_i if g_i < rhs_i else rhs_i
+        cols = self.cols
+        x, y = divmod(i, cols)
+        sx, sy = divmod(start, cols)
+        key = (best + abs(sx - x) + abs(sy - y) + self.km, best)
+        self._open_key[i] = key
+        heapq.heappush(self._open, (key[0], key[1], i))
+
+    def _update(self, i: int, start: int):
+        """Recompute rhs(i) from its neighbours and requeue it."""
+        if i != self.goal:
+            b = self.cells[i]
+            if not b & WALKWAY_BIT or b & OBSTACLE_BIT:
+                return   # never part of the graph (walls only move with map.version)
+            g, cost = self.g, self._cost
+            self.rhs[i] = min(cost(n) + g.get(n, INF) for n in self._neighbours(i))
+        self._push(i, start)
+
+    def _compute(self, start: int):
+        g, rhs, heap, live = self.g, self.rhs, self._open, self._open_key
+        cells, cols, cost = self.cells, self.cols, self._cost
+        pop = heapq.heappop
+        sx, sy = divmod(start, cols)
+        expanded = 0
+        peak = len(heap)
+        while heap:
+            if len(heap) > peak:
+                peak = len(heap)
+            k1, k2, u = heap[0]
+            if live.get(u) != (k1, k2):
+                pop(heap)   # stale entry
+                continue
+            g_start, rhs_start = g.get(start, INF), rhs.get(start, INF)
+            best = g_start if g_start < rhs_start else rhs_start
+            if (k1, k2) >= (best + self.km, best) and g_start == rhs_start:
+                break
+            pop(heap)
+            del live[u]
+            expanded += 1
+
+            g_u, rhs_u = g.get(u, INF), rhs.get(u, INF)
+            best = g_u if g_u < rhs_u else rhs_u
+            x, y = divmod(u, cols)
+            new_k1 = best + abs(sx - x) + abs(sy - y) + self.km
+            if (k1, k2) < (new_k1, best):
+                live[u] = (new_k1, best)
+                heapq.heappush(heap, (new_k1, best, u))
+            elif g_u > rhs_u:
+                # u got cheaper: its neighbours may now go through it
+                g[u] = rhs_u
+                step = cost(u) + rhs_u
+                for n in self._neighbours(u):
+                    b = cells[n]
+                    if n != self.goal and b & WALKWAY_BIT and not b & OBSTACLE_BIT \
+                            and step < rhs.get(n, INF):
+                        rhs[n] = step
+                        self._push(n, start)
+            else:
+                g[u] = INF
+                self._update(u, start)
+                for n in self._neighbours(u):
+                    self._update(n, start)
+        self.expanded = expanded
+        self.peak_open = peak
+
+    # ------------------------------------------------------------------ #
+    # queries
+    # ------------------------------------------------------------------ #
+    def plan(self, start: int) -> list[int] | None:
+        """
+        Cheapest path from `start` to the goal (flat indices, both ends
+        included) given where robots stand now, or None if there is none.
+        """
+        self.plans += 1
+        flips = self.map.flips_since(self._mark)
+        if self.map.version != self._version or flips is None:
+            # walls moved, or too much happened since the last plan
+            self._reset()
+            flips = []
+
+        if self._last_start is None:
+            self._last_start = start
+            self._update(self.goal, start)
+        else:
+            lx, ly = divmod(self._last_start, self.cols)
+            sx, sy = divmod(start, self.cols)
+            self.km += abs(lx - sx) + abs(ly - sy)
+            self._last_start = start
+
+        # a robot appearing or leaving changes the cost of stepping onto that
+        # cell, i.e. the outgoing edges of its neighbours. Cells the search
+        # has never reached are updated too: behind a robot that could not be
+        # crossed nothing was, and the robot leaving must open that up again
+        touched = set(flips)
+        for i in flips:
+            touched.update(self._neighbours(i))
+        for i in touched:
+            self._update(i, start)
+        self.repaired = len(touched)
+        self._mark = self.map.flip_mark()
+
+        self._compute(start)
+        return self._extract(start)
+
+    def _extract(self, start: int) -> list[int] | None:
+        g = self.g
+        if g.get(start, INF) == INF:
+            return None
+        path = [start]
+        cur = start
+        while cur != self.goal:
+            cur = min(self._neighbours(cur), key=lambda n: self._cost(n) + g.get(n, INF))
+            if g.get(cur, INF) == INF or len(path) > self.rows * self.cols:
+                return None
+            path.append(cur)
+        return path
@@ -0,0 +1,297 @@
+# src/BearDownBots/dynamic/hpa.py
+"""
+Hierarchical pathfinding (HPA*) over fixed-size campus clusters.
+
+The map is cut into CLUSTER x CLUSTER squares. Wherever walkways cross
+the border between two neighbouring clusters an entrance is made: one
+transition (two abstract nodes, one on each side, one step apart) in the
+middle of short openings, one at each end of long ones. Routes are first
+searched on this small abstract graph; cell-level paths are only produced
+per abstract edge, as the robot gets there (see HierarchicalPlanner.refine).
+
+Distances between the nodes of one cluster are computed the first time a
+search enters that cluster and then kept. The planner listens for map
+changes, so an obstacle dropped into a cluster only recomputes the
+entrances on that cluster's borders and forgets its own (and its direct
+neighbours') cached distances. Robots are not part of the abstract graph;
+they are avoided when an edge is refined.
+
+Routes are near-optimal, not optimal: they are forced through entrances.
+"""
+import heapq
+import weakref
+from collections import deque
+
+import numpy as np
+
+from BearDownBots.config import Config
+from BearDownBots.dynamic.pathfinding import WALKWAY_BIT, OBSTACLE_BIT
+
+
+class HierarchicalPlanner:
+    LONG_ENTRANCE = 6   # openings at least this wide get a transition at each end
+
+    def __init__(self, campus_map, cluster_size: int):
+        # weak: planner_for's registry holds this planner, and must not keep the map alive
+        self._map = weakref.ref(campus_map)
+        self.size = cluster_size
+        self.rows, self.cols = campus_map.rows, campus_map.cols
+        self.cells = memoryview(campus_map.grid).cast('B')
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+
+        self._inter: dict[int, set[int]] = {}              # node -> nodes one step across a border
+        self._border: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self._nodes: dict[int, set[int]] = {}              # cluster -> its abstract nodes
+        self._intra: dict[int, dict[int, dict[int, int]]] = {}   # cluster -> node -> {node: steps}
+
+        # stats of the most recent find()
+        self.expanded = 0
+        self.peak_open = 0
+        self.rebuilt_clusters = 0
+
+        for c in range(self.cluster_rows * self.cluster_cols):
+            for other in self._forward_neighbours(c):
+                self._build_border(c, other)
+        # the map only holds the listener weakly too, through a WeakMethod,
+        # and drops it once the planner is closed or collected
+        on_change = weakref.WeakMethod(self._on_change)
+
+        def listener(x0: int, y0: int, x1: int, y1: int):
+            method = on_change()
+            if method is not None:
+                method(x0, y0, x1, y1)
+        campus_map.add_change_listener(listener)
+        self._finalizer = weakref.finalize(self, HierarchicalPlanner._release, self._map, listener)
+
+    @property
+    def map(self):
+        return self._map()
+
+    @staticmethod
+    def _release(map_ref, listener):
+        campus_map = map_ref()
+        if campus_map is not None:
+            campus_map.remove_change_listener(listener)
+
+    def close(self):
+        """Stop following the map's changes."""
+        self._finalizer()
+
+    # ------------------------------------------------------------------ #
+    # clusters and entrances
+    # ------------------------------------------------------------------ #
+    def cluster_of(self, i: int) -> int:
+        x, y = divmod(i, self.cols)
+        return (x // self.size) * self.cluster_cols + y // self.size
+
+    def _bounds(self, c: int) -> tuple[int, int, int, int]:
+        cx, cy = divmod(c, self.cluster_cols)
+        x0, y0 = cx * self.size, cy * self.size
+        return x0, y0, min(x0 + self.size, self.rows), min(y0 + self.size, self.cols)
+
+    def _forward_neighbours(self, c: int) -> list[int]:
+        """Clusters right of and below c (each border is owned by its upper/left cluster)."""
+        cx, cy = divmod(c, self.cluster_cols)
+        out = []
+        if cy + 1 < self.cluster_cols: out.append(c + 1)
+        if cx + 1 < self.cluster_rows: out.append(c + self.cluster_cols)
+        return out
+
+    def _neighbours(self, c: int) -> list[int]:
+        cx, cy = divmod(c, self.cluster_cols)
+        out = self._forward_neighbours(c)
+        if cy > 0: out.append(c - 1)
+        if cx > 0: out.append(c - self.cluster_cols)
+        return out
+
+    def _free(self, region: np.ndarray) -> np.ndarray:
+        return ((region & WALKWAY_BIT) != 0) & ((region & OBSTACLE_BIT) == 0)
+
+    def _build_border(self, a: int, b: int):
+        """Find the entrances on the border between clusters a < b."""
+        grid, cols = self.map.grid, self.cols
+        ax0, ay0, ax1, ay1 = self._bounds(a)
+        if b // self.cluster_cols == a // self.cluster_cols:
+            # vertical border: column ay1 - 1 of a against column ay1 of b
+            open_ = self._free(grid[ax0:ax1, ay1 - 1]) & self._free(grid[ax0:ax1, ay1])
+            pair = lambda k: ((ax0 + k) * cols + ay1 - 1, (ax0 + k) * cols + ay1)
+        else:
+            # horizontal border: row ax1 - 1 of a against row ax1 of b
+            open_ = self._free(grid[ax1 - 1, ay0:ay1]) & self._free(grid[ax1, ay0:ay1])
+            pair = lambda k: ((ax1 - 1) * cols + ay0 + k, ax1 * cols + ay0 + k)
+
+        transitions = []
+        padded = np.concatenate(([False], open_, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            if end - start >= self.LONG_ENTRANCE:
+                transitions += [pair(start), pair(end - 1)]
+            else:
+                transitions.append(pair((start + end - 1) // 2))
+
+        for u, v in transitions:
+            self._inter.setdefault(u, set()).add(v)
+            self._inter.setdefault(v, set()).add(u)
+            self._nodes.setdefault(a, set()).add(u)
+            self._nodes.setdefault(b, set()).add(v)
+        self._border[(a, b)] = transitions
+
+    def _drop_border(self, a: int, b: int):
+        for u, v in self._border.pop((a, b), []):
+            for n, m, c in ((u, v, a), (v, u, b)):
+                links = self._inter.get(n)
+                if links is not None:
+                    links.discard(m)
+                    if not links:
+                        del self._inter[n]
+                        self._nodes[c].discard(n)
+
+    def _on_change(self, x0: int, y0: int, x1: int, y1: int):
+        """Map listener: rebuild only the clusters the changed rectangle touches."""
+        s = self.size
+        touched = {
+            cx * self.cluster_cols + cy
+            for cx in range(max(x0, 0) // s, min(x1 - 1, self.rows - 1) // s + 1)
+            for cy in range(max(y0, 0) // s, min(y1 - 1, self.cols - 1) // s + 1)
+        }
+        borders = set()
+        for c in touched:
+            for other in self._neighbours(c):
+                borders.add((min(c, other), max(c, other)))
+        for a, b in borders:
+            self._drop_border(a, b)
+            self._build_border(a, b)
+        stale = set(touched)
+        for c in touched:
+            stale.update(self._neighbours(c))
+        for c in stale:
+            self._intra.pop(c, None)
+        self.rebuilt_clusters += len(touched)
+
+    # ------------------------------------------------------------------ #
+    # inside one cluster
+    # ------------------------------------------------------------------ #
+    def _bfs_in_cluster(self, source: int, targets) -> dict[int, int]:
+        """Steps from source to each reachable target, staying inside its cluster."""
+        x0, y0, x1, y1 = self._bounds(self.cluster_of(source))
+        w, cols = y1 - y0, self.cols
+        # work on a local copy of the cluster: list lookups beat dict ones
+        free = self._free(self.map.grid[x0:x1, y0:y1]).ravel().tolist()
+        local = lambda i: (i // cols - x0) * w + i % cols - y0
+
+        wanted = {local(t): t for t in targets
+                  if x0 <= t // cols < x1 and y0 <= t % cols < y1}
+        found = {}
+        dist = [-1] * len(free)
+        s = local(source)
+        dist[s] = 0
+        queue = deque([s])
+        while queue and len(found) < len(wanted):
+            cur = queue.popleft()
+            d = dist[cur] + 1
+            if cur in wanted:
+                found[wanted[cur]] = d - 1
+            y = cur % w
+            for nb in (cur - w, cur + w, cur - 1 if y else -1, cur + 1 if y < w - 1 else -1):
+                if 0 <= nb < len(free) and free[nb] and dist[nb] < 0:
+                    dist[nb] = d
+                    queue.append(nb)
+        return found
+
+    def _intra_edges(self, c: int) -> dict[int, dict[int, int]]:
+        edges = self._intra.get(c)
+        if edges is None:
+            nodes = self._nodes.get(c, set())
+            edges = {n: self._bfs_in_cluster(n, nodes - {n}) for n in nodes}
+            self._intra[c] = edges
+        return edges
+
+    # ------------------------------------------------------------------ #
+    # queries
+    # ------------------------------------------------------------------ #
+    def find(self, start: int, goal: int) -> list[int] | None:
+        """
+        Abstract route from start to goal as a list of flat indices
+        (start, entrance nodes..., goal), or None if there is none.
+        """
+        self.expanded = self.peak_open = 0
+        if start == goal:
+            return [start]
+        cols = self.cols
+        gx, gy = divmod(goal, cols)
+        start_c, goal_c = self.cluster_of(start), self.cluster_of(goal)
+
+        start_edges = self._bfs_in_cluster(start, self._nodes.get(start_c, set()) | {goal})
+        start_edges.pop(start, None)
+        if goal_c != start_c:
+            start_edges.pop(goal, None)
+        to_goal = self._bfs_in_cluster(goal, self._nodes.get(goal_c, set()))
+
+        g = {start: 0}
+        parent = {start: start}
+        closed = set()
+        sx, sy = divmod(start, cols)
+        heap = [(abs(sx - gx) + abs(sy - gy), 0, start)]
+        counter = 0
+
+        while heap:
+            _, _, cur = heapq.heappop(heap)
+            if cur in closed:
+                continue
+            if cur == goal:
+                route = [goal]
+                while route[-1] != start:
+                    route.append(parent[route[-1]])
+                route.reverse()
+                return route
+            closed.add(cur)
+            self.expanded += 1
+
+            steps = [(n, 1) for n in self._inter.get(cur, ())]
+            if cur == start:
+                steps += start_edges.items()
+            else:
+                steps += self._intra_edges(self.cluster_of(cur)).get(cur, {}).items()
+                if cur in to_goal:
+                    steps.append((goal, to_goal[cur]))
+
+            for nb, cost in steps:
+                if nb in closed:
+                    continue
+                g_next = g[cur] + cost
+                if g_next < g.get(nb, g_next + 1):
+                    g[nb] = g_next
+                    parent[nb] = cur
+                    nx, ny = divmod(nb, cols)
+                    counter += 1
+                    heapq.heappush(heap, (g_next + abs(nx - gx) + abs(ny - gy), counter, nb))
+            if len(heap) > self.peak_open:
+                self.peak_open = len(heap)
+        return None
+
+    def refine(self, route: list[int], kernel, avoid_robots: bool = True):
+        """
+        Yield the cell-level path of each abstract edge of `route` in turn
+        (flat indices, both ends included), planned with the kernel's A*
+        only when asked for. Yields None if an edge is blocked right now.
+        """
+        for a, b in zip(route, route[1:]):
+            if b in self._inter.get(a, ()):
+                yield [a, b]
+            else:
+                yield kernel.astar(a, b, avoid_robots)
+
+
+_planners: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def planner_for(campus_map) -> HierarchicalPlanner:
+    """
+    The HierarchicalPlanner shared by every robot on `campus_map` (built on first use).
+    """
+    planner = _planners.get(campus_map)
+    if planner is None:
+        planner = HierarchicalPlanner(campus_map, Config.Simulation.HPA_CLUSTER_SIZE)
+        _planners[campus_map] = planner
+    return planner
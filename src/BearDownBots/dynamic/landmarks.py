@@ -0,0 +1,128 @@
+# src/BearDownBots/dynamic/landmarks.py
+"""
+ALT (A*, Landmarks, Triangle inequality) heuristic.
+
+A few landmarks are picked once the campus exists: the warehouse pickup,
+then repeatedly the dropoff point farthest (by walking distance) from every
+landmark chosen so far. A BFS distance field is stored for each. For any
+cell v and goal t the triangle inequality gives
+
+    d(v, t) >= |d(l, t) - d(l, v)|        for every landmark l
+
+and the largest of these bounds (or Manhattan, if that is larger) is an
+admissible, consistent heuristic that knows about the detours buildings
+force, unlike Manhattan alone. Robots only ever make paths longer, so the
+bound stays admissible while they move around.
+"""
+import time
+import weakref
+
+from BearDownBots.config import Config
+from BearDownBots.dynamic.distance_field import DistanceField, UNREACHABLE
+from BearDownBots.static.cell import CELL_TYPES
+
+
+class Landmarks:
+    def __init__(self, campus_map, count: int):
+        # weak: landmarks_for's registry holds these, and must not keep the map alive
+        self._map = weakref.ref(campus_map)
+        self.count = count
+        self.fields: list[DistanceField] = []
+        self.build_seconds = 0.0
+        self._version = None
+
+    @property
+    def map(self):
+        return self._map()
+
+    @property
+    def sources(self) -> list[tuple[int, int]]:
+        return [divmod(f.source, self.map.cols) for f in self.fields]
+
+    def build(self, progress_window=None):
+        """Pick the landmarks and compute their distance fields."""
+        t0 = time.perf_counter()
+        campus_map = self.map
+        cols = campus_map.cols
+        if progress_window is not None:
+            progress_window.start_phase("Building ALT Landmarks", self.count)
+
+        candidates = [x * cols + y for x, y in
+                      (b.dropoff_point for b in campus_map.buildings if b.dropoff_point)]
+        pickups = campus_map.cells_with_type(CELL_TYPES.RESTUARANT_PICKUP)
+        first = pickups[0][0] * cols + pickups[0][1] if pickups else (candidates[0] if candidates else None)
+
+        self.fields = []
+        nearest = {}   # candidate -> distance to the closest landmark so far
+        source = first
+        while source is not None and len(self.fields) < self.count:
+            field = DistanceField(campus_map.grid, source)
+            self.fields.append(field)
+            if progress_window is not None:
+                progress_window.update_progress(len(self.fields))
+
+            for c in candidates:
+                d = field.distance(c)
+                if d is not None and d < nearest.get(c, d + 1):
+                    nearest[c] = d
+            # only dropoffs connected to the first landmark are worth using
+            source = max((c for c in nearest if nearest[c] > 0), key=nearest.get, default=None)
+
+        self._version = campus_map.version
+        self.build_seconds = time.perf_counter() - t0
+        summary = (f"ALT: {len(self.fields)} landmarks built in {self.build_seconds:.2f}s "
+                   f"({len(self.fields) * campus_map.rows * cols * 4 / 1e6:.0f} MB)")
+        print(summary)
+        if progress_window is not None:
+            progress_window.show_message(summary)
+
+    def may_connect(self, a: int, b: int) -> bool:
+        """
+        False when some landmark reaches exactly one of the flat indices a
+        and b: they are then in different walkway components and no search
+        can join them.
+        """
+        if self._version != self.map.version:
+            self.build()
+        for f in self.fields:
+            if (f.dist[a] == UNREACHABLE) != (f.dist[b] == UNREACHABLE):
+                return False
+        return True
+
+    def heuristic(self, goal: int):
+        """h(i) for A* searches towards the flat index `goal`."""
+        if self._version != self.map.version:
+            self.build()
+
+        cols = self.map.cols
+        gx, gy = divmod(goal, cols)
+        # landmarks that cannot reach the goal bound nothing
+        bounds = [(view, view[goal]) for view in (memoryview(f.dist) for f in self.fields)
+                  if view[goal] != UNREACHABLE]
+
+        def h(i):
+            x, y = divmod(i, cols)
+            best = abs(x - gx) + abs(y - gy)
+            for dist, to_goal in bounds:
+                d = dist[i]
+                if d != UNREACHABLE:
+                    diff = to_goal - d if to_goal > d else d - to_goal
+                    if diff > best:
+                        best = diff
+            return best
+
+        return h
+
+
+_landmarks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def landmarks_for(campus_map) -> Landmarks:
+    """
+    The Landmarks shared by every robot on `campus_map` (built on first use).
+    """
+    landmarks = _landmarks.get(campus_map)
+    if landmarks is None:
+        landmarks = Landmarks(campus_map, Config.Simulation.ALT_LANDMARKS)
+        _landmarks[campus_map] = landmarks
+    return landmarks
@@ -0,0 +1,132 @@
+# src/BearDownBots/dynamic/path_cache.py
+"""
+Shared LRU cache of planned routes.
+
+Entries are keyed by (start, goal, algorithm) on flat cell indices and are
+only valid for one Map.version: any structural change (obstacles, new
+walkways, ...) empties the cache. Robots are not structural, so instead of
+invalidating on every robot step a hit is checked against the current
+robot occupancy of just the cached path's cells.
+"""
+import weakref
+from collections import OrderedDict
+
+from BearDownBots.config import Config
+from BearDownBots.dynamic.pathfinding import ROBOT_BIT
+
+
+class PathCache:
+    def __init__(self, campus_map, capacity: int):
+        # weak: cache_for's registry holds this cache, and must not keep the map alive
+        self._map = weakref.ref(campus_map)
+        self.capacity = capacity
+        self._cells = memoryview(campus_map.grid).cast('B')
+        self._entries: OrderedDict[tuple[int, int, str], list[int]] = OrderedDict()
+        self._version = campus_map.version
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0        # dropped to stay within capacity
+        self.invalidations = 0    # whole-cache flushes after a map change
+        self.blocked = 0          # hits rejected because a robot sits on the path
+        self.search_seconds = 0.0 # time spent on the searches that filled the cache
+        self.searches = 0
+
+    @property
+    def map(self):
+        return self._map()
+
+    def _check_version(self):
+        if self.map.version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._version = self.map.version
+
+    def get(self, start: int, goal: int, algorithm: str, avoid_robots: bool = True) -> list[int] | None:
+        """
+        Cached path from start to goal, or None on a miss.
+        """
+        self._check_version()
+        key = (start, goal, algorithm)
+        path = self._entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+
+        if avoid_robots:
+            cells = self._cells
+            for i in path[1:]:
+                if cells[i] & ROBOT_BIT:
+                    del self._entries[key]
+                    self.blocked += 1
+                    self.misses += 1
+                    return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return path
+
+    def put(self, start: int, goal: int, algorithm: str, path: list[int], seconds: float = 0.0):
+        """
+        Store a freshly searched path; `seconds` is what the search cost.
+        """
+        self._check_version()
+        self.search_seconds += seconds
+        self.searches += 1
+        if self.capacity <= 0:
+            return
+        key = (start, goal, algorithm)
+        self._entries[key] = path
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Search time avoided, estimated from the mean cost of a real search."""
+        if not self.searches:
+            return 0.0
+        return self.hits * self.search_seconds / self.searches
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "blocked": self.blocked,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+    def __str__(self):
+        return (f"PathCache {len(self)}/{self.capacity}: hit rate {self.hit_rate:.1%} "
+                f"({self.hits} hits, {self.misses} misses), {self.evictions} evicted, "
+                f"{self.invalidations} invalidations, {self.blocked} blocked, "
+                f"~{self.saved_seconds:.2f}s search time saved")
+
+
+_caches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def cache_for(campus_map) -> PathCache:
+    """
+    The PathCache shared by every robot on `campus_map` (created on first use).
+    """
+    cache = _caches.get(campus_map)
+    if cache is None:
+        cache = PathCache(campus_map, Config.Simulation.PATH_CACHE_SIZE)
+        _caches[campus_map] = cache
+    return cache
@@ -0,0 +1,163 @@
+# src/BearDownBots/dynamic/path_stats.py
+"""
+Per-algorithm and per-robot search statistics.
+
+Every route a robot asks for is recorded once (Robot.find_path, Robot.replan,
+and answers coming back from the batch planner): what it cost in wall time,
+how many nodes the search expanded, how large its open heap grew, how long
+the path was (and, for shortened dfs/greedy routes, how long it was
+before), and whether it failed or came out of the path cache. Totals
+and maxima are kept alongside coarse log-scale histograms, so a long run
+costs a few dict updates per search and a fixed amount of memory.
+
+stats() is plain data for json.dump; the headless CLI prints summary()
+from `status` and the app writes the whole thing to build/ on exit.
+"""
+import json
+import weakref
+
+# histogram bucket upper bounds; anything larger falls in the last, open bucket
+LATENCY_BOUNDS_MS = (0.1, 1, 10, 100, 1000)
+EXPANDED_BOUNDS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _bucket(value: float, bounds: tuple) -> int:
+    for k, bound in enumerate(bounds):
+        if value <= bound:
+            return k
+    return len(bounds)
+
+
+def _labels(bounds: tuple, unit: str = "") -> list[str]:
+    return [f"<={b}{unit}" for b in bounds] + [f">{bounds[-1]}{unit}"]
+
+
+class SearchTally:
+    """Running totals for one algorithm or one robot."""
+
+    def __init__(self):
+        self.searches = 0
+        self.failures = 0
+        self.cache_hits = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.expanded = 0
+        self.max_expanded = 0
+        self.max_peak_open = 0
+        self.path_cells = 0
+        self.paths = 0   # successful searches whose length is known
+        self.max_path = 0
+        self.shortened = 0        # paths that went through PathKernel.shorten
+        self.raw_path_cells = 0   # their length as the search found them
+        self.shortened_cells = 0  # and after shortening
+        self.latency_hist = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        self.expanded_hist = [0] * (len(EXPANDED_BOUNDS) + 1)
+
+    def add(self, seconds: float, expanded: int | None, peak_open: int | None,
+            length: int | None, raw_length: int | None, failed: bool, cached: bool):
+        self.searches += 1
+        self.failures += failed
+        self.cache_hits += cached
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.latency_hist[_bucket(seconds * 1000, LATENCY_BOUNDS_MS)] += 1
+        if expanded is not None:
+            self.expanded += expanded
+            self.max_expanded = max(self.max_expanded, expanded)
+            self.expanded_hist[_bucket(expanded, EXPANDED_BOUNDS)] += 1
+        if peak_open is not None:
+            self.max_peak_open = max(self.max_peak_open, peak_open)
+        if length is not None and not failed:
+            self.paths += 1
+            self.path_cells += length
+            self.max_path = max(self.max_path, length)
+            if raw_length is not None:
+                self.shortened += 1
+                self.raw_path_cells += raw_length
+                self.shortened_cells += length
+
+    def stats(self) -> dict:
+        n = self.searches
+        return {
+            "searches": n,
+            "failures": self.failures,
+            "cache_hits": self.cache_hits,
+            "total_seconds": round(self.seconds, 4),
+            "mean_ms": round(1000 * self.seconds / n, 3) if n else 0.0,
+            "max_ms": round(1000 * self.max_seconds, 3),
+            "mean_expanded": round(self.expanded / n, 1) if n else 0.0,
+            "max_expanded": self.max_expanded,
+            "max_peak_open": self.max_peak_open,
+            "mean_path": round(self.path_cells / self.paths, 1) if self.paths else 0.0,
+            "max_path": self.max_path,
+            "shortened": self.shortened,
+            "mean_path_before_shortening": round(self.raw_path_cells / self.shortened, 1) if self.shortened else 0.0,
+            "mean_path_after_shortening": round(self.shortened_cells / self.shortened, 1) if self.shortened else 0.0,
+            "latency_hist": dict(zip(_labels(LATENCY_BOUNDS_MS, "ms"), self.latency_hist)),
+            "expanded_hist": dict(zip(_labels(EXPANDED_BOUNDS), self.expanded_hist)),
+        }
+
+    def __str__(self):
+        s = self.stats()
+        path = f"path {s['mean_path']:.0f} cells mean" if self.paths else "path length n/a"
+        if self.shortened:
+            path += (f" (shortened {s['mean_path_before_shortening']:.0f} -> "
+                     f"{s['mean_path_after_shortening']:.0f})")
+        return (f"{s['searches']} searches, {s['failures']} failed, {s['cache_hits']} cached, "
+                f"{s['mean_ms']:.2f}ms mean / {s['max_ms']:.1f}ms max, "
+                f"{s['mean_expanded']:.0f} expanded mean, peak heap {s['max_peak_open']}, {path}")
+
+
+class PathStats:
+    def __init__(self):
+        self.by_algorithm: dict[str, SearchTally] = {}
+        self.by_robot: dict[int, SearchTally] = {}
+
+    def record(self, algorithm: str, robot_id: int, seconds: float,
+               expanded: int | None = None, peak_open: int | None = None,
+               length: int | None = None, raw_length: int | None = None,
+               failed: bool = False, cached: bool = False):
+        """
+        One route request. `length` is in steps; None where the search does
+        not know it yet (routes expanded lazily) and for metrics the
+        algorithm does not have. `raw_length` is the length before
+        PathKernel.shorten, for the searches that go through it.
+        """
+        for table, key in ((self.by_algorithm, algorithm), (self.by_robot, robot_id)):
+            tally = table.get(key)
+            if tally is None:
+                tally = table[key] = SearchTally()
+            tally.add(seconds, expanded, peak_open, length, raw_length, failed, cached)
+
+    def stats(self) -> dict:
+        return {
+            "by_algorithm": {k: t.stats() for k, t in sorted(self.by_algorithm.items())},
+            "by_robot": {str(k): t.stats() for k, t in sorted(self.by_robot.items())},
+        }
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=1)
+
+    def summary(self) -> str:
+        """One line per algorithm, for the CLI."""
+        if not self.by_algorithm:
+            return "PathStats: no searches yet"
+        return "\n".join(f"PathStats {name}: {tally}" for name, tally in sorted(self.by_algorithm.items()))
+
+    def __str__(self):
+        return self.summary()
+
+
+_stats: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def stats_for(campus_map) -> PathStats:
+    """
+    The PathStats collecting every search made on `campus_map`.
+    """
+    stats = _stats.get(campus_map)
+    if stats is None:
+        stats = PathStats()
+        _stats[campus_map] = stats
+    return stats
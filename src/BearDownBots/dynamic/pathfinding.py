@@ -0,0 +1,741 @@
+# src/BearDownBots/dynamic/pathfinding.py
+"""
+Grid search kernel shared by every robot on a map.
+
+Cells are addressed by flat index  i = x * cols + y  and walkability is read
+straight from the Map's bitmask grid, so no Position/Cell objects are made
+while searching. Per-cell bookkeeping (g, parent, seen, closed) lives in
+preallocated arrays that are "cleared" by bumping a generation counter
+instead of being reallocated for every search.
+"""
+import heapq
+import weakref
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+from BearDownBots.static.cell import CELL_TYPES
+
+WALKWAY_BIT  = CELL_TYPES.WALKWAY.bit
+OBSTACLE_BIT = CELL_TYPES.OBSTACLE.bit
+ROBOT_BIT    = CELL_TYPES.ROBOT.bit
+
+# searches whose routes are worth a PathKernel.shorten pass afterwards
+SHORTENED_SEARCHES = ("greedy", "dfs")
+
+
+def _forward_table(free: np.ndarray, extra_events: np.ndarray | None = None) -> np.ndarray:
+    """
+    Jump distances along +y for every cell of a 2-D walkability mask.
+
+    A jump from (x, y) stops at the next cell that is blocked, has a
+    forced neighbour (a side cell that is open here but was closed one step
+    back) or is marked in `extra_events`. The result is d > 0 for a jump
+    point d cells ahead, or -k when the run ends in a wall after k free cells.
+    """
+    rows, cols = free.shape
+    side = np.zeros((rows + 2, cols + 1), dtype=bool)   # padded with walls
+    side[1:-1, 1:] = free
+    up_open,   up_behind   = side[:-2, 1:], side[:-2, :-1]
+    down_open, down_behind = side[2:, 1:],  side[2:, :-1]
+    forced = free & ((up_open & ~up_behind) | (down_open & ~down_behind))
+
+    events = ~free | forced
+    if extra_events is not None:
+        events |= extra_events
+
+    ys = np.arange(cols, dtype=np.int32)
+    at = np.where(events, ys, cols).astype(np.int32)
+    # nearest event at or after y, then shift so it is strictly after y
+    nearest = np.minimum.accumulate(at[:, ::-1], axis=1)[:, ::-1]
+    nxt = np.full((rows, cols), cols, dtype=np.int32)
+    nxt[:, :-1] = nearest[:, 1:]
+
+    dist = nxt - ys
+    stop_free = np.zeros((rows, cols), dtype=bool)
+    inside = nxt < cols
+    stop_free[inside] = free[np.nonzero(inside)[0], nxt[inside]]
+    return np.where(stop_free, dist, 1 - dist).astype(np.int32)
+
+
+class JumpTables:
+    """
+    Precomputed Jump Point Search jumps for the static walkway grid
+    (walkways minus obstacles; robots are handled by the search itself).
+
+    east/west/south/north hold, per flat cell, the distance to the next
+    jump point in that direction (> 0) or minus the number of free cells
+    before a wall (<= 0). A vertical jump point is also any cell from which
+    a horizontal jump finds something. `run` numbers the horizontal runs
+    of free cells (-1 where blocked), which is what tells a vertical jump
+    that it has reached the goal's row within sight of the goal; `col_run`
+    does the same for vertical runs (used by PathKernel.shorten).
+    """
+
+    def __init__(self, grid: np.ndarray):
+        free = ((grid & WALKWAY_BIT) != 0) & ((grid & OBSTACLE_BIT) == 0)
+
+        east = _forward_table(free)
+        west = _forward_table(free[:, ::-1])[:, ::-1]
+        turns = (east > 0) | (west > 0)
+        south = _forward_table(free.T, turns.T).T
+        north = _forward_table(free.T[:, ::-1], turns.T[:, ::-1])[:, ::-1].T
+
+        starts = free.copy()
+        starts[:, 1:] &= ~free[:, :-1]
+        run = np.cumsum(starts, dtype=np.int32)
+        run[~free.reshape(-1)] = -1
+
+        starts = free.T.copy()
+        starts[:, 1:] &= ~free.T[:, :-1]
+        col_run = np.cumsum(starts, dtype=np.int32).reshape(starts.shape).T.copy()
+        col_run[~free] = -1
+
+        # memoryviews: scalar reads in the search loop are much faster than numpy indexing
+        self._arrays = [np.ascontiguousarray(t).reshape(-1) for t in (east, west, south, north, col_run)] + [run]
+        self.east, self.west, self.south, self.north, self.col_run, self.run = (memoryview(a) for a in self._arrays)
+
+
+class PathKernel:
+    """
+    A*, JPS, greedy best-first and DFS over a rows x cols uint8 bitmask grid.
+    Each search returns the list of flat indices from start to goal
+    (both included), or None when the goal is unreachable.
+
+    Neighbour order and tie-breaking match the original Robot.a_star /
+    greedy / dfs exactly, so paths are identical.
+    """
+
+    def __init__(self, grid, version_of=None):
+        self.rows, self.cols = grid.shape
+        self.grid = grid
+        self.cells = memoryview(grid).cast('B')   # live view, sees robot moves
+        # zero-arg callable giving the owning Map's version, so derived
+        # static data (jump tables) can tell when walkways/obstacles changed
+        self._version_of = version_of
+        self._jump_tables: JumpTables | None = None
+        self._jump_version = None
+
+        n = self.rows * self.cols
+        self._g      = array('i', bytes(4 * n))
+        self._parent = array('i', bytes(4 * n))
+        self._seen   = array('I', bytes(4 * n))   # == gen  -> g/parent valid
+        self._closed = array('I', bytes(4 * n))   # == gen  -> expanded
+        self._reverse = None                      # same four arrays for the backward half of bidirectional
+        self._gen = 0
+
+        # stats of the most recent search
+        self.expanded = 0
+        self.peak_open = 0
+
+    # ------------------------------------------------------------------ #
+    # helpers
+    # ------------------------------------------------------------------ #
+    def _next_gen(self) -> int:
+        self._gen += 1
+        if self._gen >= 0xFFFFFFFF:
+            # wrap-around: really clear the stamp arrays once
+            n = self.rows * self.cols
+            self._seen   = array('I', bytes(4 * n))
+            self._closed = array('I', bytes(4 * n))
+            self._reverse = None
+            self._gen = 1
+        return self._gen
+
+    def neighbours(self, i: int) -> list[int]:
+        """In-bounds 4-neighbours of i, in up, down, left, right order."""
+        cols = self.cols
+        x, y = divmod(i, cols)
+        out = []
+        if x > 0:             out.append(i - cols)
+        if x < self.rows - 1: out.append(i + cols)
+        if y > 0:             out.append(i - 1)
+        if y < cols - 1:      out.append(i + 1)
+        return out
+
+    def is_walkable(self, i: int, avoid_robots: bool = True) -> bool:
+        b = self.cells[i]
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+        return bool(b & WALKWAY_BIT) and not b & blocked
+
+    def jump_tables(self) -> JumpTables:
+        """The JumpTables of the current static grid (rebuilt after map changes)."""
+        version = self._version_of() if self._version_of else None
+        if self._jump_tables is None or version != self._jump_version:
+            self._jump_tables = JumpTables(self.grid)
+            self._jump_version = version
+        return self._jump_tables
+
+    def _reconstruct(self, start: int, goal: int) -> list[int]:
+        parent = self._parent
+        path = [goal]
+        i = goal
+        while i != start:
+            i = parent[i]
+            path.append(i)
+        path.reverse()
+        return path
+
+    # ------------------------------------------------------------------ #
+    # searches
+    # ------------------------------------------------------------------ #
+    def astar(self, start: int, goal: int, avoid_robots: bool = True, h=None) -> list[int] | None:
+        """
+        A* with a Manhattan heuristic (or `h(i)` when given, which must be
+        admissible and consistent for the result to stay optimal).
+        """
+        gen = self._next_gen()
+        cells, g, parent, seen, closed = self.cells, self._g, self._parent, self._seen, self._closed
+        rows, cols = self.rows, self.cols
+        last_row = rows - 1
+        last_col = cols - 1
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+        gx, gy = divmod(goal, cols)
+        push, pop = heapq.heappush, heapq.heappop
+
+        if h is None:
+            sx, sy = divmod(start, cols)
+            h_start = abs(sx - gx) + abs(sy - gy)
+        else:
+            h_start = h(start)
+
+        counter = 0
+        open_heap = [(h_start, counter, start)]
+        g[start] = 0
+        seen[start] = gen
+        expanded = 0
+        peak = 1
+
+        while open_heap:
+            _, _, cur = pop(open_heap)
+            if closed[cur] == gen:
+                continue
+            if cur == goal:
+                self.expanded, self.peak_open = expanded, peak
+                return self._reconstruct(start, goal)
+            closed[cur] = gen
+            expanded += 1
+
+            x, y = divmod(cur, cols)
+            g_next = g[cur] + 1
+            for nb, ok in ((cur - cols, x > 0), (cur + cols, x < last_row),
+                           (cur - 1, y > 0), (cur + 1, y < last_col)):
+                if not ok or closed[nb] == gen:
+                    continue
+                b = cells[nb]
+                if b & blocked or not b & WALKWAY_BIT:
+                    continue
+                if seen[nb] != gen or g_next < g[nb]:
+                    seen[nb] = gen
+                    g[nb] = g_next
+                    parent[nb] = cur
+                    if h is None:
+                        nx, ny = divmod(nb, cols)
+                        f = g_next + abs(nx - gx) + abs(ny - gy)
+                    else:
+                        f = g_next + h(nb)
+                    counter += 1
+                    push(open_heap, (f, counter, nb))
+            if len(open_heap) > peak:
+                peak = len(open_heap)
+
+        self.expanded, self.peak_open = expanded, peak
+        return None
+
+    def jps(self, start: int, goal: int, avoid_robots: bool = True) -> list[int] | None:
+        """
+        Jump Point Search for a 4-connected, uniform-cost grid.
+
+        Straight runs are skipped without touching the open list: a
+        horizontal jump stops only at the goal or where a side cell opens
+        up that was walled off one step back; a vertical jump also stops
+        wherever a horizontal jump from it would find something. Only the
+        jump points are pushed, with g = Manhattan distance between them,
+        and the returned path is expanded back to every cell in between.
+        Path length is optimal, but ties may be broken differently from astar.
+
+        Jumps are read from precomputed JumpTables of the static grid;
+        a jump is only scanned cell by cell when a robot is close enough
+        to change its outcome.
+        """
+        gen = self._next_gen()
+        cells, g, parent, seen, closed = self.cells, self._g, self._parent, self._seen, self._closed
+        rows, cols = self.rows, self.cols
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+        gx, gy = divmod(goal, cols)
+        push, pop = heapq.heappush, heapq.heappop
+
+        tables = self.jump_tables()
+        east, west, south, north, run = tables.east, tables.west, tables.south, tables.north, tables.run
+        goal_run = run[goal]
+
+        robot_rows = []
+        if avoid_robots:
+            # the searching robot's own cell is left out: it is never re-entered
+            robot_rows = sorted(i // cols for i in np.flatnonzero(self.grid.reshape(-1) & ROBOT_BIT).tolist()
+                                if i != start)
+
+        def robot_near(lo, hi):
+            # is any robot on rows lo..hi (the rows a jump looks at)?
+            k = bisect_left(robot_rows, lo)
+            return k < len(robot_rows) and robot_rows[k] <= hi
+
+        def free(x, y):
+            if 0 <= x < rows and 0 <= y < cols:
+                b = cells[x * cols + y]
+                return bool(b & WALKWAY_BIT) and not b & blocked
+            return False
+
+        def scan_h(x, y, dy):
+            # walk along the row from (x, y) in direction dy
+            while True:
+                y += dy
+                if not free(x, y):
+                    return None
+                if x == gx and y == gy:
+                    return x, y
+                if (free(x - 1, y) and not free(x - 1, y - dy)) or \
+                   (free(x + 1, y) and not free(x + 1, y - dy)):
+                    return x, y
+
+        def scan_v(x, y, dx):
+            # walk along the column, stopping where a row turn could pay off
+            while True:
+                x += dx
+                if not free(x, y):
+                    return None
+                if x == gx and y == gy:
+                    return x, y
+                if (free(x, y - 1) and not free(x - dx, y - 1)) or \
+                   (free(x, y + 1) and not free(x - dx, y + 1)):
+                    return x, y
+                if scan_h(x, y, 1) or scan_h(x, y, -1):
+                    return x, y
+
+        def jump_h(x, y, dy):
+            if robot_rows and robot_near(x - 1, x + 1):
+                return scan_h(x, y, dy)
+            v = (east if dy > 0 else west)[x * cols + y]
+            reach = v if v > 0 else -v
+            if x == gx and 0 < (gy - y) * dy <= reach:
+                return x, gy
+            return (x, y + v * dy) if v > 0 else None
+
+        def jump_v(x, y, dx):
+            v = (south if dx > 0 else north)[x * cols + y]
+            reach = v if v > 0 else -v
+            if robot_rows and robot_near(min(x, x + reach * dx) - 1, max(x, x + reach * dx) + 1):
+                return scan_v(x, y, dx)
+            # the goal is "found" from any cell of the column that shares its row run
+            if 0 < (gx - x) * dx <= reach and goal_run >= 0 and run[gx * cols + y] == goal_run:
+                return gx, y
+            return (x + v * dx, y) if v > 0 else None
+
+        sx, sy = divmod(start, cols)
+        counter = 0
+        open_heap = [(abs(sx - gx) + abs(sy - gy), counter, start)]
+        g[start] = 0
+        parent[start] = start
+        seen[start] = gen
+        expanded = 0
+        peak = 1
+
+        while open_heap:
+            _, _, cur = pop(open_heap)
+            if closed[cur] == gen:
+                continue
+            if cur == goal:
+                self.expanded, self.peak_open = expanded, peak
+                return self._expand_jumps(start, goal)
+            closed[cur] = gen
+            expanded += 1
+
+            x, y = divmod(cur, cols)
+            px, py = divmod(parent[cur], cols)
+            if cur == start:
+                dirs = ((-1, 0), (1, 0), (0, -1), (0, 1))
+            elif px != x:
+                dx = 1 if x > px else -1
+                dirs = ((dx, 0), (0, -1), (0, 1))
+            else:
+                dy = 1 if y > py else -1
+                dirs = ((0, dy), (-1, 0), (1, 0))
+
+            for dx, dy in dirs:
+                jp = jump_v(x, y, dx) if dx else jump_h(x, y, dy)
+                if jp is None:
+                    continue
+                jx, jy = jp
+                nb = jx * cols + jy
+                if closed[nb] == gen:
+                    continue
+                g_next = g[cur] + abs(jx - x) + abs(jy - y)
+                if seen[nb] != gen or g_next < g[nb]:
+                    seen[nb] = gen
+                    g[nb] = g_next
+                    parent[nb] = cur
+                    counter += 1
+                    push(open_heap, (g_next + abs(jx - gx) + abs(jy - gy), counter, nb))
+            if len(open_heap) > peak:
+                peak = len(open_heap)
+
+        self.expanded, self.peak_open = expanded, peak
+        return None
+
+    def _reverse_arrays(self):
+        if self._reverse is None:
+            n = self.rows * self.cols
+            self._reverse = (array('i', bytes(4 * n)), array('i', bytes(4 * n)),
+                             array('I', bytes(4 * n)), array('I', bytes(4 * n)))
+        return self._reverse
+
+    def bidirectional(self, start: int, goal: int, avoid_robots: bool = True) -> list[int] | None:
+        """
+        Bidirectional A*: one search forward from start, one backward from
+        goal, always growing the smaller frontier.
+
+        Each half uses the full Manhattan distance to its own target, and
+        the search stops once either half's smallest f is no better than
+        the best start-goal connection found so far. A node that the other
+        half has already expanded is closed without being expanded again.
+        Walkability is the same as astar; the start cell itself may hold a robot.
+        """
+        if start == goal:
+            self.expanded, self.peak_open = 0, 0
+            return [start]
+
+        gen = self._next_gen()
+        cells = self.cells
+        g_f, parent_f, seen_f, closed_f = self._g, self._parent, self._seen, self._closed
+        g_r, parent_r, seen_r, closed_r = self._reverse_arrays()
+        rows, cols = self.rows, self.cols
+        last_row, last_col = rows - 1, cols - 1
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+        push, pop = heapq.heappush, heapq.heappop
+
+        b = cells[goal]
+        if b & blocked or not b & WALKWAY_BIT:
+            self.expanded, self.peak_open = 0, 0
+            return None
+
+        sx, sy = divmod(start, cols)
+        gx, gy = divmod(goal, cols)
+
+        counter = 0
+        open_f = [(abs(sx - gx) + abs(sy - gy), counter, start)]
+        open_r = [(abs(sx - gx) + abs(sy - gy), counter, goal)]
+        g_f[start] = 0; seen_f[start] = gen
+        g_r[goal] = 0;  seen_r[goal] = gen
+
+        best = None         # length of the best connection so far
+        meet = -1
+        expanded = 0
+        peak = 2
+
+        while open_f and open_r:
+            # drop stale tops so the stopping test uses live keys
+            while open_f and closed_f[open_f[0][2]] == gen:
+                pop(open_f)
+            while open_r and closed_r[open_r[0][2]] == gen:
+                pop(open_r)
+            if not open_f or not open_r:
+                break
+            if best is not None and max(open_f[0][0], open_r[0][0]) >= best:
+                break
+
+            forward = len(open_f) <= len(open_r)
+            if forward:
+                heap, g, parent, seen, closed = open_f, g_f, parent_f, seen_f, closed_f
+                g_other, seen_other, closed_other, sign = g_r, seen_r, closed_r, 1
+            else:
+                heap, g, parent, seen, closed = open_r, g_r, parent_r, seen_r, closed_r
+                g_other, seen_other, closed_other, sign = g_f, seen_f, closed_f, -1
+
+            _, _, cur = pop(heap)
+            closed[cur] = gen
+            if closed_other[cur] == gen:
+                continue
+            expanded += 1
+
+            x, y = divmod(cur, cols)
+            g_next = g[cur] + 1
+            for nb, ok in ((cur - cols, x > 0), (cur + cols, x < last_row),
+                           (cur - 1, y > 0), (cur + 1, y < last_col)):
+                if not ok or closed[nb] == gen:
+                    continue
+                b = cells[nb]
+                if (b & blocked or not b & WALKWAY_BIT) and not (sign < 0 and nb == start):
+                    continue
+                if seen[nb] != gen or g_next < g[nb]:
+                    seen[nb] = gen
+                    g[nb] = g_next
+                    parent[nb] = cur
+                    nx, ny = divmod(nb, cols)
+                    h = abs(nx - gx) + abs(ny - gy) if sign > 0 else abs(nx - sx) + abs(ny - sy)
+                    counter += 1
+                    push(heap, (g_next + h, counter, nb))
+                    if seen_other[nb] == gen:
+                        total = g_next + g_other[nb]
+                        if best is None or total < best:
+                            best, meet = total, nb
+            if len(open_f) + len(open_r) > peak:
+                peak = len(open_f) + len(open_r)
+
+        self.expanded, self.peak_open = expanded, peak
+        if best is None:
+            return None
+
+        path = self._reconstruct(start, meet)
+        i = meet
+        while i != goal:
+            i = parent_r[i]
+            path.append(i)
+        return path
+
+    def _expand_jumps(self, start: int, goal: int) -> list[int]:
+        """Fill in the straight runs between the jump points of a jps path."""
+        cols = self.cols
+        jumps = self._reconstruct(start, goal)
+        path = [start]
+        for a, b in zip(jumps, jumps[1:]):
+            step = cols if abs(b - a) >= cols else 1
+            if b < a:
+                step = -step
+            path.extend(range(a + step, b + step, step))
+        return path
+
+    def greedy(self, start: int, goal: int, avoid_robots: bool = False) -> list[int] | None:
+        """
+        Greedy best-first search on the Manhattan distance alone.
+        """
+        gen = self._next_gen()
+        cells, parent, seen, closed = self.cells, self._parent, self._seen, self._closed
+        cols = self.cols
+        last_row, last_col = self.rows - 1, cols - 1
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+        gx, gy = divmod(goal, cols)
+        sx, sy = divmod(start, cols)
+        push, pop = heapq.heappush, heapq.heappop
+
+        counter = 0
+        open_heap = [(abs(sx - gx) + abs(sy - gy), counter, start)]
+        expanded = 0
+        peak = 1
+
+        while open_heap:
+            _, _, cur = pop(open_heap)
+            if closed[cur] == gen:
+                continue
+            if cur == goal:
+                self.expanded, self.peak_open = expanded, peak
+                return self._reconstruct(start, goal)
+            closed[cur] = gen
+            expanded += 1
+
+            x, y = divmod(cur, cols)
+            for nb, ok in ((cur - cols, x > 0), (cur + cols, x < last_row),
+                           (cur - 1, y > 0), (cur + 1, y < last_col)):
+                if not ok or closed[nb] == gen:
+                    continue
+                b = cells[nb]
+                if b & blocked or not b & WALKWAY_BIT:
+                    continue
+                if seen[nb] != gen:
+                    seen[nb] = gen
+                    parent[nb] = cur
+                    nx, ny = divmod(nb, cols)
+                    counter += 1
+                    push(open_heap, (abs(nx - gx) + abs(ny - gy), counter, nb))
+            if len(open_heap) > peak:
+                peak = len(open_heap)
+
+        self.expanded, self.peak_open = expanded, peak
+        return None
+
+    def dfs(self, start: int, goal: int, avoid_robots: bool = False) -> list[int] | None:
+        """
+        Depth-first search (last neighbour pushed is explored first).
+        """
+        gen = self._next_gen()
+        cells, parent, seen, closed = self.cells, self._parent, self._seen, self._closed
+        cols = self.cols
+        last_row, last_col = self.rows - 1, cols - 1
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+
+        stack = [start]
+        expanded = 0
+        peak = 1
+
+        while stack:
+            cur = stack.pop()
+            if closed[cur] == gen:
+                continue
+            closed[cur] = gen
+            if cur == goal:
+                self.expanded, self.peak_open = expanded, peak
+                return self._reconstruct(start, goal)
+            expanded += 1
+
+            x, y = divmod(cur, cols)
+            for nb, ok in ((cur - cols, x > 0), (cur + cols, x < last_row),
+                           (cur - 1, y > 0), (cur + 1, y < last_col)):
+                if not ok or closed[nb] == gen:
+                    continue
+                b = cells[nb]
+                if b & blocked or not b & WALKWAY_BIT:
+                    continue
+                if seen[nb] != gen:
+                    seen[nb] = gen
+                    parent[nb] = cur
+                    stack.append(nb)
+            if len(stack) > peak:
+                peak = len(stack)
+
+        self.expanded, self.peak_open = expanded, peak
+        return None
+
+    # ------------------------------------------------------------------ #
+    # post-processing
+    # ------------------------------------------------------------------ #
+    def shorten(self, path: list[int], window: int = 128, rounds: int = 4,
+                avoid_robots: bool = False) -> list[int]:
+        """
+        A walk between the same ends as `path` that is never longer, for the
+        roundabout routes greedy and dfs find. Loops are dropped and the walk
+        cuts straight along any row or column of walkway that the path
+        comes back to further on; then every stretch of `window` cells is
+        replaced by the shortest walk between its ends when that is
+        shorter, in two passes offset by half a window so detours
+        straddling a stretch boundary are caught too. Each round exposes
+        new shortcuts to the next; stops after `rounds` or once a round
+        gains nothing.
+        """
+        for _ in range(rounds):
+            before = len(path)
+            path = self._shorten_once(path, window, avoid_robots)
+            if len(path) == before:
+                break
+        return path
+
+    def _shorten_once(self, path: list[int], window: int, avoid_robots: bool) -> list[int]:
+        path = self._shortcut(path, avoid_robots)
+        for offset in (0, window // 2):
+            if offset >= len(path) - 1:
+                break
+            out = path[:offset + 1]
+            i = offset
+            while i < len(path) - 1:
+                j = min(i + window, len(path) - 1)
+                better = self._bounded_astar(path[i], path[j], j - i - 1, avoid_robots) if j - i > 1 else None
+                out.extend(better[1:] if better is not None else path[i + 1:j + 1])
+                i = j
+            path = out
+        return path
+
+    def _shortcut(self, path: list[int], avoid_robots: bool) -> list[int]:
+        """
+        Walk the path and, from every cell, jump to the last point where the
+        path passes through the same straight run of free cells (row or
+        column, from the jump tables) if walking the run is shorter than
+        following the path there. A loop back to the current cell is the
+        run of length zero.
+        """
+        tables = self.jump_tables()
+        row_run, col_run = tables.run, tables.col_run
+        cells, cols = self.cells, self.cols
+        last = {cell: k for k, cell in enumerate(path)}
+        last_in_row, last_in_col = {}, {}
+        for k, cell in enumerate(path):
+            last_in_row[row_run[cell]] = k
+            last_in_col[col_run[cell]] = k
+
+        out = [path[0]]
+        k, end = 0, len(path) - 1
+        while k < end:
+            cur = path[k]
+            again = last[cur]
+            if again > k:
+                k = again   # a loop back to this very cell
+                continue
+            best, best_step, best_len = k + 1, 0, 1
+            for j, step in ((last_in_row.get(row_run[cur], -1), 1), (last_in_col.get(col_run[cur], -1), cols)):
+                if j <= k:
+                    continue
+                d = path[j] - cur
+                if d < 0:
+                    d, step = -d, -step
+                d //= abs(step)
+                # the run that gets furthest along the path per step taken
+                if j - d > best - best_len and not (
+                        avoid_robots and any(cells[i] & ROBOT_BIT for i in range(cur + step, path[j], step))):
+                    best, best_step, best_len = j, step, d
+            if best_step:
+                out.extend(range(cur + best_step, cur + best_step * (best_len + 1), best_step))
+            else:
+                out.append(path[best])
+            k = best
+        return out
+
+    def _bounded_astar(self, start: int, goal: int, max_len: int, avoid_robots: bool) -> list[int] | None:
+        """
+        Shortest path of at most max_len steps, or None. Anything whose
+        Manhattan bound already exceeds max_len is never queued, so the
+        search stays local to the stretch being improved.
+        """
+        gen = self._next_gen()
+        cells, g, parent, seen, closed = self.cells, self._g, self._parent, self._seen, self._closed
+        cols = self.cols
+        last_row, last_col = self.rows - 1, cols - 1
+        blocked = OBSTACLE_BIT | (ROBOT_BIT if avoid_robots else 0)
+        gx, gy = divmod(goal, cols)
+        sx, sy = divmod(start, cols)
+        if abs(sx - gx) + abs(sy - gy) > max_len:
+            return None
+        push, pop = heapq.heappush, heapq.heappop
+
+        open_heap = [(abs(sx - gx) + abs(sy - gy), 0, start)]
+        g[start] = 0
+        seen[start] = gen
+        while open_heap:
+            _, _, cur = pop(open_heap)
+            if closed[cur] == gen:
+                continue
+            if cur == goal:
+                return self._reconstruct(start, goal)
+            closed[cur] = gen
+
+            x, y = divmod(cur, cols)
+            g_next = g[cur] + 1
+            for nb, ok in ((cur - cols, x > 0), (cur + cols, x < last_row),
+                           (cur - 1, y > 0), (cur + 1, y < last_col)):
+                if not ok or closed[nb] == gen:
+                    continue
+                b = cells[nb]
+                if b & blocked or not b & WALKWAY_BIT:
+                    continue
+                nx, ny = divmod(nb, cols)
+                f = g_next + abs(nx - gx) + abs(ny - gy)
+                if f > max_len:
+                    continue
+                if seen[nb] != gen or g_next < g[nb]:
+                    seen[nb] = gen
+                    g[nb] = g_next
+                    parent[nb] = cur
+                    push(open_heap, (f, -g_next, nb))
+        return None
+
+
+_kernels: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def kernel_for(campus_map) -> PathKernel:
+    """
+    The PathKernel shared by every robot on `campus_map` (created on first use).
+    """
+    kernel = _kernels.get(campus_map)
+    if kernel is None:
+        map_ref = weakref.ref(campus_map)
+        kernel = PathKernel(campus_map.grid, version_of=lambda: map_ref().version)
+        _kernels[campus_map] = kernel
+    return kernel
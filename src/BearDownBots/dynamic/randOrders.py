@@ -53,6 +53,7 @@ class Order:
         self.building = building
         self.status = OrderStatus.PLACED
         self.prep_remaining: float = 0.0
+        self.placed_at: float = 0.0   # sim time the scheduler placed it
 
     def _choose_main(self) -> str:
         """Randomly choose one main dish."""
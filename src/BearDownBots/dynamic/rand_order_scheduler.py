@@ -1,5 +1,9 @@
 # BearDownBots/actors/random_order_scheduler.py
+import heapq
 import random
+from collections import deque
+from itertools import islice
+from operator import itemgetter
 from BearDownBots.dynamic.randOrders import Order, OrderStatus
 from typing import Sequence
 
@@ -7,46 +11,107 @@ from BearDownBots.static.buildings import Building
 from BearDownBots.config import Config
 from BearDownBots.dynamic.robot import Robot
 from BearDownBots.clock import SimulationClock
+from BearDownBots.dynamic.distance_field import DistanceFields
 
 class OrderPlacer:
     """
     Generates one random Order every `interval_sim_sec` of **simulation time**.
     Call   scheduler.update(dt)   once per frame with dt = simulation-seconds elapsed.
+
+    Pending orders are kept in one queue per status and only move between
+    them when their status changes, so a tick costs as much as the orders
+    that changed, not the whole backlog:
+
+        placed      oldest first, waiting for a free kitchen slot
+        preparing   min-heap of (ready time, seq, ticket), at most MAX_PREP
+        ready       longest-ready first, waiting for a robot
+
+    Every status change is also appended to a log (transition_mark /
+    transitions_since) that views such as the restaurant dashboard follow
+    instead of rescanning the queues.
     """
+    TRANSITION_LOG_LIMIT = 1 << 14  # status changes kept for transitions_since()
+
     def __init__(self,
                  buildings,
                  timer : SimulationClock,          
+                 distance_fields : DistanceFields | None = None,
                  ):
         self.buildings : list[Building] = buildings
         self.timer : SimulationClock = timer
-        self.orders : list[tuple[Building, Order]] = []  # List to store placed orders
+        self.distance_fields = distance_fields  # exact walkway distances when available
+        self.placed    : deque[tuple[Building, Order]] = deque()
+        self.preparing : list[tuple[float, int, tuple[Building, Order]]] = []
+        self._cooked = 0            # tie-break for preparing, in the order cooking started
+        self.ready     : deque[tuple[Building, Order]] = deque()
+        self._transitions : list[tuple[Building, Order]] = []
+        self._transitions_base = 0
         self.MAX_PREP = 10
         self.PREP_SECONDS = 15
-        self._time_acc    = 0.0     # accumulated sim time since last order
-        self._last_sim_time = timer.sim_time
-        self._last_kitch_t = timer.sim_time
+        # sim time the next order is due; kept absolute so next_event_time()
+        # and place_new_order() agree exactly on when that is
+        self._next_order_at = timer.sim_time + Config.Simulation.NEW_ORDER_INTERVAL
+
+    # ------------------------------------------------------------------ #
+    # queues
+    # ------------------------------------------------------------------ #
+    @property
+    def orders(self) -> list[tuple[Building, Order]]:
+        """
+        Every order not yet out for delivery. Builds a new list, so per-tick
+        code should use the status queues (or pending()) instead.
+        """
+        cooking = [ticket for _, _, ticket in sorted(self.preparing, key=itemgetter(1))]
+        return [*self.placed, *cooking, *reversed(self.ready)]
+
+    def pending(self) -> int:
+        """Number of orders not yet out for delivery."""
+        return len(self.placed) + len(self.preparing) + len(self.ready)
+
+    def _set_status(self, ticket: tuple[Building, Order], status: OrderStatus):
+        ticket[1].status = status
+        self._transitions.append(ticket)
+        if len(self._transitions) > self.TRANSITION_LOG_LIMIT:
+            drop = len(self._transitions) // 2
+            del self._transitions[:drop]
+            self._transitions_base += drop
+
+    def transition_mark(self) -> int:
+        """Position in the status-change log, for a later transitions_since()."""
+        return self._transitions_base + len(self._transitions)
+
+    def transitions_since(self, mark: int) -> list[tuple[Building, Order]] | None:
+        """
+        (building, order) of every status change since `mark`, oldest first
+        (an order may appear more than once; its .status is the current one),
+        or None if the log no longer reaches back that far.
+        """
+        if mark < self._transitions_base:
+            return None
+        return self._transitions[mark - self._transitions_base:]
+
+    def next_event_time(self) -> float:
+        """
+        Sim time of the next thing the scheduler does on its own: place an
+        order or finish cooking one.
+        """
+        t = self._next_order_at
+        if self.preparing:
+            t = min(t, self.preparing[0][0])
+        return t
 
     def place_new_order(self) -> Order | None:
         """
-        Must be called every frame. Internally calls timer.tick() to advance
-        sim-time. Once accumulated sim-time ≥ NEW_ORDER_INTERVAL, places one
-        order and resets the accumulator (minus the interval).
+        Must be called every frame. Once sim-time has reached the time the
+        next order is due, places one order and moves that time on by
+        NEW_ORDER_INTERVAL (so a long frame leaves the rest due at once).
         """
-        # advance sim clock and accumulate
-        # 1) compute how much sim-time has passed since our last invocation
         current_sim = self.timer.sim_time
-        dt = current_sim - self._last_sim_time
-        self._last_sim_time = current_sim
-
-        # 2) accumulate
-        self._time_acc += dt
-
-        interval = Config.Simulation.NEW_ORDER_INTERVAL
-        if self._time_acc < interval:
+        if current_sim < self._next_order_at:
             return None
 
-        # time to place one order—subtract the interval
-        self._time_acc -= interval
+        # time to place one order—the next is due an interval later
+        self._next_order_at += Config.Simulation.NEW_ORDER_INTERVAL
 
         candidates = [b for b in self.buildings if b.name != "Food Warehouse"]
 
@@ -56,12 +121,14 @@ class OrderPlacer:
         building = random.choice(candidates)
 
         order = building.place_order()
-        order.status = OrderStatus.PLACED
         order.prep_remaining = self.PREP_SECONDS
+        order.placed_at = current_sim
 
         # store and return
-        self.orders.append((building, order))
-        return [(building, order)]
+        ticket = (building, order)
+        self._set_status(ticket, OrderStatus.PLACED)
+        self.placed.append(ticket)
+        return [ticket]
     
     def load_order_into_robots(self, robots: list[Robot]):
         """
@@ -69,15 +136,13 @@ class OrderPlacer:
         - "oldest": oldest available orders
         - "proximity": oldest + 2 closest to that destination (among top 10)
         - "between": 2 oldest + 1 between them
-        """
-        unassigned: list[tuple[Building, Order]] = []
 
+        Only the ten longest-ready orders are ever looked at.
+        """
         # Advance kitchen status
         self._advance_kitchen()
 
-        # Separate orders by status
-        ready_orders = [(b, o) for (b, o) in self.orders if o.status == OrderStatus.READY]
-        unassigned = [(b, o) for (b, o) in self.orders if o.status != OrderStatus.READY]
+        ready = self.ready
 
         # Find eligible robots
         waiting = [
@@ -85,40 +150,37 @@ class OrderPlacer:
             if r.position == r.restaurant_pickup_point and len(r.orders) < r.MAX_CARRY
         ]
 
-        if not waiting or not ready_orders:
-            self.orders = unassigned + ready_orders
+        if not waiting or not ready:
             return
 
         strategy = Config.Simulation.ORDER_ASSIGNMENT_STRATEGY.lower()
 
         for robot in waiting:
-            if not ready_orders:
+            if not ready:
                 break
 
             selected_orders = []
 
             if strategy == "oldest":
-                selected_orders = ready_orders[-robot.MAX_CARRY:]
+                selected_orders = list(islice(ready, robot.MAX_CARRY))[::-1]
 
             elif strategy == "proximity":
-                primary = ready_orders[-1]
-                rest = ready_orders[-10:-1]  # 9 before it
+                primary = ready[0]
+                rest = list(islice(ready, 1, 10))[::-1]  # the 9 after it
 
                 def dist(t):
-                    x1, y1 = primary[0].dropoff_point
-                    x2, y2 = t[0].dropoff_point
-                    return abs(x1 - x2) + abs(y1 - y2)
+                    return self.travel_distance(primary[0].dropoff_point, t[0].dropoff_point)
 
                 close = sorted(rest, key=dist)[:robot.MAX_CARRY - 1]
                 selected_orders = [primary] + close
 
             elif strategy == "between":
-                if len(ready_orders) < 2:
-                    selected_orders = ready_orders[:robot.MAX_CARRY]
+                if len(ready) < 2:
+                    selected_orders = [ready[0]]
                 else:
-                    first = ready_orders[-1]
-                    second = ready_orders[-2]
-                    rest = ready_orders[-10:-2]
+                    first = ready[0]
+                    second = ready[1]
+                    rest = list(islice(ready, 2, 10))[::-1]
 
                     def between(t):
                         x = t[0].dropoff_point[0]
@@ -133,34 +195,53 @@ class OrderPlacer:
                         selected_orders.append(mid)
 
             # Assign selected orders to this robot
-            for building, order in selected_orders:
+            for ticket in selected_orders:
+                building, order = ticket
                 if robot.add_order(order):
-                    order.status = OrderStatus.OUT_FOR_DELIVERY
+                    self._set_status(ticket, OrderStatus.OUT_FOR_DELIVERY)
                     print(f"[Scheduler] Loaded {order} into {robot}")
-                    ready_orders.remove((building, order))
+                    # picked from the front, so found within a few probes
+                    ready.remove(ticket)
 
-        self.orders = unassigned + ready_orders
+    def travel_distance(self, a, b) -> float:
+        """
+        Walking distance between two dropoff/pickup points: an O(1) field
+        lookup when distance fields are available, Manhattan otherwise.
+        Unreachable pairs are infinitely far apart.
+        """
+        if self.distance_fields is None:
+            return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        d = self.distance_fields.distance(a, b)
+        return float("inf") if d is None else d
 
     def _advance_kitchen(self):
         """
-        • keep at most MAX_PREP tickets in PREPARING
-        • decrement their timers
-        • when prep_remaining ≤ 0 → status = READY
+        • keep at most MAX_PREP tickets in PREPARING, each pushed on the
+          heap with the sim time it will be ready
+        • pop the ones whose time has come → status = READY, and start the
+          next placed order in the freed slot from that moment
+
+        Nothing is touched per tick for orders still cooking, and a slot
+        that frees up halfway through a long tick is not left idle for the
+        rest of it: a ticket costs one push and one pop however the time
+        is stepped.
         """
-        preparing   = [t for t in self.orders if t[1].status == OrderStatus.PREPARING]
-        placed      = [t for t in self.orders if t[1].status == OrderStatus.PLACED]
-
-        # pull from PLACED → PREPARING until capacity full
-        while len(preparing) < self.MAX_PREP and placed:
-            building, order = placed.pop(0)
-            order.status = OrderStatus.PREPARING
-            preparing.append((building, order))
-
-        # cook!
         now = self.timer.sim_time
-        dt = now - self._last_kitch_t
-        self._last_kitch_t = now
-        for _, order in preparing:
-            order.prep_remaining -= dt
-            if order.prep_remaining <= 0:
-                order.status = OrderStatus.READY
\ No newline at end of file
+        preparing = self.preparing
+
+        self._start_cooking(now)
+        while preparing and preparing[0][0] <= now:
+            ready_at, _, ticket = heapq.heappop(preparing)
+            self._set_status(ticket, OrderStatus.READY)
+            self.ready.append(ticket)
+            self._start_cooking(ready_at)
+
+    def _start_cooking(self, free_at: float):
+        """Pull from PLACED → PREPARING while there is room, starting no earlier than `free_at`."""
+        while len(self.preparing) < self.MAX_PREP and self.placed:
+            ticket = self.placed.popleft()
+            order = ticket[1]
+            self._set_status(ticket, OrderStatus.PREPARING)
+            start = max(free_at, order.placed_at)
+            heapq.heappush(self.preparing, (start + order.prep_remaining, self._cooked, ticket))
+            self._cooked += 1
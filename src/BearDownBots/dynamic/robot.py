@@ -1,11 +1,21 @@
+import time
 import random
-import heapq
-import itertools
 from itertools import cycle
 
 from BearDownBots.static.map import Map
 from BearDownBots.static.cell import CELL_TYPES, Position, Cell
 from BearDownBots.dynamic.randOrders import Order
+from BearDownBots.dynamic.pathfinding import kernel_for, SHORTENED_SEARCHES
+from BearDownBots.dynamic.path_cache import cache_for
+from BearDownBots.dynamic.distance_field import fields_for
+from BearDownBots.dynamic.landmarks import landmarks_for
+from BearDownBots.dynamic.hpa import planner_for
+from BearDownBots.dynamic.corridors import corridors_for
+from BearDownBots.dynamic.dstar_lite import DStarLite
+from BearDownBots.dynamic.cooperative import cooperative_for
+from BearDownBots.dynamic.batch_planner import batch_for
+from BearDownBots.dynamic.compact_path import CompactPath
+from BearDownBots.dynamic.path_stats import stats_for
 from BearDownBots.config import Config
 
 class Direction:
@@ -14,6 +24,19 @@ class Direction:
     LEFT = "left"
     RIGHT = "right"
 
+def direction_between(a: Position, b: Position) -> str | None:
+    """Direction of the single step a -> b, or None if they are not adjacent."""
+    dx = b.x - a.x
+    dy = b.y - a.y
+    if   dx == -1: return Direction.UP
+    elif dx ==  1: return Direction.DOWN
+    elif dy == -1: return Direction.LEFT
+    elif dy ==  1: return Direction.RIGHT
+    return None
+
+# searches that treat other robots as walls (greedy and dfs walk through them)
+ROBOT_AVOIDING_SEARCHES = ("astar", "alt", "jps", "bidirectional")
+
 ROBOT_COLOURS = cycle([
     "#e6194b",  # red
     "#3cb44b",  # green
@@ -22,6 +45,7 @@ ROBOT_COLOURS = cycle([
 
 class Robot:
     MAX_CARRY = 3
+    MAX_REPLAN_FAILURES = 25   # failed replans in a row before the order is given up
     def __init__(self, robot_id: int, map: Map):
         self.id = robot_id
         self.map: Map = map
@@ -33,9 +57,17 @@ class Robot:
         self.next_direction_to_move = None  # Direction to move next
         self.colour = next(ROBOT_COLOURS)
 
-        self.returned_path = []  # List of cells to traverse
+        self.returned_path = CompactPath()  # cells still to walk, run-length encoded
+        self._pending_route = None  # lazily expanded rest of a hierarchical or corridor route
+        self._replanner: DStarLite | None = None  # incremental search towards the current goal
+        self._stepped_at = None  # reservation-table tick of the last step, for "whca"
+        self._awaiting_path = False  # a query is out with the batch planner
+        self._batched_path = None    # its answer, picked up by the next act()
+        self._last_search = None     # (expanded, peak open, path steps, steps before shortening, cached)
+        self._progress = 0.0         # fraction of a cell walked towards the next one
 
         self.orders : list[Order] = []  # List of orders assigned to the robot
+        self.delivered : list[Order] = []  # orders handed over, oldest first
 
         self.state = "idle"   # one of: "delivering", "returning", "idle"
         self._replan_failures = 0
@@ -43,37 +75,58 @@ class Robot:
         self.place_self_on_restaurant()
 
     def place_self_on_restaurant(self):
-        for cell in self.map.one_dimensional_grid:
-            if cell.has_type(CELL_TYPES.RESTUARANT_PICKUP):
-                # copy the cell’s coords instead of sharing the same object
-                px, py = cell.position.x, cell.position.y
-                self.position = Position(px, py)
-                self.previous_position = Position(px, py)
-                self.restaurant_pickup_point = Position(px, py)
-                cell.add_type(CELL_TYPES.ROBOT)
-                # print(f"Placed robot {self.id} at {self.position}")
-                return
+        for px, py in self.map.cells_with_type(CELL_TYPES.RESTUARANT_PICKUP):
+            self.position = Position(px, py)
+            self.previous_position = Position(px, py)
+            self.restaurant_pickup_point = Position(px, py)
+            self.map.add_cell_type(px, py, CELL_TYPES.ROBOT)
+            # print(f"Placed robot {self.id} at {self.position}")
+            return
             
     def find_path(self, start, goal) -> list[Cell]:
         strategy = Config.Simulation.PATHFINDING_ALGORITHM
-        print(f"Robot {self.id} using {strategy} pathfinding.")
+        self._pending_route = None
+        self._last_search = None
+        t0 = time.perf_counter()
         if strategy == "astar":
-            return self.a_star(start, goal)
+            path = self.a_star(start, goal)
+        elif strategy == "alt":
+            path = self.alt(start, goal)
         elif strategy == "dfs":
-            return self.dfs(start, goal)
+            path = self.dfs(start, goal)
         elif strategy == "greedy":
-            return self.greedy(start, goal)
+            path = self.greedy(start, goal)
+        elif strategy == "jps":
+            path = self.jps(start, goal)
+        elif strategy == "bidirectional":
+            path = self.bidirectional(start, goal)
+        elif strategy == "hpa":
+            path = self.hpa(start, goal)
+        elif strategy == "corridor":
+            path = self.corridor(start, goal)
+        elif strategy == "whca":
+            path = self.whca(start, goal)
         else:
             raise ValueError(f"Unknown pathfinding strategy: {strategy}")
+        # queued with the batch planner: recorded when the answer arrives
+        if not self._awaiting_path:
+            self._record_search(strategy, path, time.perf_counter() - t0)
+        return path
+
+    def _record_search(self, algorithm: str, path: list[Cell], seconds: float):
+        """Add the search that just ran (see _last_search) to the map's PathStats."""
+        if self._last_search is None:
+            return   # never searched: no start or goal, or already there
+        expanded, peak_open, length, raw_length, cached = self._last_search
+        stats_for(self.map).record(algorithm, self.id, seconds, expanded, peak_open,
+                                   length, raw_length, failed=not path, cached=cached)
             
     def a_star(self, raw_start, raw_goal) -> list[Cell]:
         """
         Find a path along WALKWAY cells from restaurant_pickup_point to dropoff_point.
         Sets self.next_direction_to_move to the first step’s direction.
+        Never walks into obstacles or onto other robots.
         """
-        # raw_start = self.restaurant_pickup_point
-        # raw_goal  = self.dropoff_point
-
         if raw_start is None:
             print(f"Robot {self.id} has no start position.")
             return []
@@ -82,175 +135,157 @@ class Robot:
             print(f"Robot {self.id} has no goal position.")
             return []
 
-        # Ensure we have Position instances
-        start = Position(*raw_start) if isinstance(raw_start, tuple) else raw_start
-        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple)  else raw_goal
-
-        if start == goal:
-            self.next_direction_to_move = None
+        return self._kernel_search("astar", raw_start, raw_goal)
+    
+    def alt(self, raw_start, raw_goal) -> list[Cell]:
+        """
+        A* guided by the ALT landmark heuristic instead of Manhattan:
+        identical rules and optimal path length, far fewer expansions.
+        """
+        if raw_start is None or raw_goal is None:
+            print(f"Robot {self.id} missing start or goal.")
             return []
 
-        def h(p: Position, q: Position) -> int:
-            return abs(p.x - q.x) + abs(p.y - q.y)
+        return self._kernel_search("alt", raw_start, raw_goal)
+
+    def jps(self, raw_start, raw_goal) -> list[Cell]:
+        """
+        Jump Point Search: same optimal-length, robot-avoiding paths as
+        a_star, but straight walkway runs are skipped instead of expanded.
+        """
+        if raw_start is None or raw_goal is None:
+            print(f"Robot {self.id} missing start or goal.")
+            return []
 
-        # A counter for tie-breaking
-        counter = itertools.count()
+        return self._kernel_search("jps", raw_start, raw_goal)
 
-        open_heap = []
-        # push (f_score, tie_breaker, Position)
-        heapq.heappush(open_heap, (h(start, goal), next(counter), start))
+    def bidirectional(self, raw_start, raw_goal) -> list[Cell]:
+        """
+        Bidirectional A*: searches from both ends at once, which keeps the
+        frontier small on long cross-campus routes. Same walkability rules
+        and optimal path length as a_star.
+        """
+        if raw_start is None or raw_goal is None:
+            print(f"Robot {self.id} missing start or goal.")
+            return []
 
-        came_from: dict[Position, Position] = {}
-        g_score: dict[Position, int] = {start: 0}
-        closed: set[Position] = set()
+        return self._kernel_search("bidirectional", raw_start, raw_goal)
 
-        while open_heap:
-            _, _, current = heapq.heappop(open_heap)
+    def hpa(self, raw_start, raw_goal) -> list[Cell]:
+        """
+        Hierarchical search over map clusters. Only the first abstract edge
+        is turned into cells here; the rest is refined as the robot reaches
+        it (see _load_next_segment). Near-optimal rather than optimal.
+        """
+        if raw_start is None or raw_goal is None:
+            print(f"Robot {self.id} missing start or goal.")
+            return []
 
-            if current in closed:
-                continue
+        start = Position(*raw_start) if isinstance(raw_start, tuple) else raw_start
+        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple)  else raw_goal
+        if start == goal:
+            self.next_direction_to_move = None
+            return []
 
-            if current == goal:
-                # reconstruct path
-                path_pos = []
-                p = current
-                while p != start:
-                    path_pos.append(p)
-                    p = came_from[p]
-                path_pos.append(start)
-                path_pos.reverse()
-
-                path_cells = [self.map.get_cell(p.x, p.y) for p in path_pos]
-
-                # set next_direction_to_move
-                dx = path_pos[1].x - start.x
-                dy = path_pos[1].y - start.y
-                if dx == -1:
-                    self.next_direction_to_move = Direction.UP
-                elif dx == 1:
-                    self.next_direction_to_move = Direction.DOWN
-                elif dy == -1:
-                    self.next_direction_to_move = Direction.LEFT
-                elif dy == 1:
-                    self.next_direction_to_move = Direction.RIGHT
-                else:
-                    self.next_direction_to_move = None
-
-                #self.a_star_path = path_pos[1:]   # drop the start—these are the next steps
-
-                # print(f"Robot {self.id} found a path from {start} to {goal} with {len(path_cells)} cells.")
-                # print(f"Robot {self.id} moving from {start} to {goal} in direction {self.next_direction_to_move}")
-                return path_cells
-
-            closed.add(current)
-
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-                nbr = Position(current.x + dx, current.y + dy)
-
-                if not (0 <= nbr.x < self.map.rows and 0 <= nbr.y < self.map.cols):
-                    continue
-                if nbr in closed:
-                    continue
-
-                cell = self.map.get_cell(nbr.x, nbr.y)
-
-                # 1) never walk into obstacles
-                if cell.has_type(CELL_TYPES.OBSTACLE):
-                    continue
-                # 2) only walk on sidewalks
-                if not cell.has_type(CELL_TYPES.WALKWAY):
-                    continue
-                # 3) never walk on other robots
-                if cell.has_type(CELL_TYPES.ROBOT):
-                    # print(f"Robot {self.id} cannot walk on other robots.")
-                    continue
-
-                tentative_g = g_score[current] + 1
-                if tentative_g < g_score.get(nbr, float('inf')):
-                    came_from[nbr]    = current
-                    g_score[nbr]      = tentative_g
-                    f_score           = tentative_g + h(nbr, goal)
-                    heapq.heappush(open_heap, (f_score, next(counter), nbr))
-
-        print(f"Robot {self.id} failed to find a path from {start} to {goal}.")
-        # no path found
-        self.next_direction_to_move = None
-        return []
-    
-    def greedy(self, raw_start, raw_goal) -> list[Cell]:
+        cols = self.map.cols
+        planner = planner_for(self.map)
+        route = planner.find(start.x * cols + start.y, goal.x * cols + goal.y)
+        segments = planner.refine(route, kernel_for(self.map)) if route is not None else None
+        # the cell count is only known once every edge has been refined
+        self._last_search = (planner.expanded, planner.peak_open, None, None, False)
+        return self._follow_segments(segments, start, goal)
 
+    def corridor(self, raw_start, raw_goal) -> list[Cell]:
+        """
+        A* over the corridor-contracted walkway graph: one expansion per
+        intersection rather than per cell. Optimal length, but like greedy
+        and dfs it does not steer around other robots. Corridor cells are
+        handed to returned_path one hop at a time (see _load_next_segment).
+        """
         if raw_start is None or raw_goal is None:
             print(f"Robot {self.id} missing start or goal.")
             return []
 
         start = Position(*raw_start) if isinstance(raw_start, tuple) else raw_start
-        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple) else raw_goal
+        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple)  else raw_goal
+        if start == goal:
+            self.next_direction_to_move = None
+            return []
 
+        cols = self.map.cols
+        graph = corridors_for(self.map)
+        route = graph.find(start.x * cols + start.y, goal.x * cols + goal.y)
+        segments = graph.expand(route) if route is not None else None
+        self._last_search = (graph.expanded, graph.peak_open, None, None, False)
+        return self._follow_segments(segments, start, goal)
+
+    def whca(self, raw_start, raw_goal) -> list[Cell]:
+        """
+        The next window of a cooperative route, reserved in the shared
+        space-time table so other robots plan around it. A repeated cell
+        is a tick spent waiting; act() plans the next window once half of
+        this one has been walked.
+        """
+        if raw_start is None or raw_goal is None:
+            print(f"Robot {self.id} missing start or goal.")
+            return []
+
+        start = Position(*raw_start) if isinstance(raw_start, tuple) else raw_start
+        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple)  else raw_goal
         if start == goal:
             self.next_direction_to_move = None
             return []
 
-        def h(p: Position, q: Position) -> int:
-            return abs(p.x - q.x) + abs(p.y - q.y)
+        cols = self.map.cols
+        planner = cooperative_for(self.map)
+        # a robot that already stepped this tick only leaves on the next one
+        depart = planner.table.now + (self._stepped_at == planner.table.now)
+        path_idx = planner.plan(self.id, start.x * cols + start.y, goal.x * cols + goal.y, depart)
+        self._last_search = (planner.expanded, planner.peak_open,
+                             len(path_idx) - 1 if path_idx else None, None, False)
+        if path_idx is None:
+            print(f"Robot {self.id} failed to find a path from {start} to {goal}.")
+            self.next_direction_to_move = None
+            return []
 
-        counter = itertools.count()
-        open_heap = [(h(start, goal), next(counter), start)]
-        came_from: dict[Position, Position] = {}
-        visited: set[Position] = set()
+        path_cells = [self.map.get_cell(*divmod(i, cols)) for i in path_idx]
+        self.next_direction_to_move = direction_between(path_cells[0].position, path_cells[1].position)
+        return path_cells
 
-        while open_heap:
-            _, _, current = heapq.heappop(open_heap)
+    def _follow_segments(self, segments, start: Position, goal: Position) -> list[Cell]:
+        """
+        Take the first segment of a lazily expanded route as the path and
+        keep the rest pending for _load_next_segment.
+        """
+        first = next(segments, None) if segments is not None else None
+        if first is None:
+            print(f"Robot {self.id} failed to find a path from {start} to {goal}.")
+            self.next_direction_to_move = None
+            return []
 
-            if current in visited:
-                continue
+        cols = self.map.cols
+        self._pending_route = segments
+        path_cells = [self.map.get_cell(*divmod(i, cols)) for i in first]
+        self.next_direction_to_move = direction_between(path_cells[0].position, path_cells[1].position)
+        return path_cells
+
+    def _load_next_segment(self):
+        """Expand the next segment of a hierarchical or corridor route into returned_path."""
+        segment = next(self._pending_route, None)
+        if segment is None:
+            # route finished, or the next edge is blocked: plan afresh if needed
+            self._pending_route = None
+            return
+        cols = self.map.cols
+        self.returned_path = CompactPath.from_indices(segment, cols)
+
+    def greedy(self, raw_start, raw_goal) -> list[Cell]:
+
+        if raw_start is None or raw_goal is None:
+            print(f"Robot {self.id} missing start or goal.")
+            return []
 
-            if current == goal:
-                # Reconstruct path
-                path_pos = []
-                p = current
-                while p != start:
-                    path_pos.append(p)
-                    p = came_from[p]
-                path_pos.append(start)
-                path_pos.reverse()
-
-                path_cells = [self.map.get_cell(p.x, p.y) for p in path_pos]
-
-                # Set direction to first step
-                dx = path_pos[1].x - start.x
-                dy = path_pos[1].y - start.y
-                if dx == -1: self.next_direction_to_move = Direction.UP
-                elif dx == 1: self.next_direction_to_move = Direction.DOWN
-                elif dy == -1: self.next_direction_to_move = Direction.LEFT
-                elif dy == 1: self.next_direction_to_move = Direction.RIGHT
-                else: self.next_direction_to_move = None
-
-                #self.a_star_path = path_pos[1:]
-                return path_cells
-
-            visited.add(current)
-
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nbr = Position(current.x + dx, current.y + dy)
-
-                if not (0 <= nbr.x < self.map.rows and 0 <= nbr.y < self.map.cols):
-                    continue
-                if nbr in visited:
-                    continue
-
-                cell = self.map.get_cell(nbr.x, nbr.y)
-                if cell.has_type(CELL_TYPES.OBSTACLE):
-                    continue
-                if not cell.has_type(CELL_TYPES.WALKWAY):
-                    continue
-
-                if nbr not in came_from:
-                    came_from[nbr] = current
-                    heapq.heappush(open_heap, (h(nbr, goal), next(counter), nbr))
-
-        print(f"Robot {self.id} failed to find a path from {start} to {goal}.")
-        self.next_direction_to_move = None
-        return []
+        return self._kernel_search("greedy", raw_start, raw_goal)
 
     def dfs(self, raw_start, raw_goal) -> list[Cell]:
 
@@ -258,104 +293,197 @@ class Robot:
             print(f"Robot {self.id} missing start or goal.")
             return []
 
+        return self._kernel_search("dfs", raw_start, raw_goal)
+
+    def _kernel_search(self, method: str, raw_start, raw_goal) -> list[Cell]:
+        """
+        Run one of the shared PathKernel searches and turn its flat indices
+        back into Cells.
+        """
+        # Ensure we have Position instances
         start = Position(*raw_start) if isinstance(raw_start, tuple) else raw_start
-        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple) else raw_goal
+        goal  = Position(*raw_goal)  if isinstance(raw_goal, tuple)  else raw_goal
 
         if start == goal:
             self.next_direction_to_move = None
             return []
 
-        stack = [start]
-        came_from: dict[Position, Position] = {}
-        visited: set[Position] = set()
+        cols = self.map.cols
+        s, g = start.x * cols + start.y, goal.x * cols + goal.y
+
+        # only the optimal searches treat other robots as walls, so only
+        # their cached routes need re-checking against current robot positions
+        cache = cache_for(self.map)
+        path_idx = cache.get(s, g, method, avoid_robots=(method in ROBOT_AVOIDING_SEARCHES))
+        cached = path_idx is not None
+        expanded = peak_open = 0
+        raw_length = None
+        if path_idx is None:
+            batch = batch_for(self.map)
+            if batch is not None:
+                # solved in a worker process; the answer arrives through
+                # receive_path() before the next step
+                batch.submit(self, s, g)
+                self._awaiting_path = True
+                self.next_direction_to_move = None
+                return []
+
+            t0 = time.perf_counter()
+            kernel = kernel_for(self.map)
+            if method == "alt":
+                landmarks = landmarks_for(self.map)
+                if landmarks.may_connect(s, g):
+                    path_idx = kernel.astar(s, g, h=landmarks.heuristic(g))
+                    expanded, peak_open = kernel.expanded, kernel.peak_open
+            else:
+                path_idx = getattr(kernel, method)(s, g)
+                expanded, peak_open = kernel.expanded, kernel.peak_open
+            if path_idx is not None and method in SHORTENED_SEARCHES and Config.Simulation.SHORTEN_PATHS:
+                raw_length = len(path_idx) - 1
+                path_idx = kernel.shorten(path_idx)
+            if path_idx is not None:
+                cache.put(s, g, method, path_idx, time.perf_counter() - t0)
+        self._last_search = (expanded, peak_open, len(path_idx) - 1 if path_idx else None, raw_length, cached)
+
+        if path_idx is None:
+            print(f"Robot {self.id} failed to find a path from {start} to {goal}.")
+            self.next_direction_to_move = None
+            return []
 
-        while stack:
-            current = stack.pop()
+        path_cells = [self.map.get_cell(*divmod(i, cols)) for i in path_idx]
 
-            if current in visited:
-                continue
-            visited.add(current)
-
-            if current == goal:
-                # Reconstruct path
-                path_pos = []
-                p = current
-                while p != start:
-                    path_pos.append(p)
-                    p = came_from[p]
-                path_pos.append(start)
-                path_pos.reverse()
-
-                path_cells = [self.map.get_cell(p.x, p.y) for p in path_pos]
-
-                # Set direction to first step
-                dx = path_pos[1].x - start.x
-                dy = path_pos[1].y - start.y
-                if dx == -1: self.next_direction_to_move = Direction.UP
-                elif dx == 1: self.next_direction_to_move = Direction.DOWN
-                elif dy == -1: self.next_direction_to_move = Direction.LEFT
-                elif dy == 1: self.next_direction_to_move = Direction.RIGHT
-                else: self.next_direction_to_move = None
-
-                #self.a_star_path = path_pos[1:]  # drop the start
-                return path_cells
-
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nbr = Position(current.x + dx, current.y + dy)
-
-                if not (0 <= nbr.x < self.map.rows and 0 <= nbr.y < self.map.cols):
-                    continue
-                if nbr in visited:
-                    continue
-
-                cell = self.map.get_cell(nbr.x, nbr.y)
-                if cell.has_type(CELL_TYPES.OBSTACLE):
-                    continue
-                if not cell.has_type(CELL_TYPES.WALKWAY):
-                    continue
-                
-                if nbr not in came_from:
-                    came_from[nbr] = current
-                    stack.append(nbr)
-
-        print(f"Robot {self.id} failed to find a path from {start} to {goal}.")
-        self.next_direction_to_move = None
-        return []
+        # set next_direction_to_move
+        self.next_direction_to_move = direction_between(path_cells[0].position, path_cells[1].position)
+        return path_cells
         
-    def move(self):
+    def replan(self, start: Position, goal: Position) -> list[Cell]:
         """
-        Step *along* the precomputed self.a_star_path.
-        Each call pops the next Position and walks there,
-        removing that cell from the front of the path.
+        Route to `goal` from the robot's D* Lite planner. The planner is kept
+        while the goal stays the same, so replanning again only repairs what
+        robots moving around changed since the last call.
         """
-        # nothing queued?
-        if not self.returned_path:
+        self._pending_route = None
+        cols = self.map.cols
+        g = goal.x * cols + goal.y
+        if self._replanner is None or self._replanner.goal != g:
+            self._replanner = DStarLite(self.map, g, Config.Simulation.REPLAN_ROBOT_PENALTY)
+
+        t0 = time.perf_counter()
+        planner = self._replanner
+        path_idx = planner.plan(start.x * cols + start.y)
+        stats_for(self.map).record("dstar_lite", self.id, time.perf_counter() - t0,
+                                   planner.expanded, planner.peak_open,
+                                   len(path_idx) - 1 if path_idx else None,
+                                   failed=path_idx is None)
+        if path_idx is None:
+            self.next_direction_to_move = None
+            return []
+        if len(path_idx) > 1:
+            self.next_direction_to_move = direction_between(start, Position(*divmod(path_idx[1], cols)))
+        return [self.map.get_cell(*divmod(i, cols)) for i in path_idx]
+
+    def receive_path(self, path_idx: list[int] | None):
+        """Answer from the batch planner to a query made by _kernel_search."""
+        self._awaiting_path = False
+        if path_idx is None:
+            print(f"Robot {self.id} failed to find a path to {self.dropoff_point}.")
+            self._batched_path = []
             return
+        cols = self.map.cols
+        self._batched_path = [self.map.get_cell(*divmod(i, cols)) for i in path_idx]
 
-        # 1) figure out where to go next
-        next_pos = self.returned_path.pop(0)  # Position(x,y)
-        old_pos  = self.position
-
-        # 2) compute the direction (optional, for your logic)
-        dx = next_pos.x - old_pos.x
-        dy = next_pos.y - old_pos.y
-        if   dx == -1: self.next_direction_to_move = Direction.UP
-        elif dx ==  1: self.next_direction_to_move = Direction.DOWN
-        elif dy == -1: self.next_direction_to_move = Direction.LEFT
-        elif dy ==  1: self.next_direction_to_move = Direction.RIGHT
-        else:
-            # somehow not adjacent?
+    def path_home(self, start: Position) -> list[Cell]:
+        """
+        Route from `start` back to the restaurant pickup point. With distance
+        fields enabled this just walks down the pickup field's gradient;
+        otherwise (or if the field cannot reach `start`) it is a normal search.
+        """
+        self._pending_route = None
+        # cooperative robots must reserve their way home like any other route
+        if Config.Simulation.USE_DISTANCE_FIELDS and Config.Simulation.PATHFINDING_ALGORITHM != "whca":
+            cols = self.map.cols
+            path_idx = fields_for(self.map).to_pickup().descend(start.x * cols + start.y)
+            if path_idx is not None:
+                if len(path_idx) > 1:
+                    self.next_direction_to_move = direction_between(
+                        start, Position(*divmod(path_idx[1], cols)))
+                return [self.map.get_cell(*divmod(i, cols)) for i in path_idx]
+        return self.find_path(start, self.restaurant_pickup_point)
+
+    def move(self, steps: int = 1):
+        """
+        Walk up to `steps` cells *along* self.returned_path (loading the
+        next segment of a lazily expanded route on the way) by advancing
+        its cursor. The map's ROBOT occupancy is updated once, from where
+        the robot stood to where it ends up: the cells passed in between
+        were only crossed during the tick.
+        """
+        old_pos = self.position
+        prev_pos = cur_pos = old_pos
+        walked = 0
+        for _ in range(steps):
+            if not self.returned_path and self._pending_route is not None:
+                self._load_next_segment()
+            # nothing queued?
+            if not self.returned_path:
+                self._progress = 0.0   # stopped: no half-walked cell to carry over
+                break
+
+            # 1) figure out where to go next
+            next_pos = self.returned_path.step()  # Position(x,y)
+            walked += 1
+
+            # 2) compute the direction (optional, for your logic)
+            direction = direction_between(cur_pos, next_pos)
+            if direction is None:
+                # waiting in place (a repeated cell in a cooperative route)
+                continue
+            self.next_direction_to_move = direction
+            prev_pos, cur_pos = cur_pos, next_pos
+
+        if walked and Config.Simulation.PATHFINDING_ALGORITHM == "whca":
+            self._stepped_at = cooperative_for(self.map).table.now
+        if cur_pos == old_pos:
             return
 
         # 3) actually step
-        self.previous_position = old_pos
-        self.position          = next_pos
+        self.previous_position = prev_pos
+        self.position          = cur_pos
 
         self.map.get_cell(old_pos.x, old_pos.y).remove_type(CELL_TYPES.ROBOT)
 
         if self.dropoff_point != self.position:
             # this because when we arrive at the dropoff point, we dont want the a_star algorithm to get stuck in the dropoff point
-            self.map.get_cell(next_pos.x, next_pos.y).add_type(CELL_TYPES.ROBOT)
+            self.map.get_cell(cur_pos.x, cur_pos.y).add_type(CELL_TYPES.ROBOT)
+
+    def _steps_for(self, dt: float | None) -> int:
+        """
+        Cells to walk this tick: ROBOT_SPEED cells per sim-second over `dt`
+        sim-seconds, carrying the fraction of a cell over to the next tick.
+        Without a dt, and for cooperative robots whose reservations are one
+        cell per tick, it is one cell.
+        """
+        if dt is None or Config.Simulation.PATHFINDING_ALGORITHM == "whca":
+            return 1
+        self._progress += Config.Simulation.ROBOT_SPEED * dt
+        # a tick timed to end on a cell (see next_event_in) must reach it,
+        # not stop a rounding error short
+        steps = int(self._progress + 1e-9)
+        self._progress = max(self._progress - steps, 0.0)
+        return steps
+
+    def next_event_in(self) -> float | None:
+        """
+        Sim-seconds until this robot next has something to do by itself:
+        reach the end of the route it is walking, or, one tick on, retry a
+        plan that failed or is still out with the batch planner. None when
+        it is idle and only an order can get it going again.
+        """
+        if self.state == "idle":
+            return None
+        if not self.returned_path or Config.Simulation.PATHFINDING_ALGORITHM == "whca":
+            return 1 / Config.Simulation.UPDATES_PER_SEC
+        return max(len(self.returned_path) - self._progress, 0.0) / Config.Simulation.ROBOT_SPEED
 
     def add_order(self, order):
         """
@@ -379,50 +507,79 @@ class Robot:
         self.dropoff_point = Position(*raw_dropoff) if isinstance(raw_dropoff, tuple) else raw_dropoff
         
         self.state = "delivering"
+        self._batched_path = None   # an answer for a route that is no longer wanted
         path = self.find_path(self.position, self.dropoff_point)
-        self.returned_path = [cell.position for cell in path][1:]  # drop the start
+        self.returned_path = CompactPath.from_points(path)
 
-    def act(self):
+    def act(self, dt: float | None = None):
         """
-        Perform the robot's action.
+        Perform the robot's action for a tick of `dt` sim-seconds (one
+        cell's worth of walking when not given).
         """
+        # hierarchical and corridor routes are expanded one segment at a time
+        if not self.returned_path and self._pending_route is not None:
+            self._load_next_segment()
+
+        # cooperative routes are planned (and reserved) a window at a time;
+        # the next window is planned while half of this one is still ahead
+        if Config.Simulation.PATHFINDING_ALGORITHM == "whca" \
+        and self.state in ("delivering", "returning") \
+        and 0 < len(self.returned_path) <= Config.Simulation.WHCA_WINDOW // 2 \
+        and self.returned_path.end != self.dropoff_point:
+            path = self.find_path(self.position, self.dropoff_point)
+            if path:
+                self.returned_path = CompactPath.from_points(path)
+
          # only try to re‐plan if we're in motion and have no path
         if self.state in ("delivering", "returning") \
         and not self.returned_path \
         and self.position != self.dropoff_point:
 
-            path = self.find_path(self.position, self.dropoff_point)
+            if self._awaiting_path:
+                return   # the batch planner answers before the next step
+            if self._batched_path is not None:
+                path, self._batched_path = self._batched_path, None
+            elif self.state == "returning":
+                path = self.path_home(self.position)
+            elif Config.Simulation.INCREMENTAL_REPLANNING and Config.Simulation.PATHFINDING_ALGORITHM != "whca" \
+            and batch_for(self.map) is None:
+                # with a batch planner, replans go to the workers like first plans
+                path = self.replan(self.position, self.dropoff_point)
+            else:
+                path = self.find_path(self.position, self.dropoff_point)
+            if self._awaiting_path:
+                return
 
             if not path:
+                # each failed attempt is already a failed search in the map's PathStats
                 self._replan_failures += 1
 
-                if self._replan_failures >= 25:
+                if self._replan_failures >= self.MAX_REPLAN_FAILURES:
                     # abort current order if we were delivering
                     if self.state == "delivering" and self.orders:
                         aborted = self.orders.pop(0)
-                        print(f"Robot {self.id} aborted order {aborted} after 100 failed replans.")
+                        print(f"Robot {self.id} aborted order {aborted} "
+                              f"after {self.MAX_REPLAN_FAILURES} failed replans.")
                     # reset and go idle
                     self._replan_failures = 0
                     self.state = "idle"
                     self.dropoff_point = None
-                    return
-                else:
-                    print(f"Robot {self.id} replan attempt {self._replan_failures}/100 failed; retrying next tick.")
-                    return
+                return   # retry next tick
 
             # success → reset counter and load the new path
             self._replan_failures = 0
-            self.returned_path = [c.position for c in path][1:]
-            print(f"Robot {self.id} replanned path to {self.dropoff_point}.")
+            self.returned_path = CompactPath.from_points(path)
 
 
-        self.move()
+        self.move(self._steps_for(dt))
         # 2) did we just arrive?
         if self.position == self.dropoff_point:
+            self._replanner = None   # its goal is reached; free the search state
             if self.state == "delivering":
                 # print(f"Robot {self.id} arrived at dropoff point {self.dropoff_point}.")
                 if self.orders:
                     completed = self.orders.pop(0)
+                    self.delivered.append(completed)
                     print(f"Robot {self.id} delivered order {completed}.")
 
                 # if there’s another order waiting, go straight to it
@@ -430,13 +587,14 @@ class Robot:
                     self._start_next_delivery()
                 else:
                     # no more orders → try to plan a path home
-                    path = self.find_path(self.dropoff_point,self.restaurant_pickup_point)
+                    path = self.path_home(self.dropoff_point)
 
-                    if path:
-                        # only flip to "returning" when we actually have a path
+                    # only flip to "returning" when we actually have a path, or
+                    # the batch planner owes us one: the replan block above then
+                    # waits for it and picks it up like any other batched route
+                    if path or self._awaiting_path:
                         self.state = "returning"
-                        # record the steps (dropping the start)
-                        self.returned_path = [c.position for c in path][1:]
+                        self.returned_path = CompactPath.from_points(path)
                         # new goal is restaurant
                         self.dropoff_point = self.restaurant_pickup_point
                     else:
@@ -38,3 +38,8 @@ class ProgressWindow(tk.Toplevel):
         self.label.config(text=f"{self.step_label}: {pct:.2%}")
         self.progress['value'] = attempt
         self.update_idletasks()
+
+    def show_message(self, text: str):
+        """Replace the progress label with a summary line (e.g. a phase's cost)."""
+        self.label.config(text=text)
+        self.update_idletasks()
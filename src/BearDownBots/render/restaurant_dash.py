@@ -21,6 +21,7 @@ class RestaurantDashboardRenderer:
         self.parent   = parent
         self.robots   = []       # set later with add_robots()
         self.scheduler = None
+        self._order_mark = 0     # scheduler.transition_mark() at the last update
 
         self.robot_label = []
 
@@ -121,32 +122,32 @@ class RestaurantDashboardRenderer:
         if self.scheduler is None:
             return
 
-        # 1) Build the desired buckets of order_ids
-        desired = {
-            OrderStatus.PLACED:    set(),
-            OrderStatus.PREPARING: set(),
-            OrderStatus.READY:     set(),
+        # 1) Move the labels of orders whose status changed since last time
+        tabs = {
+            OrderStatus.PLACED:    self.tab_new,
+            OrderStatus.PREPARING: self.tab_prep,
+            OrderStatus.READY:     self.tab_ready,
         }
-        for building, order in self.scheduler.orders:
-            if order.status in desired:
-                desired[order.status].add(id(order))
-
-        # 2) Diff & update each non‐delivering tab
-        for status, tab in ((OrderStatus.PLACED, self.tab_new),
-                            (OrderStatus.PREPARING, self.tab_prep),
-                            (OrderStatus.READY, self.tab_ready)):
-            shown = self._shown[status]
-            # remove labels no longer desired
-            for oid in list(shown):
-                if oid not in desired[status]:
-                    shown[oid].destroy()
-                    del shown[oid]
-            # add any new orders
-            for building, order in self.scheduler.orders:
-                oid = id(order)
-                if order.status == status and oid not in shown:
-                    lbl = self._add_label(tab, f"{building.name} → {order}")
-                    shown[oid] = lbl
+        changed = self.scheduler.transitions_since(self._order_mark)
+        if changed is None:
+            # fell behind the scheduler's log: start over from its queues
+            for status in tabs:
+                for lbl in self._shown[status].values():
+                    lbl.destroy()
+                self._shown[status].clear()
+            changed = self.scheduler.orders
+        self._order_mark = self.scheduler.transition_mark()
+
+        # 2) Each order's label belongs in the tab of its current status, if any
+        for building, order in changed:
+            oid = id(order)
+            for status, tab in tabs.items():
+                shown = self._shown[status]
+                if order.status == status:
+                    if oid not in shown:
+                        shown[oid] = self._add_label(tab, f"{building.name} → {order}")
+                elif oid in shown:
+                    shown.pop(oid).destroy()
 
         # 3) Delivering tab: handle headers and order items per robot
         # Track which robot‐headers and which (robot,order) pairs we now need
@@ -17,8 +17,9 @@ class RobotRenderer:
 
     def render_robots(self, robots: list[Robot]):
         """
-        Draw each robot as a circle on the canvas, using the current
-        zoom/offset from data. Clears any previous robot ovals first.
+        Draw each robot as a circle on the canvas (and, with
+        SHOW_ROBOT_PATHS, the route still ahead of it), using the current
+        zoom/offset from data. Clears any previous robot drawings first.
         """
         # 1) remove old robot ovals
         self.canvas.delete("robot")
@@ -32,6 +33,22 @@ class RobotRenderer:
         min_px      = 3               # floor so it never vanishes
         radius      = max(min_px, int(world_radius * z))
 
+        if Config.GUI.SHOW_ROBOT_PATHS:
+            # one segment per straight run, so long routes stay cheap to draw
+            for robot in robots:
+                corners = robot.returned_path.corners()
+                if len(corners) < 2:
+                    continue
+                coords = []
+                for x, y in corners:
+                    coords += (y * z - ox, x * z - oy)
+                self.canvas.create_line(
+                    *coords,
+                    fill=robot.colour,
+                    width=max(1, int(0.25 * z)),
+                    tags=("robot",)
+                )
+
         for robot in robots:
             screen_x = robot.position.y * z - ox
             screen_y = robot.position.x * z - oy
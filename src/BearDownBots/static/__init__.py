@@ -5,11 +5,54 @@ from BearDownBots.config import Config
 from BearDownBots.static.buildings import Building
 from BearDownBots.static.cell import CELL_TYPES
 from BearDownBots.render.loading import ProgressWindow
+from BearDownBots.static import snapshot
 
 
 def create_campus_environment(progress_window: ProgressWindow | None) -> Map:
     """
     Create a campus environment with the specified number of rows and columns.
+
+    When Config.Environment.SEED is set the campus is reproducible, and with
+    CAMPUS_CACHE enabled it is loaded from (or saved to) the snapshot cache.
+    """
+    seed = Config.Environment.SEED
+    use_cache = seed is not None and Config.Environment.CAMPUS_CACHE
+
+    if use_cache:
+        if progress_window is not None:
+            progress_window.start_phase("Loading Cached Campus", 1)
+        campus_map = snapshot.load_campus(seed)
+        if campus_map is not None:
+            print(f"Loaded cached campus {snapshot.campus_key(seed)} ({len(campus_map.buildings)} buildings).")
+            _seed_simulation(seed)
+            return campus_map
+
+    if seed is not None:
+        random.seed(seed)
+
+    campus_map = _generate_campus(progress_window)
+
+    if use_cache:
+        path = snapshot.save_campus(campus_map, seed)
+        print(f"Cached campus to {path}")
+
+    if seed is not None:
+        _seed_simulation(seed)
+
+    return campus_map
+
+
+def _seed_simulation(seed: int):
+    """
+    Re-seed after the campus exists, so a cached and a freshly generated
+    campus lead to the same order/robot randomness.
+    """
+    random.seed(f"{seed}:simulation")
+
+
+def _generate_campus(progress_window: ProgressWindow | None) -> Map:
+    """
+    Build a brand new random campus.
     """
     # Initialize the progress window
     if progress_window is not None:
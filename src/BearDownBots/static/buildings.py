@@ -3,17 +3,37 @@ import random
 import uuid
 import math
 
+import numpy as np
+
 from BearDownBots.dynamic.randOrders import Order
+
+
+def halo_of(mask: np.ndarray, interior: np.ndarray) -> np.ndarray:
+    """
+    Cells 4-adjacent to `mask` but not part of it or of `interior`.
+    The result is padded by one cell on every side, so entry [i, j]
+    is the offset (i - 1, j - 1) from the building's top-left.
+    """
+    h, w = mask.shape
+    padded = np.zeros((h + 2, w + 2), dtype=bool)
+    padded[1:-1, 1:-1] = mask
+    halo = np.zeros_like(padded)
+    halo[:-1, :] |= padded[1:, :]
+    halo[1:, :]  |= padded[:-1, :]
+    halo[:, :-1] |= padded[:, 1:]
+    halo[:, 1:]  |= padded[:, :-1]
+    halo &= ~padded
+    halo[1:-1, 1:-1] &= ~interior
+    return halo
+
     
 class Building:
     """Base class for all building types."""
     likelihood: float = 1.0  # default selection weight
 
-    def __init__(self, cells: list[tuple[int, int]], height: int, width: int):
+    def __init__(self, mask: np.ndarray, interior: np.ndarray | None = None):
         self.id     = uuid.uuid4()  # unique identifier for each building
-        self.cells  = cells         # list of (dr, dc) offsets from top-left
-        self.h      = height
-        self.w      = width
+        self._set_footprint(mask, interior)
         self.name   = random.choice(BUILDING_NAMES)  # random name from list
         
         self.top_left_x = None  # to be set when placed on map
@@ -25,6 +45,32 @@ class Building:
 
         self.dropoff_point = None
 
+    def _set_footprint(self, mask: np.ndarray, interior: np.ndarray | None):
+        """
+        Store the footprint masks; all are relative to the top-left corner.
+          mask          : h x w, True on building cells
+          interior_mask : h x w, True on enclosed cells that get no sidewalk
+          halo_mask     : (h+2) x (w+2), True where sidewalks may go
+        """
+        self.mask = mask.astype(bool, copy=False)
+        self.h, self.w = self.mask.shape
+        if interior is None:
+            interior = np.zeros_like(self.mask)
+        self.interior_mask = interior.astype(bool, copy=False)
+        self.halo_mask = halo_of(self.mask, self.interior_mask)
+
+    @property
+    def cells(self) -> list[tuple[int, int]]:
+        """(dr, dc) offsets of every building cell, row-major."""
+        return [(int(r), int(c)) for r, c in np.argwhere(self.mask)]
+
+    def is_interior(self, x: int, y: int) -> bool:
+        """
+        True if the map cell (x, y) lies in this building's enclosed interior.
+        """
+        dr, dc = x - self.top_left_x, y - self.top_left_y
+        return 0 <= dr < self.h and 0 <= dc < self.w and bool(self.interior_mask[dr, dc])
+
     def get_center_coords(self):
         """
         Get the center coordinates based on top left coordiantes and its height and width
@@ -63,9 +109,24 @@ class Building:
         Subclasses may override if additional parameters are needed.
         """
         return cls(min_cells, max_cells)
-    
+
+    @classmethod
+    def restore(cls, mask: np.ndarray, interior: np.ndarray | None = None, **attrs) -> 'Building':
+        """
+        Rebuild an already placed building (e.g. from a campus snapshot)
+        without re-rolling its random shape or name.
+        """
+        bld = cls.__new__(cls)
+        bld._set_footprint(mask, interior)
+        bld.sidewalk_cells = []
+        bld.order = None
+        bld.dropoff_point = None
+        for key, value in attrs.items():
+            setattr(bld, key, value)
+        return bld
+
     def __repr__(self):
-        return f"{self.__class__.__name__}(id={self.id}, h={self.h}, w={self.w}, cells={len(self.cells)})"
+        return f"{self.__class__.__name__}(id={self.id}, h={self.h}, w={self.w}, cells={int(self.mask.sum())})"
 
 
 class RectangleBuilding(Building):
@@ -76,8 +137,7 @@ class RectangleBuilding(Building):
         base = random.randint(min_cells, max_cells)
         w = random.randint(max(1, int(base * 0.5)), int(base * 2))
         h = random.randint(max(1, int(base * 0.5)), int(base * 2))
-        cells = [(dr, dc) for dr in range(h) for dc in range(w)]
-        super().__init__(cells, h, w)
+        super().__init__(np.ones((h, w), dtype=bool))
 
 
 class RatioRectangleBuilding(Building):
@@ -92,8 +152,7 @@ class RatioRectangleBuilding(Building):
         w, h = base, base * 2
         if random.random() < 0.5:
             w, h = h, w
-        cells = [(dr, dc) for dr in range(h) for dc in range(w)]
-        super().__init__(cells, h, w)
+        super().__init__(np.ones((h, w), dtype=bool))
 
 
 class SquareBuilding(Building):
@@ -110,8 +169,7 @@ class SquareBuilding(Building):
             )
 
         side = random.randint(min_side, max_side)
-        cells = [(dr, dc) for dr in range(side) for dc in range(side)]
-        super().__init__(cells, side, side)
+        super().__init__(np.ones((side, side), dtype=bool))
 
 
 
@@ -142,20 +200,16 @@ class HollowSquareBuilding(Building):
 
         side = random.randint(min_side, max_side)
 
-        cells = []
-        for dr in range(side):
-            for dc in range(side):
-                if dr < t or dr >= side - t or dc < t or dc >= side - t:
-                    cells.append((dr, dc))
+        # the inner “hole” is kept as the interior mask for easy exclusion later
+        interior = np.zeros((side, side), dtype=bool)
+        interior[t:side - t, t:side - t] = True
 
-        super().__init__(cells, side, side)
+        super().__init__(~interior, interior)
 
-        # now store the inner “hole” offsets for easy exclusion later
-        self.inner_cells = [
-            (dr, dc)
-            for dr in range(t, side - t)
-            for dc in range(t, side - t)
-        ]
+    @property
+    def inner_cells(self) -> list[tuple[int, int]]:
+        """(dr, dc) offsets of the hollow interior."""
+        return [(int(r), int(c)) for r, c in np.argwhere(self.interior_mask)]
 
     def get_random_sidewalk_cell(self) -> tuple[int, int]:
         """
@@ -167,7 +221,7 @@ class HollowSquareBuilding(Building):
         # filter out any sidewalk cell that's in the inner hole
         valid = [
             cell for cell in self.sidewalk_cells
-            if cell not in self.inner_cells
+            if not self.is_interior(*cell)
         ]
 
         if not valid:
@@ -188,13 +242,12 @@ class TrapezoidBuilding(Building):
         top = random.randint(min_cells, max_cells)
         bottom = random.randint(min_cells, max_cells)
         max_w = max(top, bottom)
-        cells = []
+        mask = np.zeros((h, max_w), dtype=bool)
         for dr in range(h):
             w_i = round(top + (bottom - top) * dr / (h - 1)) if h > 1 else top
             offset = (max_w - w_i) // 2
-            for dc in range(w_i):
-                cells.append((dr, offset + dc))
-        super().__init__(cells, h, max_w)
+            mask[dr, offset:offset + w_i] = True
+        super().__init__(mask)
 
 
 BUILDING_NAMES = [
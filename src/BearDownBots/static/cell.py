@@ -16,6 +16,11 @@ class CustomCellTypeEnum(Enum):
     def color(self) -> str:
         return self._color
 
+    @property
+    def bit(self) -> int:
+        """Bit flag used for this type in the Map's bitmask grid."""
+        return 1 << self._value_
+
     
 class CELL_TYPES(CustomCellTypeEnum):
     RESTUARANT_PICKUP = (6, "#e06192")  # pink
@@ -53,39 +58,51 @@ from collections import Counter
 from BearDownBots.static.cell import CELL_TYPES, Position
 
 class Cell:
-    def __init__(self, x: int, y: int, cell_type: CELL_TYPES):
-        self.position = Position(x, y)
+    """
+    Thin view onto a single (x, y) entry of a Map's bitmask grid.
+    Views are created on demand by Map.get_cell() and hold no state of
+    their own, so every read/write goes straight through to the map.
+    """
+    __slots__ = ("map", "x", "y")
+
+    def __init__(self, map, x: int, y: int):
+        self.map = map
         self.x, self.y = x, y
-        # now a Counter so we can track how many of each type
-        self.types: Counter[CELL_TYPES,int] = Counter([cell_type])
+
+    @property
+    def position(self) -> Position:
+        return Position(self.x, self.y)
+
+    @property
+    def types(self) -> Counter:
+        """
+        Counter of every type present in the cell (built on demand).
+        """
+        return Counter({t: self.count_type(t) for t in CELL_TYPES if self.has_type(t)})
 
     def add_type(self, cell_type: CELL_TYPES):
         """
         Add one more instance of this type to the cell.
         """
-        self.types[cell_type] += 1
+        self.map.add_cell_type(self.x, self.y, cell_type)
 
     def remove_type(self, cell_type: CELL_TYPES):
         """
         Remove one instance of this type, if present.
         """
-        if self.types[cell_type] > 0:
-            self.types[cell_type] -= 1
-            if self.types[cell_type] == 0:
-                del self.types[cell_type]
+        self.map.remove_cell_type(self.x, self.y, cell_type)
 
     def has_type(self, cell_type: CELL_TYPES) -> bool:
         """
         True if there’s at least one of that type here.
         """
-        return self.types[cell_type] > 0
+        return self.map.has_type(self.x, self.y, cell_type)
 
     def count_type(self, cell_type: CELL_TYPES) -> int:
         """
         How many instances of that type live in this cell?
         """
-        return self.types[cell_type]
+        return self.map.count_type(self.x, self.y, cell_type)
 
     def __repr__(self):
         return f"Cell({self.x}, {self.y}, counts={dict(self.types)})"
-
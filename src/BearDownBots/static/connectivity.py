@@ -0,0 +1,84 @@
+# src/BearDownBots/static/connectivity.py
+import numpy as np
+
+
+class WalkwayUnionFind:
+    """
+    Disjoint-set forest over walkway cells, keyed by flat index (x * cols + y).
+
+    Only walkway cells are stored, so memory and work scale with the size of
+    the walkway network rather than with the map area.
+    """
+
+    def __init__(self, cols: int):
+        self.cols = cols
+        self.parent: dict[int, int] = {}
+        self.size: dict[int, int] = {}
+
+    @classmethod
+    def from_mask(cls, walk_mask: np.ndarray) -> 'WalkwayUnionFind':
+        """
+        Build the forest for an existing rows x cols walkway mask in one pass.
+        """
+        rows, cols = walk_mask.shape
+        uf = cls(cols)
+        flat = walk_mask.reshape(-1)
+        for i in np.flatnonzero(flat).tolist():
+            uf.parent[i] = i
+            uf.size[i] = 1
+
+        # horizontal and vertical neighbour pairs that are both walkway
+        idx = np.arange(rows * cols).reshape(rows, cols)
+        horiz = idx[:, :-1][walk_mask[:, :-1] & walk_mask[:, 1:]]
+        vert  = idx[:-1, :][walk_mask[:-1, :] & walk_mask[1:, :]]
+        for i in horiz.tolist():
+            uf.union(i, i + 1)
+        for i in vert.tolist():
+            uf.union(i, i + cols)
+        return uf
+
+    def __contains__(self, i: int) -> bool:
+        return i in self.parent
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]   # path halving
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> int:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size.pop(rb)
+        return ra
+
+    def add(self, i: int, neighbours) -> None:
+        """
+        Register walkway cell `i` and merge it with every already-known
+        neighbour index in `neighbours`.
+        """
+        if i not in self.parent:
+            self.parent[i] = i
+            self.size[i] = 1
+        for n in neighbours:
+            if n in self.parent:
+                self.union(i, n)
+
+    def roots(self) -> list[int]:
+        """One representative (root) per component, sorted by index."""
+        return sorted(self.size)
+
+    def components(self) -> dict[int, list[int]]:
+        """Map of root -> member indices."""
+        comps: dict[int, list[int]] = {}
+        for i in self.parent:
+            comps.setdefault(self.find(i), []).append(i)
+        return comps
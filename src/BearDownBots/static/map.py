@@ -7,15 +7,51 @@ from typing import Optional
 
 from BearDownBots.static.cell import Cell, CELL_TYPES, OBSTACLE_TYPES
 from BearDownBots.static.buildings import Building
+from BearDownBots.static.connectivity import WalkwayUnionFind
+from BearDownBots.static.occupancy import OccupancyIndex
 from BearDownBots.config import Config
 
 import random
+import numpy as np
+
+# types that can be stacked several times on one cell (e.g. robots queued at
+# the pickup point); every other type is a plain on/off bit in the grid
+STACKABLE_TYPES = (CELL_TYPES.ROBOT,)
+
+# cells a new building may not overlap
+OCCUPIED_BITS = CELL_TYPES.BUILDING.bit | CELL_TYPES.WALKWAY.bit
+
+
+def _swap_bits(region: np.ndarray, where: np.ndarray, remove: int, add: int):
+    """Vectorized remove/add of one type bit on every `where` cell of `region`."""
+    region[where] = (region[where] & (0xFF ^ remove)) | add
 
 class Map:
-    def __init__(self, rows: int, cols: int):
+    MAX_CONNECT_PASSES = 4  # connect_sidewalks retries for components still cut off
+    FLIP_LOG_LIMIT = 1 << 16  # robot occupancy flips kept for incremental replanners
+
+    def __init__(self, rows: int, cols: int, grid: np.ndarray | None = None):
         self.rows = rows
         self.cols = cols
-        self.create_empty_map()
+        if grid is None:
+            self.create_empty_map()
+            # walkway connectivity, kept up to date as sidewalks are laid
+            self._walkway_uf = WalkwayUnionFind(cols)
+        else:
+            # adopt an existing bitmask grid (e.g. a memory-mapped snapshot);
+            # connectivity is rebuilt lazily on first use
+            self.attach_grid(grid)
+            self._walkway_uf = None
+        # bumped on every structural change (anything but robots moving),
+        # so caches built from the map can tell when they went stale
+        self.version = 0
+        # callables fn(x0, y0, x1, y1) told which rectangle changed, for
+        # indexes that can repair themselves locally instead of rebuilding
+        self._change_listeners = []
+        # flat indices where a stackable type (robots) appeared or vanished,
+        # oldest first; replanners read what changed since their last look
+        self._flips: list[int] = []
+        self._flips_base = 0
         # keep track of obstacle specifics
         self.obstacles = {}  # {(x, y): obstacle_type}
 
@@ -27,38 +63,152 @@ class Map:
 
     def create_empty_map(self):
         """
-        Initialize a rows x cols grid of Cells, all set to GROUND.
-        """
-        self.grid = [
-            [Cell(x, y, CELL_TYPES.GROUND) for y in range(self.cols)]
-            for x in range(self.rows)
-        ]
+        Initialize a rows x cols bitmask grid, all set to GROUND.
 
-        self.one_dimensional_grid = [cell for row in self.grid for cell in row]
+        Every CELL_TYPES member is one bit of a uint8 entry (see
+        CELL_TYPES.bit); stackable types additionally keep a per-cell count
+        in self.type_counts.
+        """
+        self.attach_grid(np.full((self.rows, self.cols), CELL_TYPES.GROUND.bit, dtype=np.uint8))
 
         return self.grid
 
-    def get_cell(self, x: int, y: int) -> Cell:
+    def attach_grid(self, grid: np.ndarray):
+        """
+        Use `grid` as this map's storage. Stackable counters start empty.
+        """
+        if grid.shape != (self.rows, self.cols) or grid.dtype != np.uint8:
+            raise ValueError(f"Expected a {self.rows}x{self.cols} uint8 grid, got {grid.shape} {grid.dtype}")
+        self.grid = grid
+        self.occupancy = OccupancyIndex(grid, OCCUPIED_BITS)
+        self.type_counts = {
+            t: np.zeros((self.rows, self.cols), dtype=np.uint16)
+            for t in STACKABLE_TYPES
+        }
+        self._bind_views()
+
+    def _bind_views(self):
         """
-        Return the Cell at (x, y), or raise IndexError if out of bounds.
+        (Re)create the flat memoryviews used for fast scalar access.
+        Must be called whenever self.grid / self.type_counts are replaced.
         """
+        self._flat = memoryview(self.grid).cast('B')
+        self._flat_counts = {
+            t: memoryview(arr).cast('B').cast('H')
+            for t, arr in self.type_counts.items()
+        }
+
+    def add_change_listener(self, listener):
+        """
+        Call listener(x0, y0, x1, y1) after every structural change, with the
+        changed cells being rows x0..x1-1 and columns y0..y1-1.
+        """
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        """Stop calling a listener added with add_change_listener (if it still is)."""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _structure_changed(self, x0: int, y0: int, x1: int, y1: int):
+        self.version += 1
+        for listener in self._change_listeners:
+            listener(x0, y0, x1, y1)
+
+    def flip_mark(self) -> int:
+        """Position in the robot-occupancy log, for a later flips_since()."""
+        return self._flips_base + len(self._flips)
+
+    def flips_since(self, mark: int) -> list[int] | None:
+        """
+        Flat indices whose robot occupancy flipped since `mark` (may repeat),
+        or None if the log no longer reaches back that far.
+        """
+        if mark < self._flips_base:
+            return None
+        return self._flips[mark - self._flips_base:]
+
+    def _record_flip(self, i: int):
+        self._flips.append(i)
+        if len(self._flips) > self.FLIP_LOG_LIMIT:
+            drop = len(self._flips) // 2
+            del self._flips[:drop]
+            self._flips_base += drop
+
+    def _index(self, x: int, y: int) -> int:
         if 0 <= x < self.rows and 0 <= y < self.cols:
-            return self.grid[x][y]
+            return x * self.cols + y
         raise IndexError(f"Cell coordinates out of bounds: ({x}, {y})")
 
+    def get_cell(self, x: int, y: int) -> Cell:
+        """
+        Return a view of the Cell at (x, y), or raise IndexError if out of bounds.
+        """
+        self._index(x, y)
+        return Cell(self, x, y)
+
     def add_cell_type(self, x: int, y: int, cell_type: CELL_TYPES):
         """
         Add a type to the Cell at (x, y).
         """
-        cell = self.get_cell(x, y)
-        cell.add_type(cell_type)
+        i = self._index(x, y)
+        counts = self._flat_counts.get(cell_type)
+        if counts is not None:
+            counts[i] += 1
+            if counts[i] == 1:
+                self._record_flip(i)
+        self._flat[i] |= cell_type.bit
+        if cell_type.bit & OCCUPIED_BITS:
+            self.occupancy.invalidate(x, y)
+        if counts is None:
+            self._structure_changed(x, y, x + 1, y + 1)
 
     def remove_cell_type(self, x: int, y: int, cell_type: CELL_TYPES):
         """
         Remove a type from the Cell at (x, y).
         """
-        cell = self.get_cell(x, y)
-        cell.remove_type(cell_type)
+        i = self._index(x, y)
+        counts = self._flat_counts.get(cell_type)
+        if counts is not None:
+            if counts[i] == 0:
+                return
+            counts[i] -= 1
+            if counts[i] > 0:
+                return
+            self._record_flip(i)
+        self._flat[i] &= ~cell_type.bit & 0xFF
+        if cell_type.bit & OCCUPIED_BITS:
+            self.occupancy.invalidate(x, y)
+        if counts is None:
+            self._structure_changed(x, y, x + 1, y + 1)
+
+    def has_type(self, x: int, y: int, cell_type: CELL_TYPES) -> bool:
+        """
+        True if the Cell at (x, y) holds at least one of that type.
+        """
+        return bool(self._flat[self._index(x, y)] & cell_type.bit)
+
+    def count_type(self, x: int, y: int, cell_type: CELL_TYPES) -> int:
+        """
+        How many instances of that type live in the Cell at (x, y)?
+        """
+        i = self._index(x, y)
+        counts = self._flat_counts.get(cell_type)
+        if counts is not None:
+            return counts[i]
+        return 1 if self._flat[i] & cell_type.bit else 0
+
+    def type_mask(self, cell_type: CELL_TYPES) -> np.ndarray:
+        """
+        Boolean rows x cols array, True wherever the type is present.
+        """
+        return (self.grid & cell_type.bit) != 0
+
+    def cells_with_type(self, cell_type: CELL_TYPES) -> list[tuple[int, int]]:
+        """
+        All (x, y) coordinates holding the given type, in row-major order.
+        """
+        return [(int(x), int(y)) for x, y in np.argwhere(self.type_mask(cell_type))]
 
     def attempt_to_place_building(self, top_left: tuple[int, int], building: Building) -> bool:
         """
@@ -74,47 +224,31 @@ class Map:
         if x0 < 0 or y0 < 0 or x0 + height > self.rows or y0 + width > self.cols:
             return False
 
-        # Conflict check within the bounding box
-        for dx in range(height):
-            for dy in range(width):
-                x, y = x0 + dx, y0 + dy
-                cell = self.get_cell(x, y)
-                if cell.has_type(CELL_TYPES.BUILDING) or cell.has_type(CELL_TYPES.WALKWAY):
-                    return False
-
-
-        # Actually place the building shape using its specific cells
-        for dr, dc in building.cells:
-            x, y = x0 + dr, y0 + dc
-            if 0 <= x < self.rows and 0 <= y < self.cols:
-                self.remove_cell_type(x, y, CELL_TYPES.GROUND)
-                self.add_cell_type(x, y, CELL_TYPES.BUILDING)
-
-        # If this building has an inner hole, compute its global coords:
-        if hasattr(building, 'inner_cells'):
-            inner_global = {(x0 + dr, y0 + dc) for dr, dc in building.inner_cells}
-        else:
-            inner_global = set()
+        # Conflict check within the bounding box (O(1) summed-area lookup)
+        if not self.occupancy.is_free(x0, y0, height, width):
+            return False
 
-        # now place sidewalks AND collect their coords
-        sidewalk_cells = []
-        for dr, dc in building.cells:
-            for adj in [(-1,0), (1,0), (0,-1), (0,1)]:
-                ax, ay = x0 + dr + adj[0], y0 + dc + adj[1]
+        ground, building_bit, walkway = CELL_TYPES.GROUND.bit, CELL_TYPES.BUILDING.bit, CELL_TYPES.WALKWAY.bit
 
-                 # skip out‐of‐bounds or interior‐hole coords
-                if not (0 <= ax < self.rows and 0 <= ay < self.cols):
-                    continue
-                if (ax, ay) in inner_global:
-                    continue
+        # Actually place the building shape by stamping its footprint mask
+        region = self.grid[x0:x0 + height, y0:y0 + width]
+        _swap_bits(region, building.mask, ground, building_bit)
 
-                if 0 <= ax < self.rows and 0 <= ay < self.cols:
-                    cell = self.get_cell(ax, ay)
-                    if cell.has_type(CELL_TYPES.GROUND):
-                        self.remove_cell_type(ax, ay, CELL_TYPES.GROUND)
-                        self.add_cell_type   (ax, ay, CELL_TYPES.WALKWAY)
-                        sidewalk_cells.append((ax, ay))
+        # now place sidewalks on the halo (which already excludes any inner
+        # hole), clipped to the map, wherever the ground is still free
+        hx0, hy0 = max(x0 - 1, 0), max(y0 - 1, 0)
+        hx1, hy1 = min(x0 + height + 1, self.rows), min(y0 + width + 1, self.cols)
+        halo = building.halo_mask[hx0 - (x0 - 1):hx1 - (x0 - 1), hy0 - (y0 - 1):hy1 - (y0 - 1)]
+        around = self.grid[hx0:hx1, hy0:hy1]
+        new_walk = halo & ((around & ground) != 0)
+        _swap_bits(around, new_walk, ground, walkway)
+        self.occupancy.invalidate(hx0, hy0)
+        self._structure_changed(hx0, hy0, hx1, hy1)
 
+        # collect their coords and hook them into the connectivity index
+        sidewalk_cells = [(hx0 + int(r), hy0 + int(c)) for r, c in np.argwhere(new_walk)]
+        for ax, ay in sidewalk_cells:
+            self._join_walkway(ax, ay)
 
         building.sidewalk_cells = sidewalk_cells
 
@@ -126,75 +260,87 @@ class Map:
 
         return True
 
+    def lay_walkway(self, x: int, y: int):
+        """
+        Turn the GROUND cell at (x, y) into WALKWAY and merge it into the
+        walkway connectivity index.
+        """
+        self.remove_cell_type(x, y, CELL_TYPES.GROUND)
+        self.add_cell_type(x, y, CELL_TYPES.WALKWAY)
+        self._join_walkway(x, y)
+
+    def _join_walkway(self, x: int, y: int):
+        """
+        Merge the (already WALKWAY) cell at (x, y) with its walkway neighbours.
+        """
+        if self._walkway_uf is not None:
+            i = x * self.cols + y
+            nbrs = []
+            if x > 0:             nbrs.append(i - self.cols)
+            if x < self.rows - 1: nbrs.append(i + self.cols)
+            if y > 0:             nbrs.append(i - 1)
+            if y < self.cols - 1: nbrs.append(i + 1)
+            self._walkway_uf.add(i, nbrs)
+
+    def _walkway_index(self) -> WalkwayUnionFind:
+        if self._walkway_uf is None:
+            self._walkway_uf = WalkwayUnionFind.from_mask(self.type_mask(CELL_TYPES.WALKWAY))
+        return self._walkway_uf
+
+    def walkway_components(self) -> list[list[tuple[int, int]]]:
+        """
+        Connected groups of WALKWAY cells (4-connectivity), largest first.
+        """
+        comps = self._walkway_index().components().values()
+        return [
+            [divmod(i, self.cols) for i in members]
+            for members in sorted(comps, key=len, reverse=True)
+        ]
+
     def connect_sidewalks(self):
         """
         Ensures all WALKWAY cells form a single connected network by linking
         disjoint walkway groups with L-shaped connectors.
+
+        Components come from the incremental union-find, so only one
+        representative cell per component is touched here.
         """
-        # collect all walkway positions
-        walk_cells = {
-            (r, c)
-            for r in range(self.rows)
-            for c in range(self.cols)
-            if self.get_cell(r, c).has_type(CELL_TYPES.WALKWAY)
-        }
-        if not walk_cells:
+        uf = self._walkway_index()
+        if not len(uf):
             return
 
-        # neighbors for 4-connectivity
-        def neighbors(pos):
-            r, c = pos
-            for dr, dc in ((1,0),(-1,0),(0,1),(0,-1)):
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    yield (nr, nc)
-
-        # flood-fill to find connected components
-        comps = []
-        seen = set()
-        for start in walk_cells:
-            if start in seen:
-                continue
-            comp = {start}
-            stack = [start]
-            seen.add(start)
-            while stack:
-                cell = stack.pop()
-                for nb in neighbors(cell):
-                    if nb in walk_cells and nb not in seen:
-                        seen.add(nb)
-                        comp.add(nb)
-                        stack.append(nb)
-            comps.append(comp)
-
         # pick the component closest to the map center as the main one
+        walk = np.argwhere(self.type_mask(CELL_TYPES.WALKWAY))
         cx, cy = self.rows // 2, self.cols // 2
-        nearest = min(walk_cells, key=lambda p: abs(p[0]-cx) + abs(p[1]-cy))
-        main = next(comp for comp in comps if nearest in comp)
-
-        # connect other components back to main via random L-shaped paths
-        for comp in comps:
-            if comp is main:
-                continue
-            # choose random endpoints
-            r1, c1 = random.choice(tuple(comp))
-            r0, c0 = random.choice(tuple(main))
-
-            # horizontal segment at row=r1
-            for cc in range(min(c1, c0), max(c1, c0) + 1):
-                cell = self.get_cell(r1, cc)
-                if cell.has_type(CELL_TYPES.GROUND):
-                    self.remove_cell_type(r1, cc, CELL_TYPES.GROUND)
-                    self.add_cell_type(r1, cc, CELL_TYPES.WALKWAY)
-            # vertical segment at col=c0
-            for rr in range(min(r1, r0), max(r1, r0) + 1):
-                cell = self.get_cell(rr, c0)
-                if cell.has_type(CELL_TYPES.GROUND):
-                    self.remove_cell_type(rr, c0, CELL_TYPES.GROUND)
-                    self.add_cell_type(rr, c0, CELL_TYPES.WALKWAY)
-
-            # merge component into main
-            main |= comp
+        nx, ny = walk[np.argmin(np.abs(walk[:, 0] - cx) + np.abs(walk[:, 1] - cy))]
+        nearest = int(nx) * self.cols + int(ny)
+
+        # connect other components back to main via L-shaped paths between
+        # the component representatives. A connector can be cut where it
+        # crosses a building, so later passes retry with the L flipped.
+        for attempt in range(self.MAX_CONNECT_PASSES):
+            before = len(uf.roots())
+            for root in uf.roots():
+                main = uf.find(nearest)
+                if uf.find(root) == main:
+                    continue
+                r1, c1 = divmod(root, self.cols)
+                r0, c0 = divmod(main, self.cols)
+                if attempt % 2:
+                    (r1, c1), (r0, c0) = (r0, c0), (r1, c1)
+
+                # horizontal segment at row=r1
+                for cc in range(min(c1, c0), max(c1, c0) + 1):
+                    if self.has_type(r1, cc, CELL_TYPES.GROUND):
+                        self.lay_walkway(r1, cc)
+                # vertical segment at col=c0
+                for rr in range(min(r1, r0), max(r1, r0) + 1):
+                    if self.has_type(rr, c0, CELL_TYPES.GROUND):
+                        self.lay_walkway(rr, c0)
+
+            remaining = len(uf.roots())
+            if remaining == 1 or (attempt % 2 and remaining == before):
+                break
 
     def create_food_warehouse(self):
         """
@@ -203,13 +349,13 @@ class Map:
         if not self.buildings:
             return
         building = random.choice(self.buildings)
-        # remove the building type from the cell
-        for dr, dc in building.cells:
-            building.name = "Food Warehouse"
-            x, y = building.top_left_x + dr, building.top_left_y + dc
-            cell = self.get_cell(x, y)
-            cell.remove_type(CELL_TYPES.BUILDING)
-            cell.add_type(CELL_TYPES.RESTAURANT)
+        building.name = "Food Warehouse"
+        # swap the building type for the restaurant type across its footprint
+        x0, y0 = building.top_left_x, building.top_left_y
+        region = self.grid[x0:x0 + building.h, y0:y0 + building.w]
+        _swap_bits(region, building.mask, CELL_TYPES.BUILDING.bit, CELL_TYPES.RESTAURANT.bit)
+        self.occupancy.invalidate(x0, y0)
+        self._structure_changed(x0, y0, x0 + building.h, y0 + building.w)
 
     def add_obstacles_randomly(self) -> None:
         """
@@ -219,12 +365,7 @@ class Map:
         """
 
         # 1) gather eligible walkway coords
-        walkway_cells = []
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.get_cell(r, c)
-                if cell.has_type(CELL_TYPES.WALKWAY):
-                    walkway_cells.append((r, c))
+        walkway_cells = self.cells_with_type(CELL_TYPES.WALKWAY)
 
         if not walkway_cells:
             return
@@ -259,11 +400,11 @@ class Map:
         rows_letters = []
         max_len = 0
 
-        for row in self.grid:
+        for x in range(self.rows):
             row_repr = []
-            for cell in row:
+            for y in range(self.cols):
                 # pull initials from the enum
-                initials = ''.join(sorted(t.initial for t in cell.types))
+                initials = ''.join(sorted(t.initial for t in CELL_TYPES if self.has_type(x, y, t)))
                 row_repr.append(initials)
                 max_len = max(max_len, len(initials))
             rows_letters.append(row_repr)
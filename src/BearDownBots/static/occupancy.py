@@ -0,0 +1,60 @@
+# src/BearDownBots/static/occupancy.py
+import numpy as np
+
+
+class OccupancyIndex:
+    """
+    Summed-area table over the cells of a bitmask grid that hold any of
+    `bits` (BUILDING | WALKWAY for building placement).
+
+        sat[i, j] = number of occupied cells in grid[:i, :j]
+
+    so "is this rectangle free?" is four lookups. Changes only mark a dirty
+    corner; the table is rebuilt from that corner to the bottom-right the
+    next time it is queried, so several placements share one rebuild.
+    """
+
+    def __init__(self, grid: np.ndarray, bits: int):
+        self.grid = grid
+        self.bits = bits
+        rows, cols = grid.shape
+        self.sat = np.zeros((rows + 1, cols + 1), dtype=np.int32)
+        self._dirty: tuple[int, int] | None = (0, 0)
+
+    def invalidate(self, x: int, y: int):
+        """
+        Cell (x, y) may have changed occupancy.
+        """
+        if self._dirty is None:
+            self._dirty = (x, y)
+        else:
+            self._dirty = (min(self._dirty[0], x), min(self._dirty[1], y))
+
+    def _refresh(self):
+        if self._dirty is None:
+            return
+        r0, c0 = self._dirty
+        self._dirty = None
+
+        sat = self.sat
+        occ = (self.grid[r0:, c0:] & self.bits) != 0
+        sub = occ.cumsum(axis=0, dtype=np.int32)
+        sub.cumsum(axis=1, out=sub)
+        # everything above row r0 or left of column c0 is still valid
+        sub += sat[r0 + 1:, c0:c0 + 1]
+        sub += sat[r0:r0 + 1, c0 + 1:]
+        sub -= sat[r0, c0]
+        sat[r0 + 1:, c0 + 1:] = sub
+
+    def count(self, x0: int, y0: int, height: int, width: int) -> int:
+        """
+        Number of occupied cells in the height x width rectangle at (x0, y0).
+        The rectangle must lie inside the grid.
+        """
+        self._refresh()
+        sat = self.sat
+        x1, y1 = x0 + height, y0 + width
+        return int(sat[x1, y1] - sat[x0, y1] - sat[x1, y0] + sat[x0, y0])
+
+    def is_free(self, x0: int, y0: int, height: int, width: int) -> bool:
+        return self.count(x0, y0, height, width) == 0
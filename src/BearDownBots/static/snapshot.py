@@ -0,0 +1,220 @@
+# src/BearDownBots/static/snapshot.py
+"""
+On-disk campus snapshots.
+
+A generated campus is stored under build/campus_cache/<key>/ as
+
+    grid.npy        the Map's uint8 bitmask grid (memory-mapped on load)
+    buildings.npz   per-building footprint / interior masks and sidewalk cells
+    manifest.json   generation parameters + building names, classes,
+                    top-left corners and dropoff points
+
+The key is a hash of the seed and every Config.Environment value that
+influences generation, so changing any of them produces a new campus.
+
+Command line:
+    campus_cache build --seed 7 [--rows 2000 --cols 2000]
+    campus_cache list
+"""
+import os
+import sys
+import json
+import uuid
+import shutil
+import hashlib
+import argparse
+import datetime
+
+import numpy as np
+
+from BearDownBots.config import Config
+from BearDownBots.static.map import Map
+from BearDownBots.static.buildings import Building
+
+SNAPSHOT_FORMAT = 2
+
+# Config.Environment values that change what create_campus_environment builds
+GENERATION_PARAMS = (
+    "MAP_ROWS",
+    "MAP_COLS",
+    "MAX_BUILDING_ATTEMPTS",
+    "MIN_BUILDING_CELLS",
+    "MAX_BUILDING_CELLS",
+    "OBSTACLES_AS_PERCENTAGE_OF_WALKWAYS",
+)
+
+
+def cache_root() -> str:
+    """build/campus_cache/ next to the log files written by setup_logging()."""
+    project_dir = os.path.dirname(Config.get_asset_dir())
+    return os.path.join(project_dir, "build", "campus_cache")
+
+
+def generation_params(seed: int) -> dict:
+    params = {name: getattr(Config.Environment, name) for name in GENERATION_PARAMS}
+    params["SEED"] = seed
+    params["FORMAT"] = SNAPSHOT_FORMAT
+    return params
+
+
+def campus_key(seed: int) -> str:
+    """Stable key for the campus generated from `seed` with the current Config."""
+    blob = json.dumps(generation_params(seed), sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def _building_classes() -> dict[str, type]:
+    return {cls.__name__: cls for cls in Building.__subclasses__()}
+
+
+def save_campus(campus_map: Map, seed: int) -> str:
+    """
+    Write `campus_map` to the cache and return its directory.
+    Must be called before any robots are placed on the map.
+    """
+    key = campus_key(seed)
+    final_dir = os.path.join(cache_root(), key)
+    tmp_dir = final_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    np.save(os.path.join(tmp_dir, "grid.npy"), np.asarray(campus_map.grid))
+
+    arrays = {}
+    buildings = []
+    for i, bld in enumerate(campus_map.buildings):
+        arrays[f"mask_{i}"] = bld.mask
+        arrays[f"interior_{i}"] = bld.interior_mask
+        arrays[f"sidewalk_{i}"] = np.asarray(bld.sidewalk_cells, dtype=np.int32).reshape(-1, 2)
+        entry = {
+            "class": type(bld).__name__,
+            "id": str(bld.id),
+            "name": bld.name,
+            "top_left": [bld.top_left_x, bld.top_left_y],
+            "dropoff_point": list(bld.dropoff_point) if bld.dropoff_point else None,
+        }
+        if hasattr(bld, "thickness"):
+            entry["thickness"] = bld.thickness
+        buildings.append(entry)
+    np.savez_compressed(os.path.join(tmp_dir, "buildings.npz"), **arrays)
+
+    manifest = {
+        "key": key,
+        "params": generation_params(seed),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "buildings": buildings,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+
+    # swap in atomically so a crashed save never leaves a half-written campus
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    return final_dir
+
+
+def load_campus(seed: int) -> Map | None:
+    """
+    Return the cached campus for `seed` and the current Config, or None.
+    The grid is memory-mapped copy-on-write, so robots can still mark
+    cells without touching the file.
+    """
+    snap_dir = os.path.join(cache_root(), campus_key(seed))
+    manifest_path = os.path.join(snap_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest["params"] != generation_params(seed):
+        return None
+
+    grid = np.load(os.path.join(snap_dir, "grid.npy"), mmap_mode="c")
+    rows, cols = grid.shape
+    campus_map = Map(rows, cols, grid=grid)
+
+    classes = _building_classes()
+    with np.load(os.path.join(snap_dir, "buildings.npz")) as arrays:
+        for i, entry in enumerate(manifest["buildings"]):
+            attrs = {
+                "id": uuid.UUID(entry["id"]),
+                "name": entry["name"],
+                "top_left_x": entry["top_left"][0],
+                "top_left_y": entry["top_left"][1],
+                "sidewalk_cells": [tuple(c) for c in arrays[f"sidewalk_{i}"].tolist()],
+                "dropoff_point": tuple(entry["dropoff_point"]) if entry["dropoff_point"] else None,
+            }
+            if "thickness" in entry:
+                attrs["thickness"] = entry["thickness"]
+            bld = classes[entry["class"]].restore(arrays[f"mask_{i}"], arrays[f"interior_{i}"], **attrs)
+            campus_map.buildings.append(bld)
+
+    return campus_map
+
+
+def list_campuses() -> list[dict]:
+    """Manifests (without the building list) of every cached campus."""
+    root = cache_root()
+    if not os.path.isdir(root):
+        return []
+    found = []
+    for key in sorted(os.listdir(root)):
+        manifest_path = os.path.join(root, key, "manifest.json")
+        if not os.path.exists(manifest_path):
+            continue
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        size = sum(
+            os.path.getsize(os.path.join(root, key, name))
+            for name in os.listdir(os.path.join(root, key))
+        )
+        manifest["num_buildings"] = len(manifest.pop("buildings"))
+        manifest["bytes"] = size
+        found.append(manifest)
+    return found
+
+
+def main(argv: list[str] | None = None):
+    """Entry point for the `campus_cache` console script."""
+    parser = argparse.ArgumentParser(prog="campus_cache", description="Pre-build and list cached campuses.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="generate and cache a campus")
+    build.add_argument("--seed", type=int, required=True)
+    build.add_argument("--rows", type=int, default=Config.Environment.MAP_ROWS)
+    build.add_argument("--cols", type=int, default=Config.Environment.MAP_COLS)
+    build.add_argument("--force", action="store_true", help="rebuild even if already cached")
+
+    sub.add_parser("list", help="show cached campuses")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        # imported here to avoid a circular import (static/__init__ uses this module)
+        from BearDownBots.static import create_campus_environment
+
+        Config.Environment.MAP_ROWS = args.rows
+        Config.Environment.MAP_COLS = args.cols
+        Config.Environment.SEED = args.seed
+        Config.Environment.CAMPUS_CACHE = True
+        if args.force:
+            shutil.rmtree(os.path.join(cache_root(), campus_key(args.seed)), ignore_errors=True)
+
+        campus_map = create_campus_environment(progress_window=None)
+        print(f"Cached campus {campus_key(args.seed)}: {campus_map.rows}x{campus_map.cols}, "
+              f"{len(campus_map.buildings)} buildings")
+
+    elif args.command == "list":
+        campuses = list_campuses()
+        if not campuses:
+            print(f"No cached campuses in {cache_root()}")
+            return
+        print(f"{'key':<17} {'seed':>6} {'size':>11} {'bldgs':>6} {'MB':>8}  created")
+        for m in campuses:
+            p = m["params"]
+            print(f"{m['key']:<17} {p['SEED']:>6} {p['MAP_ROWS']:>5}x{p['MAP_COLS']:<5} "
+                  f"{m['num_buildings']:>6} {m['bytes'] / 1e6:>8.1f}  {m['created']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+# src/BearDownBots/sweep.py
+"""
+Parameter sweeps: run the simulation headless once per combination of
+Config overrides and seed, in parallel, one CSV row of metrics per run.
+
+    sweep --set Simulation.ORDER_ASSIGNMENT_STRATEGY=oldest,proximity,between \
+          --set Simulation.PATHFINDING_ALGORITHM=astar,jps \
+          --set Simulation.NUM_ROBOTS=3,6 --seeds 1 2 3 --hours 2
+
+Each run is BearDownBotsApp.run_headless with a fixed-step clock, so a row
+depends only on its overrides and seed, not on how busy the machine was.
+Runs go to a process pool with one worker per core by default, each in a
+fresh worker process so no run sees another's Config or leftover state,
+and rows are written as runs finish, so a sweep that is stopped early
+keeps what it has. Seeded campuses are built (and cached) once up front instead of
+by every worker that needs them.
+"""
+import os
+import ast
+import csv
+import sys
+import random
+import argparse
+import datetime
+import itertools
+import contextlib
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+from BearDownBots.app import BearDownBotsApp
+from BearDownBots.config import Config
+from BearDownBots.static import create_campus_environment
+
+# metric columns, after one column per override and the seed
+METRICS = ("delivered", "mean_latency_s", "p95_latency_s", "pending_orders", "ticks",
+           "sim_seconds", "wall_seconds", "ticks_per_sec", "searches", "pathfinding_seconds")
+
+
+def parse_override(text: str) -> tuple[str, list]:
+    """'Section.NAME=v1,v2' -> ('Section.NAME', [v1, v2]), values as Python literals where they parse."""
+    key, sep, values = text.partition("=")
+    section, _, name = key.partition(".")
+    if not sep or not hasattr(getattr(Config, section, None), name):
+        raise ValueError(f"not a Config setting: {key!r} (expected Section.NAME=v1,v2,...)")
+
+    def literal(v: str):
+        try:
+            return ast.literal_eval(v)
+        except (ValueError, SyntaxError):
+            return v   # bare strings: astar, between, ...
+    return key, [literal(v.strip()) for v in values.split(",")]
+
+
+def apply_overrides(overrides: dict):
+    for key, value in overrides.items():
+        section, name = key.split(".")
+        setattr(getattr(Config, section), name, value)
+
+
+def derive_settings(overrides: dict):
+    """
+    Recompute the settings Config's class body derives from others, as it
+    would have with the overridden values, unless they are swept themselves.
+    """
+    sim = Config.Simulation
+    if "Simulation.NEW_ORDER_INTERVAL" not in overrides:
+        sim.NEW_ORDER_INTERVAL = sim.NEW_ORDER_INTERVAL_SECONDS / sim.TIME_SCALE
+    if "Simulation.ROBOT_SPEED" not in overrides:
+        sim.ROBOT_SPEED = sim.UPDATES_PER_SEC
+    if "Simulation.FIXED_STEP" not in overrides:
+        sim.FIXED_STEP = 1 / sim.UPDATES_PER_SEC
+
+
+def snapshot_config() -> dict:
+    """Every Config setting, by section, for restore_config()."""
+    sections = (Config, Config.GUI, Config.Environment, Config.Simulation)
+    return {section: {name: value for name, value in vars(section).items()
+                      if name.isupper() and not isinstance(value, type)}
+            for section in sections}
+
+
+def restore_config(saved: dict):
+    for section, values in saved.items():
+        for name, value in values.items():
+            setattr(section, name, value)
+
+
+def run_one(overrides: dict, seed: int, hours: float) -> dict:
+    """One headless run in this process; returns its CSV row and leaves Config as it was."""
+    saved = snapshot_config()
+    try:
+        Config.HEADLESS_FLAG = True
+        Config.Simulation.PATH_STATS_DUMP = False
+        Config.Simulation.BATCH_PLANNING_WORKERS = 0   # the sweep already has a process per core
+        apply_overrides(overrides)
+        derive_settings(overrides)
+        Config.Environment.SEED = seed
+        random.seed(seed)
+
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            app = BearDownBotsApp(headless_hours=hours)
+        return {**overrides, "seed": seed, **app.headless_result}
+    finally:
+        restore_config(saved)
+
+
+class _PerRunPool:
+    """
+    Python 3.10 stand-in for ProcessPoolExecutor(max_tasks_per_child=1):
+    a multiprocessing pool with a fresh worker per task, handing out
+    concurrent.futures Futures so as_completed() works on it the same way.
+    """
+
+    def __init__(self, workers: int):
+        self._pool = multiprocessing.get_context("spawn").Pool(workers, maxtasksperchild=1)
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        self._pool.apply_async(fn, args, callback=future.set_result, error_callback=future.set_exception)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.close()
+        self._pool.join()
+
+
+def per_run_pool(workers: int):
+    """A process pool that starts a new worker for every task it is given."""
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1)
+    return _PerRunPool(workers)
+
+
+def prebuild_campuses(runs: list[tuple[dict, int]]):
+    """Generate and cache each distinct seeded campus once, so workers only load them."""
+    if not Config.Environment.CAMPUS_CACHE:
+        return
+    campuses = {(tuple((k, v) for k, v in overrides.items() if k.startswith("Environment.")), seed)
+                for overrides, seed in runs}
+    names = {k.split(".")[1] for env, _ in campuses for k, _ in env} | {"SEED"}
+    saved = {name: getattr(Config.Environment, name) for name in names}
+    try:
+        for env, seed in campuses:
+            apply_overrides(dict(env))
+            Config.Environment.SEED = seed
+            with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                create_campus_environment(progress_window=None)
+    finally:
+        for name, value in saved.items():
+            setattr(Config.Environment, name, value)
+
+
+def main(argv: list[str] | None = None):
+    """Entry point for the `sweep` console script."""
+    parser = argparse.ArgumentParser(prog="sweep",
+                                     description="Run the simulation headless over a grid of Config overrides.")
+    parser.add_argument("--set", dest="grid", action="append", default=[], metavar="SECTION.NAME=V1,V2,...",
+                        help="a Config setting and the values to sweep it over (repeatable)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="campus and order seeds (default 0)")
+    parser.add_argument("--hours", type=float, default=1.0, help="sim-hours per run (default 1)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parallel runs (default: one per core)")
+    parser.add_argument("--out", default=None, help="CSV to write (default build/sweep_<time>.csv)")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = dict(parse_override(text) for text in args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+    keys = list(grid)
+    runs = [(dict(zip(keys, values)), seed)
+            for values in itertools.product(*grid.values()) for seed in args.seeds]
+
+    out = args.out
+    if out is None:
+        build_dir = os.path.join(os.path.dirname(Config.get_asset_dir()), "build")
+        os.makedirs(build_dir, exist_ok=True)
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        out = os.path.join(build_dir, f"sweep_{ts}.csv")
+
+    print(f"Sweeping {len(runs)} runs of {args.hours} sim-hours on {args.workers} workers -> {out}")
+    prebuild_campuses(runs)
+
+    # a worker per run: nothing one run leaves behind (module state, caches,
+    # memory) carries over into the next
+    with open(out, "w", newline="") as f, per_run_pool(args.workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=[*keys, "seed", *METRICS], extrasaction="ignore")
+        writer.writeheader()
+        futures = {pool.submit(run_one, overrides, seed, args.hours): (overrides, seed)
+                   for overrides, seed in runs}
+        for k, future in enumerate(as_completed(futures), 1):
+            overrides, seed = futures[future]
+            label = " ".join(f"{key.split('.')[1]}={value}" for key, value in overrides.items())
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"[{k}/{len(runs)}] {label} seed={seed} failed: {e!r}")
+                continue
+            writer.writerow(row)
+            f.flush()
+            print(f"[{k}/{len(runs)}] {label} seed={seed}: {row['delivered']} delivered, "
+                  f"{row['ticks_per_sec']:.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+SimulationClock in fixed-step mode.
+"""
+import time
+
+from BearDownBots.config import Config
+from BearDownBots.clock import SimulationClock
+
+
+def test_fixed_step_ignores_the_wall_clock(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "FIXED_STEP", 0.25)
+    clock = SimulationClock()
+    time.sleep(0.01)
+    assert [clock.tick() for _ in range(4)] == [0.25] * 4
+    assert clock.now() == 1.0
@@ -0,0 +1,39 @@
+"""
+Run-length encoded paths and their cursor.
+"""
+
+import pytest
+
+from BearDownBots.static.cell import Position
+from BearDownBots.dynamic.compact_path import CompactPath
+
+
+def test_walking_the_cursor_visits_every_cell():
+    cols = 10
+    cells = [(2, 2), (2, 3), (2, 4), (2, 4), (3, 4), (4, 4), (4, 3)]
+    path = CompactPath.from_indices([x * cols + y for x, y in cells], cols)
+    assert len(path.runs) == 4   # right, wait, down, left
+    assert len(path) == 6 and path.end == Position(4, 3)
+    assert list(path) == [Position(*c) for c in cells[1:]]
+
+    walked = []
+    while path:
+        walked.append(path.step())
+    assert walked == [Position(*c) for c in cells[1:]]
+    assert path.step() is None and path.position == Position(4, 3)
+
+
+def test_corners_follow_the_cursor():
+    path = CompactPath.from_points([Position(0, y) for y in range(5)] + [Position(x, 4) for x in range(1, 4)])
+    assert path.corners() == [(0, 0), (0, 4), (3, 4)]
+    path.step()
+    path.step()
+    assert path.corners() == [(0, 2), (0, 4), (3, 4)]
+    assert list(path) == [Position(0, 3), Position(0, 4), Position(1, 4), Position(2, 4), Position(3, 4)]
+
+
+def test_empty_and_broken_paths():
+    assert not CompactPath() and not CompactPath.from_points([Position(1, 1)])
+    assert CompactPath().corners() == [(0, 0)]
+    with pytest.raises(ValueError):
+        CompactPath.from_points([Position(0, 0), Position(0, 2)])
@@ -0,0 +1,67 @@
+"""
+Distance fields against a plain BFS on the hand-made test map.
+"""
+
+from BearDownBots.static.cell import CELL_TYPES
+from BearDownBots.dynamic.pathfinding import PathKernel
+from BearDownBots.dynamic.distance_field import DistanceFields
+
+from test_pathfinding import build_map, bfs_length, walkway_indices, assert_valid
+
+
+def test_field_matches_bfs_and_descends_to_source():
+    m = build_map()
+    m.add_cell_type(0, 0, CELL_TYPES.RESTUARANT_PICKUP)
+    kernel = PathKernel(m.grid)
+    field = DistanceFields(m, capacity=4).to_pickup()
+
+    for i in walkway_indices(m):
+        expected = bfs_length(kernel, i, 0, avoid_robots=False)
+        assert field.distance(i) == expected
+        path = field.descend(i)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) - 1 == expected
+            assert_valid(kernel, path, i, 0, avoid_robots=False)
+
+
+def test_dropoff_fields_are_lru_bounded_and_follow_map_version():
+    m = build_map()
+    m.add_cell_type(0, 0, CELL_TYPES.RESTUARANT_PICKUP)
+    fields = DistanceFields(m, capacity=2)
+
+    assert fields.distance((0, 0), (0, 9)) == 9
+    assert fields.distance((5, 0), (0, 9)) == 14
+    fields.field((5, 5))
+    fields.field((2, 8))
+    assert len(fields) == 3          # pickup + two dropoff fields
+
+    # blocking the left column makes (5, 0) go round the long way
+    m.add_cell_type(2, 0, CELL_TYPES.OBSTACLE)
+    detour = fields.distance((5, 0), (0, 0))
+    assert detour > 5
+    assert detour == bfs_length(PathKernel(m.grid), 5 * m.cols, 0, avoid_robots=False)
+
+
+def test_alt_heuristic_keeps_astar_optimal():
+    from BearDownBots.dynamic.landmarks import Landmarks
+
+    m = build_map()
+    m.add_cell_type(5, 9, CELL_TYPES.RESTUARANT_PICKUP)
+    kernel = PathKernel(m.grid)
+    landmarks = Landmarks(m, count=4)
+    landmarks.build()
+    assert landmarks.sources == [(5, 9)]      # no buildings, so no dropoff landmarks
+
+    cells = walkway_indices(m)
+    for start in cells:
+        for goal in cells:
+            if start == goal:
+                continue
+            expected = kernel.astar(start, goal)
+            path = kernel.astar(start, goal, h=landmarks.heuristic(goal))
+            assert (path is None) == (expected is None)
+            if path is not None:
+                assert len(path) == len(expected)
+                assert landmarks.may_connect(start, goal)
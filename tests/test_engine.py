@@ -0,0 +1,64 @@
+"""
+The discrete-event engine: jumps to the next event and lands on it exactly.
+"""
+
+from BearDownBots.config import Config
+from BearDownBots.clock import SimulationClock
+from BearDownBots.engine import EventEngine
+from BearDownBots.static.map import Map
+from BearDownBots.static.cell import CELL_TYPES, Position
+from BearDownBots.dynamic.randOrders import Order
+from BearDownBots.dynamic.robot import Robot
+from BearDownBots.dynamic.rand_order_scheduler import OrderPlacer
+
+
+class Dorm:
+    name = "Dorm"
+    dropoff_point = (0, 11)
+
+    def place_order(self):
+        return Order(self)
+
+
+def test_engine_steps_from_event_to_event(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "NEW_ORDER_INTERVAL", 100.0)
+    monkeypatch.setattr(Config.Simulation, "ROBOT_SPEED", 4)
+    monkeypatch.setattr(Config.Simulation, "PATHFINDING_ALGORITHM", "astar")
+    monkeypatch.setattr(Config.Simulation, "USE_DISTANCE_FIELDS", False)
+    m = Map(1, 12)
+    for y in range(12):
+        m.lay_walkway(0, y)
+    m.add_cell_type(0, 0, CELL_TYPES.RESTUARANT_PICKUP)
+    clock = SimulationClock()
+    robot = Robot(0, m)
+    engine = EventEngine(clock, OrderPlacer([Dorm()], clock), [robot], m)
+
+    # nothing happens until the first order: a single step gets there
+    assert engine.step() == 100.0
+    # it is ready after PREP_SECONDS and loaded straight away
+    assert engine.step() == 115.0
+    assert robot.state == "delivering"
+    # 11 cells at 4 cells a second, then the same back
+    assert engine.step() == 117.75
+    assert robot.position == Position(0, 11) and robot.state == "returning"
+    assert engine.step() == 120.5
+    assert robot.position == Position(0, 0) and robot.state == "idle"
+
+    # a quiet stretch is one step per event, not one per tick
+    # (orders at 200 ... 900, four events each, then the stop at 1000)
+    assert engine.run_until(1000.0) == 4 * 8 + 1
+    assert clock.sim_time == 1000.0
+
+
+def test_engine_places_orders_at_intervals_floats_cannot_represent(monkeypatch):
+    # 100/3 sums to just short of each due time: the run must still go on
+    monkeypatch.setattr(Config.Simulation, "NEW_ORDER_INTERVAL", 100 / 3)
+    m = Map(1, 12)
+    clock = SimulationClock()
+    placer = OrderPlacer([Dorm()], clock)
+    engine = EventEngine(clock, placer, [], m)
+
+    steps = engine.run_until(990.0)
+    assert clock.sim_time == 990.0
+    assert placer.pending() == 29
+    assert steps < 4 * 29 + 2
@@ -0,0 +1,95 @@
+"""
+Checks for the bitmask-backed Map and its Cell views.
+"""
+
+import pytest
+
+from BearDownBots.static.map import Map
+from BearDownBots.static.cell import CELL_TYPES, Position
+
+
+def test_new_map_is_all_ground():
+    m = Map(4, 5)
+    assert m.grid.shape == (4, 5)
+    assert m.type_mask(CELL_TYPES.GROUND).all()
+    assert not m.get_cell(3, 4).has_type(CELL_TYPES.WALKWAY)
+
+
+def test_cell_view_writes_through_to_grid():
+    m = Map(3, 3)
+    cell = m.get_cell(1, 2)
+    cell.remove_type(CELL_TYPES.GROUND)
+    cell.add_type(CELL_TYPES.WALKWAY)
+
+    assert m.has_type(1, 2, CELL_TYPES.WALKWAY)
+    assert not m.get_cell(1, 2).has_type(CELL_TYPES.GROUND)
+    assert m.cells_with_type(CELL_TYPES.WALKWAY) == [(1, 2)]
+    assert cell.position == Position(1, 2)
+
+
+def test_robot_type_stacks():
+    m = Map(2, 2)
+    m.add_cell_type(0, 0, CELL_TYPES.ROBOT)
+    m.add_cell_type(0, 0, CELL_TYPES.ROBOT)
+    assert m.count_type(0, 0, CELL_TYPES.ROBOT) == 2
+
+    m.remove_cell_type(0, 0, CELL_TYPES.ROBOT)
+    assert m.has_type(0, 0, CELL_TYPES.ROBOT)
+
+    m.remove_cell_type(0, 0, CELL_TYPES.ROBOT)
+    assert not m.has_type(0, 0, CELL_TYPES.ROBOT)
+    # removing past zero is a no-op, like the old Counter
+    m.remove_cell_type(0, 0, CELL_TYPES.ROBOT)
+    assert m.count_type(0, 0, CELL_TYPES.ROBOT) == 0
+    # only the first robot arriving and the last one leaving are logged
+    assert m.flips_since(0) == [0, 0]
+    assert m.flips_since(m.flip_mark()) == []
+
+
+def test_out_of_bounds_raises():
+    m = Map(2, 2)
+    with pytest.raises(IndexError):
+        m.get_cell(2, 0)
+
+
+def test_walkway_components_track_laid_cells():
+    m = Map(10, 10)
+    for y in range(0, 3):
+        m.lay_walkway(1, y)
+    for y in range(6, 9):
+        m.lay_walkway(8, y)
+    assert sorted(len(c) for c in m.walkway_components()) == [3, 3]
+
+    m.connect_sidewalks()
+    comps = m.walkway_components()
+    assert len(comps) == 1
+    assert set(comps[0]) == set(m.cells_with_type(CELL_TYPES.WALKWAY))
+
+
+def test_occupancy_index_follows_placements():
+    m = Map(8, 8)
+    assert m.occupancy.is_free(0, 0, 8, 8)
+
+    m.lay_walkway(2, 3)
+    m.remove_cell_type(5, 5, CELL_TYPES.GROUND)
+    m.add_cell_type(5, 5, CELL_TYPES.BUILDING)
+
+    assert m.occupancy.count(0, 0, 8, 8) == 2
+    assert m.occupancy.is_free(0, 0, 2, 8)
+    assert not m.occupancy.is_free(2, 3, 1, 1)
+    assert m.occupancy.count(3, 3, 5, 5) == 1
+
+
+def test_hollow_building_gets_no_sidewalk_inside():
+    from BearDownBots.static.buildings import HollowSquareBuilding
+
+    m = Map(20, 20)
+    bld = HollowSquareBuilding(81, 81, thickness=2)   # 9x9 with a 5x5 hole
+    assert bld.mask.sum() == 81 - 25
+    assert m.attempt_to_place_building((5, 5), bld)
+
+    # 9 cells per side of the outer ring, none from the hole
+    assert len(bld.sidewalk_cells) == 4 * 9
+    assert not any(bld.is_interior(x, y) for x, y in bld.sidewalk_cells)
+    assert m.type_mask(CELL_TYPES.BUILDING).sum() == 81 - 25
+    assert not m.attempt_to_place_building((0, 0), HollowSquareBuilding(81, 81, thickness=2))
@@ -0,0 +1,131 @@
+"""
+OrderPlacer's per-status queues and transition log.
+"""
+
+from BearDownBots.config import Config
+from BearDownBots.clock import SimulationClock
+from BearDownBots.dynamic.randOrders import Order, OrderStatus
+from BearDownBots.dynamic.rand_order_scheduler import OrderPlacer
+from BearDownBots.dynamic import distance_field
+from BearDownBots.dynamic.distance_field import DistanceFields
+
+from test_pathfinding import build_map
+
+
+class Dorm:
+    name = "Dorm"
+
+    def __init__(self, dropoff_point=(0, 0)):
+        self.dropoff_point = dropoff_point
+
+    def place_order(self):
+        return Order(self)
+
+
+class Waiting:
+    MAX_CARRY = 3
+    position = restaurant_pickup_point = (1, 1)
+
+    def __init__(self):
+        self.orders = []
+
+    def add_order(self, order):
+        self.orders.append(order)
+        return True
+
+
+def test_orders_move_through_the_status_queues(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "NEW_ORDER_INTERVAL", 1.0)
+    monkeypatch.setattr(Config.Simulation, "ORDER_ASSIGNMENT_STRATEGY", "oldest")
+    clock = SimulationClock()
+    placer = OrderPlacer([Dorm()], clock)
+    placer.MAX_PREP = 2
+    placer.PREP_SECONDS = 2
+    mark = placer.transition_mark()
+
+    clock.sim_time += 4.0
+    placer.load_order_into_robots([])   # nothing to cook yet
+    placed = []
+    for _ in range(4):
+        placed += placer.place_new_order()   # one per interval of the backlog
+    assert [t[1].status for t in placed] == [OrderStatus.PLACED] * 4
+    assert placer.transitions_since(mark) == placed
+
+    # the kitchen takes the two oldest and cooks them
+    placer.load_order_into_robots([])
+    assert list(placer.placed) == placed[2:] and [t for *_, t in sorted(placer.preparing)] == placed[:2]
+    clock.sim_time += 2.0
+    placer.load_order_into_robots([])
+    assert list(placer.ready) == placed[:2] and placer.pending() == 4
+    # the freed slots went straight to the next two
+    assert [t for *_, t in sorted(placer.preparing)] == placed[2:]
+
+    # "oldest" loads the three that have been ready longest
+    robot = Waiting()
+    clock.sim_time += 2.0
+    placer.load_order_into_robots([robot])
+    assert robot.orders == [placed[2][1], placed[1][1], placed[0][1]]
+    assert list(placer.ready) == [placed[3]] and placer.pending() == 1
+    assert placer.orders == [placed[3]]
+
+    # placed, preparing and ready for each order, then three loaded
+    log = placer.transitions_since(mark)
+    assert len(log) == 4 * 3 + 3
+    assert [t[1] for t in log[-3:]] == robot.orders
+
+
+def test_kitchen_readies_orders_at_their_ready_time(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "NEW_ORDER_INTERVAL", 1.0)
+    clock = SimulationClock()
+    placer = OrderPlacer([Dorm()], clock)
+    placer.MAX_PREP = 1
+    placer.PREP_SECONDS = 5
+    clock.sim_time += 2.0
+    first, second = placer.place_new_order() + placer.place_new_order()
+    clock.sim_time += 1.0
+    third, = placer.place_new_order()
+
+    # one slot: the first starts when the kitchen looks, the heap holds when it is ready
+    placer.load_order_into_robots([])
+    assert [(ready_at, t) for ready_at, _, t in placer.preparing] == [(8.0, first)]
+
+    # one long tick: each freed slot starts the next order when it frees up,
+    # not when the tick ends, and the queue is in order of ready time
+    clock.sim_time = 1000.0
+    placer.load_order_into_robots([])
+    assert list(placer.ready) == [first, second, third] and not placer.preparing
+
+
+def test_transitions_since_a_trimmed_mark_is_none(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "NEW_ORDER_INTERVAL", 1.0)
+    monkeypatch.setattr(OrderPlacer, "TRANSITION_LOG_LIMIT", 4)
+    clock = SimulationClock()
+    placer = OrderPlacer([Dorm()], clock)
+    for _ in range(6):
+        clock.sim_time += 1.0
+        placer.place_new_order()
+    assert placer.transitions_since(0) is None
+    assert len(placer.transitions_since(placer.transition_mark() - 2)) == 2
+
+
+def test_proximity_builds_one_field_per_assignment(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "ORDER_ASSIGNMENT_STRATEGY", "proximity")
+    builds = []
+
+    class CountedField(distance_field.DistanceField):
+        def __init__(self, grid, source):
+            builds.append(source)
+            super().__init__(grid, source)
+    monkeypatch.setattr(distance_field, "DistanceField", CountedField)
+
+    m = build_map()
+    placer = OrderPlacer([], SimulationClock(), DistanceFields(m, capacity=16))
+    # ten ready orders, each for a different dropoff along the top row
+    tickets = [(building, Order(building)) for building in (Dorm((0, y)) for y in range(10))]
+    placer.ready.extend(tickets)
+
+    robot = Waiting()
+    placer.load_order_into_robots([robot])
+    # every candidate is measured from the oldest order's dropoff, in its field
+    assert builds == [0]
+    assert robot.orders == [tickets[0][1], tickets[1][1], tickets[2][1]]
@@ -0,0 +1,437 @@
+"""
+Path searches over small hand-made walkway maps.
+"""
+
+import gc
+import weakref
+from collections import deque
+
+import pytest
+
+from BearDownBots.static.map import Map
+from BearDownBots.static.cell import CELL_TYPES
+from BearDownBots.dynamic.pathfinding import PathKernel
+
+# '.' walkway, '#' ground, 'o' obstacle, 'r' another robot
+LAYOUT = [
+    "..........",
+    ".##.####..",
+    ".#..#..#..",
+    ".#o.#..r..",
+    ".####.##..",
+    "......#...",
+]
+
+
+def build_map(layout=LAYOUT) -> Map:
+    m = Map(len(layout), len(layout[0]))
+    for x, row in enumerate(layout):
+        for y, ch in enumerate(row):
+            if ch != "#":
+                m.lay_walkway(x, y)
+            if ch == "o":
+                m.add_cell_type(x, y, CELL_TYPES.OBSTACLE)
+            if ch == "r":
+                m.add_cell_type(x, y, CELL_TYPES.ROBOT)
+    return m
+
+
+def bfs_length(kernel: PathKernel, start: int, goal: int, avoid_robots=True):
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        cur = queue.popleft()
+        if cur == goal:
+            return dist[cur]
+        for nb in kernel.neighbours(cur):
+            if nb not in dist and kernel.is_walkable(nb, avoid_robots):
+                dist[nb] = dist[cur] + 1
+                queue.append(nb)
+    return None
+
+
+def assert_valid(kernel: PathKernel, path, start, goal, avoid_robots=True):
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert b in kernel.neighbours(a)
+        assert kernel.is_walkable(b, avoid_robots)
+
+
+def walkway_indices(m: Map):
+    return [x * m.cols + y for x, y in m.cells_with_type(CELL_TYPES.WALKWAY)
+            if not m.has_type(x, y, CELL_TYPES.OBSTACLE) and not m.has_type(x, y, CELL_TYPES.ROBOT)]
+
+
+def test_astar_is_optimal_and_avoids_robots():
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    cells = walkway_indices(m)
+    for start in cells:
+        for goal in cells:
+            if start == goal:
+                continue
+            path = kernel.astar(start, goal)
+            expected = bfs_length(kernel, start, goal)
+            if expected is None:
+                assert path is None
+            else:
+                assert_valid(kernel, path, start, goal)
+                assert len(path) - 1 == expected
+
+
+def test_jps_and_bidirectional_match_astar_lengths():
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    cells = walkway_indices(m)
+    for search in (kernel.jps, kernel.bidirectional):
+        for start in cells:
+            for goal in cells:
+                if start == goal:
+                    continue
+                path = search(start, goal)
+                expected = kernel.astar(start, goal)
+                if expected is None:
+                    assert path is None
+                else:
+                    assert_valid(kernel, path, start, goal)
+                    assert len(path) == len(expected)
+
+
+def test_bidirectional_leaves_from_an_occupied_start():
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    m.add_cell_type(5, 0, CELL_TYPES.ROBOT)   # the searching robot itself
+    path = kernel.bidirectional(5 * m.cols, 9)
+    assert len(path) == len(kernel.astar(5 * m.cols, 9))
+
+
+def test_greedy_and_dfs_return_valid_paths():
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    cells = walkway_indices(m)
+    for search in (kernel.greedy, kernel.dfs):
+        for goal in cells[1:]:
+            path = search(cells[0], goal)
+            assert path is not None
+            assert_valid(kernel, path, cells[0], goal, avoid_robots=False)
+
+
+def test_shorten_removes_dfs_detours():
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    cells = walkway_indices(m)
+    for s in cells[::3]:
+        for g in cells[::4]:
+            if s == g:
+                continue
+            for method in ("dfs", "greedy"):
+                raw = getattr(kernel, method)(s, g)
+                short = kernel.shorten(list(raw))
+                assert_valid(kernel, short, s, g, avoid_robots=False)
+                assert bfs_length(kernel, s, g, avoid_robots=False) <= len(short) - 1 <= len(raw) - 1
+
+    # a snake through an open field straightens out completely
+    m = build_map(["........"] * 6)
+    kernel = PathKernel(m.grid)
+    raw = kernel.dfs(0, 47)
+    assert len(raw) - 1 > 12
+    assert len(kernel.shorten(raw)) - 1 == 12
+
+
+def test_unreachable_goal_returns_none():
+    m = build_map([".#.", ".#.", ".#."])
+    kernel = PathKernel(m.grid)
+    assert kernel.astar(0, 2) is None
+    assert kernel.dfs(0, 2) is None
+    assert kernel.jps(0, 2) is None
+    assert kernel.bidirectional(0, 2) is None
+
+
+def test_path_cache_lru_version_and_robot_checks():
+    from BearDownBots.dynamic.path_cache import PathCache
+
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    cache = PathCache(m, capacity=2)
+    p1 = kernel.astar(0, 9)
+    p2 = kernel.astar(0, 50)
+    cache.put(0, 9, "astar", p1)
+    cache.put(0, 50, "astar", p2)
+    assert cache.get(0, 9, "astar") == p1          # 0->9 now most recent
+    cache.put(9, 0, "astar", p1[::-1])
+    assert cache.evictions == 1
+    assert cache.get(0, 50, "astar") is None       # least recently used went
+
+    # a robot on the route rejects the hit without touching other entries
+    x, y = divmod(p1[3], m.cols)
+    m.add_cell_type(x, y, CELL_TYPES.ROBOT)
+    assert cache.get(0, 9, "astar") is None
+    assert cache.blocked == 1
+    m.remove_cell_type(x, y, CELL_TYPES.ROBOT)
+    assert cache.get(9, 0, "astar") is not None
+
+    # structural change flushes everything
+    m.add_cell_type(5, 0, CELL_TYPES.OBSTACLE)
+    assert cache.get(9, 0, "astar") is None
+    assert cache.invalidations == 1 and len(cache) == 0
+    assert 0 < cache.hit_rate < 1
+
+
+def test_hpa_routes_refine_to_valid_paths_and_follow_obstacles():
+    from BearDownBots.dynamic.hpa import HierarchicalPlanner
+
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    planner = HierarchicalPlanner(m, cluster_size=3)
+
+    def route_length(start, goal):
+        route = planner.find(start, goal)
+        if route is None:
+            return None
+        path = [start]
+        for segment in planner.refine(route, kernel, avoid_robots=False):
+            assert segment[0] == path[-1]
+            path += segment[1:]
+        assert_valid(kernel, path, start, goal, avoid_robots=False)
+        return len(path) - 1
+
+    cells = walkway_indices(m)
+    for goal in cells[1:]:
+        assert route_length(cells[0], goal) >= bfs_length(kernel, cells[0], goal, avoid_robots=False)
+
+    # cutting the left column off only rebuilds the clusters around it
+    m.add_cell_type(3, 0, CELL_TYPES.OBSTACLE)
+    assert planner.rebuilt_clusters == 1
+    assert route_length(0, 5 * m.cols) == bfs_length(kernel, 0, 5 * m.cols, avoid_robots=False) > 5
+
+
+def test_hpa_planner_stops_listening_once_discarded():
+    from BearDownBots.dynamic.hpa import HierarchicalPlanner
+
+    m = build_map()
+    planner = HierarchicalPlanner(m, cluster_size=3)
+    assert len(m._change_listeners) == 1
+    planner.close()
+    assert m._change_listeners == []
+
+    planner = HierarchicalPlanner(m, cluster_size=3)
+    del planner
+    gc.collect()
+    assert m._change_listeners == []
+    m.add_cell_type(5, 0, CELL_TYPES.OBSTACLE)   # nobody left to tell
+
+
+def test_corridor_graph_routes_are_optimal_and_contiguous():
+    from BearDownBots.dynamic.corridors import CorridorGraph
+
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    graph = CorridorGraph(m)
+    cells = walkway_indices(m)
+    for start in cells:
+        for goal in cells:
+            if start == goal:
+                continue
+            route = graph.find(start, goal)
+            expected = bfs_length(kernel, start, goal, avoid_robots=False)
+            if expected is None:
+                assert route is None
+                continue
+            path = [start]
+            for segment in graph.expand(route):
+                assert segment[0] == path[-1]
+                path += segment[1:]
+            assert_valid(kernel, path, start, goal, avoid_robots=False)
+            assert len(path) - 1 == expected
+    # the long left-hand corridor is one chain, not a node per cell
+    assert graph.node_count < len(cells)
+
+    # a structural change rebuilds the graph on the next query
+    m.add_cell_type(3, 0, CELL_TYPES.OBSTACLE)
+    assert graph.find(0, 5 * m.cols) is not None
+    assert graph.chain_of[3 * m.cols] == -1
+
+
+def test_dstar_lite_repairs_after_robots_move():
+    from BearDownBots.dynamic.dstar_lite import DStarLite
+
+    m = build_map(["........"] * 3)
+    kernel = PathKernel(m.grid)
+    start, goal = 0, 7
+    planner = DStarLite(m, goal)
+    path = planner.plan(start)
+    assert_valid(kernel, path, start, goal)
+    assert len(path) == 8
+
+    # a robot steps onto the route: the repair matches a fresh search
+    m.add_cell_type(0, 4, CELL_TYPES.ROBOT)
+    repaired = planner.plan(1)
+    assert_valid(kernel, repaired, 1, goal)
+    assert len(repaired) == len(kernel.astar(1, goal)) == 9
+    assert planner.repaired == 4   # the robot's cell and its three neighbours
+
+    # robots that only slow things down are crossed when there is no way round
+    m = build_map([".r."])
+    planner = DStarLite(m, 2)
+    assert planner.plan(0) is None
+    assert DStarLite(m, 2, robot_penalty=5).plan(0) == [0, 1, 2]
+
+    # a robot that could not be crossed leaves: what was behind it opens up
+    m.get_cell(0, 1).remove_type(CELL_TYPES.ROBOT)
+    assert planner.plan(0) == DStarLite(m, 2).plan(0) == [0, 1, 2]
+
+
+def test_cooperative_plans_do_not_collide():
+    from BearDownBots.dynamic.cooperative import CooperativePlanner
+
+    m = build_map([".....", ".....", "....."])
+    planner = CooperativePlanner(m, window=8)
+    # two robots crossing the middle row in opposite directions
+    a = planner.plan(1, 5, 9)
+    b = planner.plan(2, 9, 5)
+    assert a[0] == 5 and a[-1] == 9 and b[0] == 9 and b[-1] == 5
+    for t in range(1, max(len(a), len(b))):
+        pa, pb = a[min(t, len(a) - 1)], b[min(t, len(b) - 1)]
+        assert pa != pb
+        assert not (pa == b[min(t - 1, len(b) - 1)] and pb == a[min(t - 1, len(a) - 1)])
+    assert planner.forced == 0
+
+    # reservations for ticks that have passed are dropped
+    held = len(planner.table)
+    planner.advance()
+    assert len(planner.table) == held - 2
+
+    # head-on in a one-wide corridor there is no way round: push through
+    m = build_map(["....."])
+    planner = CooperativePlanner(m, window=8)
+    planner.plan(1, 0, 4)
+    assert planner.plan(2, 4, 0) == [4, 3, 2, 1, 0]
+    assert planner.forced == 1
+
+
+def test_batch_planner_matches_serial_searches():
+    from BearDownBots.config import Config
+    from BearDownBots.dynamic.batch_planner import BatchPlanner
+
+    class Waiting:
+        def __init__(self, robot_id):
+            self.id = robot_id
+
+        def receive_path(self, path):
+            self.path = path
+
+    m = build_map()
+    kernel = PathKernel(m.grid)
+    cells = walkway_indices(m)
+    queries = [(cells[0], cells[-1]), (cells[3], cells[-5]), (cells[0], 3 * m.cols + 2)]
+
+    saved = Config.Simulation.PATHFINDING_ALGORITHM
+    Config.Simulation.PATHFINDING_ALGORITHM = "astar"
+    planner = BatchPlanner(m, workers=2)
+    try:
+        robots = [Waiting(k) for k in range(len(queries))]
+        for robot, (s, g) in zip(robots, queries):
+            planner.submit(robot, s, g)
+        planner.flush()
+        assert len(planner) == len(queries)
+        planner.collect()
+        assert len(planner) == 0 and planner.solved == len(queries)
+        for robot, (s, g) in zip(robots, queries):
+            expected = kernel.astar(s, g)
+            if expected is None:
+                assert robot.path is None
+            else:
+                assert len(robot.path) == len(expected)
+                assert_valid(kernel, robot.path, s, g)
+    finally:
+        planner.close()
+        Config.Simulation.PATHFINDING_ALGORITHM = saved
+
+
+def test_path_stats_tally_per_algorithm_and_robot():
+    import json
+    from BearDownBots.dynamic.path_stats import PathStats
+
+    stats = PathStats()
+    stats.record("astar", 1, 0.002, expanded=500, peak_open=40, length=30)
+    stats.record("astar", 2, 0.0, expanded=0, peak_open=0, length=30, cached=True)
+    stats.record("astar", 1, 0.05, expanded=20_000, peak_open=900, failed=True)
+    stats.record("dstar_lite", 1, 0.001, expanded=12, peak_open=5, length=31)
+    stats.record("dfs", 2, 0.001, expanded=300, peak_open=9, length=40, raw_length=160)
+
+    data = json.loads(json.dumps(stats.stats()))
+    astar = data["by_algorithm"]["astar"]
+    assert (astar["searches"], astar["failures"], astar["cache_hits"]) == (3, 1, 1)
+    assert astar["max_peak_open"] == 900 and astar["mean_path"] == 30
+    assert astar["latency_hist"] == {"<=0.1ms": 1, "<=1ms": 0, "<=10ms": 1, "<=100ms": 1,
+                                     "<=1000ms": 0, ">1000ms": 0}
+    assert sum(astar["expanded_hist"].values()) == 3
+    assert data["by_robot"]["1"]["searches"] == 3 and data["by_robot"]["2"]["searches"] == 2
+    dfs = data["by_algorithm"]["dfs"]
+    assert (dfs["mean_path_before_shortening"], dfs["mean_path_after_shortening"]) == (160, 40)
+    assert stats.summary().count("\n") == 2
+
+
+# ---------------------------------------------------------------------- #
+# per-map helpers: each registry is keyed weakly by its map, so a helper
+# must not hold the map (or anything that does) strongly itself
+# ---------------------------------------------------------------------- #
+def use_path_cache(m):
+    from BearDownBots.dynamic.path_cache import cache_for
+    cache = cache_for(m)
+    cache.put(0, 9, "astar", PathKernel(m.grid).astar(0, 9))
+    return cache
+
+
+def use_distance_fields(m):
+    from BearDownBots.dynamic.distance_field import fields_for
+    fields = fields_for(m)
+    fields.field(walkway_indices(m)[0])
+    return fields
+
+
+def use_landmarks(m):
+    from BearDownBots.dynamic.landmarks import landmarks_for
+    m.add_cell_type(5, 9, CELL_TYPES.RESTUARANT_PICKUP)
+    landmarks = landmarks_for(m)
+    landmarks.build()
+    return landmarks
+
+
+def use_hpa(m):
+    from BearDownBots.dynamic.hpa import planner_for
+    return planner_for(m)   # and registers a change listener with the map
+
+
+def use_corridors(m):
+    from BearDownBots.dynamic.corridors import corridors_for
+    graph = corridors_for(m)
+    graph.build()
+    return graph
+
+
+def use_cooperative(m):
+    from BearDownBots.dynamic.cooperative import cooperative_for
+    planner = cooperative_for(m)
+    planner.plan(1, 0, 9)
+    return planner
+
+
+def use_batch_planner(m):
+    from BearDownBots.dynamic.batch_planner import batch_for
+    return batch_for(m)   # its finalizer shuts the pool down once it is collected
+
+
+@pytest.mark.parametrize("use", [use_path_cache, use_distance_fields, use_landmarks, use_hpa,
+                                 use_corridors, use_cooperative, use_batch_planner])
+def test_per_map_helpers_are_released_with_their_map(use, monkeypatch):
+    from BearDownBots.config import Config
+
+    monkeypatch.setattr(Config.Simulation, "BATCH_PLANNING_WORKERS", 1)
+    monkeypatch.setattr(Config.Simulation, "PATHFINDING_ALGORITHM", "astar")
+    m = build_map()
+    helper = weakref.ref(use(m))
+    campus_map = weakref.ref(m)
+    del m
+    gc.collect()
+    assert campus_map() is None and helper() is None
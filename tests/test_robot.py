@@ -0,0 +1,94 @@
+"""
+Robot movement along its route.
+"""
+
+from BearDownBots.config import Config
+from BearDownBots.static.map import Map
+from BearDownBots.static.cell import CELL_TYPES, Position
+from BearDownBots.dynamic.robot import Robot
+from BearDownBots.dynamic.compact_path import CompactPath
+
+
+def robot_on_a_line(length: int) -> Robot:
+    m = Map(1, length)
+    for y in range(length):
+        m.lay_walkway(0, y)
+    m.add_cell_type(0, 0, CELL_TYPES.RESTUARANT_PICKUP)
+    robot = Robot(0, m)
+    robot.state = "delivering"
+    robot.dropoff_point = Position(0, length - 1)
+    robot.returned_path = CompactPath.from_indices(list(range(length)), length)
+    return robot
+
+
+def test_robots_walk_speed_times_dt_cells(monkeypatch):
+    monkeypatch.setattr(Config.Simulation, "ROBOT_SPEED", 4)
+    monkeypatch.setattr(Config.Simulation, "PATHFINDING_ALGORITHM", "astar")
+    robot = robot_on_a_line(12)
+    m = robot.map
+
+    robot.act(0.5)
+    assert robot.position == Position(0, 2) and robot.previous_position == Position(0, 1)
+    # occupancy moves in one go: the cell crossed on the way is never marked
+    assert [y for y in range(12) if m.has_type(0, y, CELL_TYPES.ROBOT)] == [2]
+
+    robot.act(0.625)     # 2.5 cells: the half cell carries over
+    assert robot.position == Position(0, 4)
+    robot.act(0.125)
+    assert robot.position == Position(0, 5)
+
+    # without a dt it is one cell per act()
+    robot.act()
+    assert robot.position == Position(0, 6)
+
+    # the route ends at the dropoff however far the tick would reach,
+    # and the robot turns for home from there
+    robot.act(10)
+    assert robot.position == Position(0, 11)
+    assert robot.state == "returning" and robot.returned_path.position == Position(0, 11)
+
+
+def test_robots_get_home_with_batched_routes_and_no_fields(monkeypatch):
+    from BearDownBots.dynamic.batch_planner import batch_for
+
+    monkeypatch.setattr(Config.Simulation, "ROBOT_SPEED", 4)
+    monkeypatch.setattr(Config.Simulation, "PATHFINDING_ALGORITHM", "astar")
+    monkeypatch.setattr(Config.Simulation, "BATCH_PLANNING_WORKERS", 1)
+    monkeypatch.setattr(Config.Simulation, "USE_DISTANCE_FIELDS", False)
+    monkeypatch.setattr(Config.Simulation, "PATH_CACHE_SIZE", 0)
+    robot = robot_on_a_line(12)
+    batch = batch_for(robot.map)
+    try:
+        # the route home is asked for at the dropoff and answered between steps
+        states = []
+        for _ in range(12):
+            batch.collect()
+            robot.act(1.0)
+            batch.flush()
+            states.append(robot.state)
+        assert states.count("delivering") <= 3
+        assert robot.state == "idle" and robot.position == Position(0, 0)
+        assert not robot._awaiting_path and robot._batched_path is None
+        assert batch.solved == 1
+    finally:
+        batch.close()
+
+
+def test_robots_give_up_quietly_after_max_replan_failures(monkeypatch, capsys):
+    from BearDownBots.dynamic.path_stats import stats_for
+
+    monkeypatch.setattr(Config.Simulation, "PATHFINDING_ALGORITHM", "astar")
+    robot = robot_on_a_line(5)
+    m = robot.map
+    m.add_cell_type(0, 2, CELL_TYPES.OBSTACLE)   # the dropoff is cut off
+    robot.returned_path = CompactPath()
+    robot.orders = ["order"]
+
+    for _ in range(Robot.MAX_REPLAN_FAILURES - 1):
+        robot.act()
+    assert robot.state == "delivering" and capsys.readouterr().out == ""
+    robot.act()
+    assert robot.state == "idle" and robot.orders == []
+    assert capsys.readouterr().out == \
+        f"Robot 0 aborted order order after {Robot.MAX_REPLAN_FAILURES} failed replans.\n"
+    assert stats_for(m).by_robot[0].failures == Robot.MAX_REPLAN_FAILURES
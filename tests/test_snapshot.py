@@ -0,0 +1,34 @@
+"""
+Round-trip a small seeded campus through the snapshot cache.
+"""
+
+import random
+
+import numpy as np
+
+from BearDownBots.config import Config
+from BearDownBots.static import create_campus_environment, snapshot
+
+
+def test_cached_campus_matches_generated(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "cache_root", lambda: str(tmp_path))
+    monkeypatch.setattr(Config.Environment, "MAP_ROWS", 120)
+    monkeypatch.setattr(Config.Environment, "MAP_COLS", 120)
+    monkeypatch.setattr(Config.Environment, "MIN_BUILDING_CELLS", 25)
+    monkeypatch.setattr(Config.Environment, "MAX_BUILDING_CELLS", 81)
+    monkeypatch.setattr(Config.Environment, "SEED", 11)
+    monkeypatch.setattr(Config.Environment, "CAMPUS_CACHE", True)
+
+    fresh = create_campus_environment(progress_window=None)
+    after_fresh = random.random()
+    cached = create_campus_environment(progress_window=None)
+    after_cached = random.random()
+
+    assert isinstance(cached.grid, np.memmap)
+    assert np.array_equal(fresh.grid, cached.grid)
+    assert [b.name for b in fresh.buildings] == [b.name for b in cached.buildings]
+    assert [b.dropoff_point for b in fresh.buildings] == [b.dropoff_point for b in cached.buildings]
+    assert after_fresh == after_cached
+
+    listed = snapshot.list_campuses()
+    assert [m["key"] for m in listed] == [snapshot.campus_key(11)]
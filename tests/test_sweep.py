@@ -0,0 +1,46 @@
+"""
+Parsing the sweep's --set overrides, a single run, and the pool runs go to.
+"""
+import os
+from concurrent.futures import as_completed
+
+import pytest
+
+from BearDownBots.config import Config
+from BearDownBots.sweep import METRICS, parse_override, run_one, snapshot_config, per_run_pool, _PerRunPool
+
+
+def test_override_values_parse_as_literals_or_strings():
+    assert parse_override("Simulation.NUM_ROBOTS=3,6") == ("Simulation.NUM_ROBOTS", [3, 6])
+    assert parse_override("Simulation.PATHFINDING_ALGORITHM=astar, jps") == \
+        ("Simulation.PATHFINDING_ALGORITHM", ["astar", "jps"])
+    assert parse_override("Simulation.REPLAN_ROBOT_PENALTY=None,8") == \
+        ("Simulation.REPLAN_ROBOT_PENALTY", [None, 8])
+
+
+@pytest.mark.parametrize("text", ["Simulation.NO_SUCH_SETTING=1", "Nowhere.NUM_ROBOTS=1", "Simulation.NUM_ROBOTS"])
+def test_unknown_settings_are_rejected(text):
+    with pytest.raises(ValueError):
+        parse_override(text)
+
+
+def test_run_one_recomputes_derived_settings_and_restores_config(monkeypatch):
+    monkeypatch.setattr(Config.Environment, "MAP_ROWS", 80)
+    monkeypatch.setattr(Config.Environment, "MAP_COLS", 80)
+    monkeypatch.setattr(Config.Environment, "CAMPUS_CACHE", False)
+    before = snapshot_config()
+
+    row = run_one({"Simulation.TIME_SCALE": 10, "Simulation.NUM_ROBOTS": 2}, seed=1, hours=0.05)
+    assert set(row) == {"Simulation.TIME_SCALE", "Simulation.NUM_ROBOTS", "seed", *METRICS}
+    assert row["sim_seconds"] >= 180
+    # NEW_ORDER_INTERVAL follows TIME_SCALE: an order every 10 s, not every 20 s
+    assert row["delivered"] + row["pending_orders"] == 18
+
+    assert snapshot_config() == before
+
+
+@pytest.mark.parametrize("make_pool", [per_run_pool, _PerRunPool])
+def test_every_run_gets_a_fresh_worker(make_pool):
+    with make_pool(1) as pool:
+        pids = [future.result() for future in as_completed([pool.submit(os.getpid) for _ in range(3)])]
+    assert len(set(pids)) == 3 and os.getpid() not in pids
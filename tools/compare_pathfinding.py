@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Compare the PathKernel searches on a generated campus.
+
+Builds (or loads from the campus cache) a campus, then runs every search
+on the same random (pickup/dropoff) start-goal pairs and reports node
+expansions, wall time and path length per algorithm.
+
+    python tools/compare_pathfinding.py --seed 7 --pairs 200
+    python tools/compare_pathfinding.py --rows 400 --cols 400 --algorithms astar jps
+    python tools/compare_pathfinding.py --algorithms astar dfs dfs+shorten greedy greedy+shorten
+"""
+import sys
+import time
+import random
+import argparse
+import statistics
+
+from BearDownBots.config import Config
+from BearDownBots.static import create_campus_environment
+from BearDownBots.dynamic.pathfinding import kernel_for
+from BearDownBots.dynamic.landmarks import landmarks_for
+from BearDownBots.dynamic.hpa import planner_for
+from BearDownBots.dynamic.corridors import corridors_for
+
+
+def campus_pairs(campus_map, n_pairs, rng):
+    """Random (start, goal) flat-index pairs between dropoff/pickup points."""
+    cols = campus_map.cols
+    points = [b.dropoff_point for b in campus_map.buildings if b.dropoff_point]
+    points = [x * cols + y for x, y in points]
+    return [tuple(rng.sample(points, 2)) for _ in range(n_pairs)]
+
+
+def searcher(kernel, campus_map, algorithm):
+    if algorithm.endswith("+shorten"):
+        search = searcher(kernel, campus_map, algorithm[:-len("+shorten")])
+
+        def shortened(s, g, avoid_robots):
+            # expansions of the search itself; the shortening time is included
+            path = search(s, g, avoid_robots)
+            expanded = kernel.expanded
+            if path is not None:
+                path = kernel.shorten(path, avoid_robots=avoid_robots)
+            kernel.expanded = expanded
+            return path
+        return shortened
+    if algorithm == "alt":
+        landmarks = landmarks_for(campus_map)
+
+        def alt(s, g, avoid_robots):
+            kernel.expanded = 0
+            if not landmarks.may_connect(s, g):
+                return None
+            return kernel.astar(s, g, avoid_robots, h=landmarks.heuristic(g))
+        return alt
+    if algorithm == "hpa":
+        planner = planner_for(campus_map)
+
+        def hpa(s, g, avoid_robots):
+            # abstract search plus refining every edge, i.e. the whole route
+            route = planner.find(s, g)
+            expanded = planner.expanded
+            path = None
+            if route is not None:
+                path = [s]
+                for segment in planner.refine(route, kernel, avoid_robots):
+                    expanded += kernel.expanded if len(segment) > 2 else 0
+                    path += segment[1:]
+            kernel.expanded = expanded
+            return path
+        return hpa
+    if algorithm == "corridor":
+        graph = corridors_for(campus_map)
+
+        def corridor(s, g, avoid_robots):
+            # robots are never on the corridor graph; expand the whole route
+            route = graph.find(s, g)
+            kernel.expanded = graph.expanded
+            if route is None:
+                return None
+            path = [s]
+            for segment in graph.expand(route):
+                path += segment[1:]
+            return path
+        return corridor
+    return getattr(kernel, algorithm)
+
+
+def run(kernel, search, pairs):
+    """Per-pair expansions, seconds and path length (None when unreachable)."""
+    expansions, seconds, lengths = [], [], []
+    for s, g in pairs:
+        t0 = time.perf_counter()
+        path = search(s, g, avoid_robots=False)
+        seconds.append(time.perf_counter() - t0)
+        expansions.append(kernel.expanded)
+        lengths.append(None if path is None else len(path) - 1)
+    return expansions, seconds, lengths
+
+
+def report(results, picked=None):
+    print(f"{'algorithm':<14} {'mean exp':>10} {'median exp':>11} {'mean ms':>9} "
+          f"{'total s':>8} {'mean len':>9} {'failed':>7}")
+    for name, (expansions, seconds, lengths) in results.items():
+        idx = picked if picked is not None else range(len(lengths))
+        exp = [expansions[i] for i in idx]
+        sec = [seconds[i] for i in idx]
+        found = [lengths[i] for i in idx if lengths[i] is not None]
+        print(f"{name:<14} {statistics.mean(exp):>10.0f} {statistics.median(exp):>11.0f} "
+              f"{1000 * statistics.mean(sec):>9.2f} {sum(sec):>8.2f} "
+              f"{statistics.mean(found) if found else 0:>9.1f} {len(idx) - len(found):>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare pathfinding algorithms on a campus.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rows", type=int, default=Config.Environment.MAP_ROWS)
+    parser.add_argument("--cols", type=int, default=Config.Environment.MAP_COLS)
+    parser.add_argument("--pairs", type=int, default=100)
+    parser.add_argument("--landmarks", type=int, default=Config.Simulation.ALT_LANDMARKS)
+    parser.add_argument("--algorithms", nargs="+", default=["astar", "alt", "jps", "bidirectional", "hpa", "corridor"])
+    args = parser.parse_args(argv)
+
+    Config.Environment.MAP_ROWS = args.rows
+    Config.Environment.MAP_COLS = args.cols
+    Config.Environment.SEED = args.seed
+    Config.Simulation.ALT_LANDMARKS = args.landmarks
+
+    t0 = time.perf_counter()
+    campus_map = create_campus_environment(progress_window=None)
+    print(f"campus {args.rows}x{args.cols} seed {args.seed}: "
+          f"{len(campus_map.buildings)} buildings ({time.perf_counter() - t0:.1f}s)")
+
+    kernel = kernel_for(campus_map)
+    if "jps" in args.algorithms:
+        t0 = time.perf_counter()
+        kernel.jump_tables()
+        print(f"jump tables built in {time.perf_counter() - t0:.2f}s")
+    pairs = campus_pairs(campus_map, args.pairs, random.Random(args.seed))
+
+    if "alt" in args.algorithms:
+        landmarks_for(campus_map).build()
+    if "hpa" in args.algorithms:
+        t0 = time.perf_counter()
+        planner = planner_for(campus_map)
+        print(f"hpa: {len(planner._border)} borders, {len(planner._inter)} entrance nodes "
+              f"built in {time.perf_counter() - t0:.2f}s")
+    if "corridor" in args.algorithms:
+        graph = corridors_for(campus_map)
+        graph.build()
+        print(f"corridor graph: {graph.node_count} nodes, {len(graph.chains)} chains "
+              f"built in {graph.build_seconds:.2f}s")
+
+    results = {name: run(kernel, searcher(kernel, campus_map, name), pairs) for name in args.algorithms}
+
+    print()
+    report(results)
+
+    # the longest routes are where the tick-time spikes come from
+    ref = results[args.algorithms[0]][2]
+    found = sorted(length for length in ref if length is not None)
+    if found:
+        cutoff = found[int(0.9 * (len(found) - 1))]
+        longest = [i for i, length in enumerate(ref) if length is not None and length >= cutoff]
+        print(f"\nlongest 10% of routes (length >= {cutoff}):")
+        report(results, longest)
+
+    # every optimal search must agree on the length of each route
+    optimal = [name for name in results if name.split("+")[0] not in ("greedy", "dfs", "hpa")]
+    if len(optimal) > 1:
+        for name in optimal[1:]:
+            if results[name][2] != results[optimal[0]][2]:
+                print(f"WARNING: {name} path lengths differ from {optimal[0]}")
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())